@@ -1,7 +1,7 @@
 from __future__ import annotations
 from typing import Callable
 from RecordLib.crecord import CRecord
-import copy
+from RecordLib.analysis.charge_facts import FactCache
 from collections import OrderedDict
 
 class Analysis:
@@ -29,12 +29,20 @@ class Analysis:
     and the `reasoning` is a tree of `Decisions`
 
     Each rule function takes a criminal record and returns a tuple of a tree of Decisions and a CRecord. 
+
+    Rules don't copy the record they are given. They slice it, and the slices share Cases and Charges with
+    `record`. A Case only gets split into new containers when a rule divides its charges. So a rule must
+    never modify the Person, Cases, or Charges it is given.
+
+    That also lets the Analysis remember the parsed facts of each Charge (see `charge_facts`) for as long
+    as it runs, so rules don't parse the same statutes and grades again.
     """
 
     def __init__(self, rec: CRecord) -> None:
         self.record = rec
-        self.remaining_record = copy.deepcopy(rec)
+        self.remaining_record = rec.slice()
         self.decisions = []
+        self.facts = FactCache()
 
     def rule(self, ruledef: Callable) -> Analysis:
         """
@@ -51,7 +59,8 @@ class Analysis:
         Returns:
             This Analyis, after applying the ruledef and updating the analysis with the results of the ruledef.
         """
-        remaining_record, petition_decision = ruledef(self.remaining_record)
+        with self.facts.active():
+            remaining_record, petition_decision = ruledef(self.remaining_record)
         self.remaining_record = remaining_record
         self.decisions.append(petition_decision)
         return self
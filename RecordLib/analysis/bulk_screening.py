@@ -0,0 +1,147 @@
+"""
+Screen many records at once for the whole-record disqualifiers used in triage.
+
+`ScreeningTable.from_records` flattens the charges of a batch of CRecords into columns, with one row per
+charge. Each disqualifier is then a pass over a few columns that reduces the rows of each record to a
+single answer, rather than a tree of Decisions for every charge of every record.
+
+The answers are the same booleans as these rules in `simple_sealing_rules` give, for each record:
+
+    table = ScreeningTable.from_records(records)
+    table.any_felony_convictions_n_years(5)             # bool(any_felony_convictions_n_years(rec, 5))
+    table.more_than_x_convictions_y_grade_z_years(2, "M1", 15)
+    table.no_f1_convictions()                            # bool(no_f1_convictions(rec))
+"""
+from __future__ import annotations
+from array import array
+from typing import Dict, Iterable, List, Optional
+import re
+from dateutil.relativedelta import relativedelta
+from datetime import date
+from RecordLib.crecord import CRecord
+from RecordLib.crecord.common import GRADE_RANKS
+from RecordLib.analysis.charge_facts import facts
+
+
+MURDER = re.compile("murder", re.IGNORECASE)
+
+
+def years_passed(disposition_date: Optional[date], today: date) -> int:
+    """ Like `Case.years_passed_disposition`. """
+    try:
+        return relativedelta(today, disposition_date).years
+    except Exception:
+        return 0
+
+
+class ScreeningTable:
+    """
+    The charges of a batch of records, as columns.
+
+    Row i of each column describes one charge. `record[i]` is the position, in the batch, of the record
+    the charge belongs to.
+    """
+
+    def __init__(self, n_records: int):
+        self.n_records = n_records
+        self.record = array("l")
+        self.grade_rank = array("b")
+        self.felony = array("b")
+        self.f1 = array("b")
+        self.ungraded = array("b")
+        self.conviction = array("b")
+        self.murder = array("b")
+        # Years since the disposition of the charge's case.
+        self.years_since_disposition = array("l")
+        # Statutes that can't be read have a chapter and section of nan.
+        self.chapter = array("d")
+        self.section = array("d")
+
+    @staticmethod
+    def from_records(
+        records: Iterable[CRecord], today: Optional[date] = None
+    ) -> ScreeningTable:
+        today = today or date.today()
+        records = list(records)
+        table = ScreeningTable(len(records))
+        for position, rec in enumerate(records):
+            for case in rec.cases:
+                years = years_passed(case.disposition_date, today)
+                for charge in case.charges:
+                    charge_facts = facts(charge)
+                    table.record.append(position)
+                    table.grade_rank.append(charge_facts.grade_rank)
+                    table.felony.append(
+                        re.match("F", charge.grade, re.IGNORECASE) is not None
+                    )
+                    table.f1.append(re.match("F1", charge.grade) is not None)
+                    table.ungraded.append(charge_facts.grade == "")
+                    table.conviction.append(charge_facts.is_conviction)
+                    table.murder.append(MURDER.match(charge.offense) is not None)
+                    table.years_since_disposition.append(years)
+                    table.chapter.append(
+                        float("nan") if charge_facts.chapter is None else charge_facts.chapter
+                    )
+                    table.section.append(
+                        float("nan") if charge_facts.section is None else charge_facts.section
+                    )
+        return table
+
+    def all_rows(self, rows: Iterable[bool]) -> List[bool]:
+        """ For each record, are all of its rows true? Records without any charges are true. """
+        result = [True] * self.n_records
+        for position, row in zip(self.record, rows):
+            if not row:
+                result[position] = False
+        return result
+
+    def count_rows(self, rows: Iterable[bool]) -> List[int]:
+        """ For each record, the number of its rows that are true. """
+        counts = [0] * self.n_records
+        for position, row in zip(self.record, rows):
+            if row:
+                counts[position] += 1
+        return counts
+
+    def any_felony_convictions_n_years(self, years: int) -> List[bool]:
+        return self.all_rows(
+            felony and conviction and passed > years
+            for felony, conviction, passed in zip(
+                self.felony, self.conviction, self.years_since_disposition
+            )
+        )
+
+    def more_than_x_convictions_y_grade_z_years(
+        self, offense_limit: int, grade_limit: str, years: int
+    ) -> List[bool]:
+        limit_rank = GRADE_RANKS.get(grade_limit, 0)
+        counts = self.count_rows(
+            passed >= years and conviction and rank >= limit_rank
+            for passed, conviction, rank in zip(
+                self.years_since_disposition, self.conviction, self.grade_rank
+            )
+        )
+        return [count >= offense_limit for count in counts]
+
+    def no_f1_convictions(self) -> List[bool]:
+        return self.all_rows(
+            not ungraded and not (f1 and conviction) and not (conviction and murder)
+            for ungraded, f1, conviction, murder in zip(
+                self.ungraded, self.f1, self.conviction, self.murder
+            )
+        )
+
+    def triage(self) -> List[Dict[str, bool]]:
+        """ The disqualifiers that `scripts/analyze.py triage` reports, for each record. """
+        columns = {
+            "felony_5_yrs": self.any_felony_convictions_n_years(5),
+            "2plus_m1s_15yrs": self.more_than_x_convictions_y_grade_z_years(2, "M1", 15),
+            "4plus_m2s_20yrs": self.more_than_x_convictions_y_grade_z_years(4, "M2", 20),
+            "any_f1_convictions": [not ok for ok in self.no_f1_convictions()],
+        }
+        results = []
+        for position in range(self.n_records):
+            res = {name: column[position] for name, column in columns.items()}
+            res["any_disqualifiers"] = any(res.values())
+            results.append(res)
+        return results
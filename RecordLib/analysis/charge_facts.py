@@ -0,0 +1,116 @@
+"""
+Facts about a charge that the rule functions ask about over and over, worked out once per charge.
+
+A rule like `full_record_requirements_for_petition_sealing` looks at each charge's statute, grade, and
+disposition a dozen times or more. `facts(charge)` parses them into a `ChargeFacts`. While an Analysis is
+running a rule, the facts of each charge are remembered, so the other rules of the Analysis get them
+without parsing anything again. Outside of an Analysis, `facts` works them out each time it is called.
+"""
+from __future__ import annotations
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, Iterator, Optional, Tuple
+import logging
+from RecordLib.crecord.common import Charge, GRADE_RANKS
+from RecordLib.analysis.statutes import statute_index
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class ChargeFacts:
+    """
+    The parsed statute, grade, and disposition of a Charge.
+
+    `chapter`, `section`, and `subsections` are what `Charge.get_statute_chapter`, `get_statute_section`, and
+    `get_statute_subsections` return. `offense_code` is the section and subsections run together without
+    parentheses, like "3126a1", or None if the statute can't be read that way. `categories` are the
+    OffenseCategories the statute belongs to.
+    """
+
+    chapter: Optional[float]
+    section: Optional[float]
+    subsections: str
+    offense_code: Optional[str]
+    categories: FrozenSet[str]
+    grade: str
+    grade_rank: int
+    is_conviction: bool
+    disposition_year: Optional[int]
+
+    @staticmethod
+    def of(charge: Charge) -> ChargeFacts:
+        if charge.grade not in GRADE_RANKS:
+            logger.error(
+                f"Couldn't understand the grade, {charge.grade}, so assuming it has low seriousness."
+            )
+        if isinstance(charge.statute, str):
+            statute = (
+                charge.get_statute_chapter(),
+                charge.get_statute_section(),
+                charge.get_statute_subsections(),
+                charge.get_offense_code(),
+            )
+        else:
+            # A charge without a statute can't be in any chapter or section.
+            statute = (None, None, "", None)
+        chapter, section, subsections, offense_code = statute
+        return ChargeFacts(
+            chapter=chapter,
+            section=section,
+            subsections=subsections,
+            offense_code=offense_code,
+            categories=statute_index.categories(chapter, section, offense_code),
+            grade=(charge.grade or "").strip(),
+            grade_rank=GRADE_RANKS.get(charge.grade, 0),
+            is_conviction=charge.is_conviction(),
+            disposition_year=getattr(charge.disposition_date, "year", None),
+        )
+
+    def grade_GTE(self, grade: str) -> bool:
+        """ Is the charge's grade the same as or more serious than `grade`? Like `Charge.grade_GTE`. """
+        return self.grade_rank >= GRADE_RANKS.get(grade, 0)
+
+
+class FactCache:
+    """
+    Remembers the ChargeFacts of charges.
+
+    Charges are remembered by identity, so the cache is only right as long as the charges in it don't change.
+    An Analysis keeps one of these while it runs, because its rules don't change the charges they look at.
+    """
+
+    def __init__(self):
+        # Keeping the charge keeps its id from being reused by a different charge.
+        self._facts: Dict[int, Tuple[Charge, ChargeFacts]] = dict()
+
+    def get(self, charge: Charge) -> ChargeFacts:
+        try:
+            return self._facts[id(charge)][1]
+        except KeyError:
+            charge_facts = ChargeFacts.of(charge)
+            self._facts[id(charge)] = (charge, charge_facts)
+            return charge_facts
+
+    @contextmanager
+    def active(self) -> Iterator[FactCache]:
+        """ Make `facts` use this cache, inside the `with` block. """
+        token = _current_cache.set(self)
+        try:
+            yield self
+        finally:
+            _current_cache.reset(token)
+
+
+_current_cache: ContextVar[Optional[FactCache]] = ContextVar(
+    "current_fact_cache", default=None
+)
+
+
+def facts(charge: Charge) -> ChargeFacts:
+    """ The ChargeFacts of a charge, from the active FactCache if there is one. """
+    cache = _current_cache.get()
+    if cache is None:
+        return ChargeFacts.of(charge)
+    return cache.get(charge)
@@ -11,11 +11,11 @@ expunge or seal their record.
 """
 from typing import Tuple
 from RecordLib.analysis.decision import Decision, PetitionDecision
+from RecordLib.analysis.charge_facts import facts
 from RecordLib.analysis.ruledefs import simple_expungement_rules as ser
 from RecordLib.analysis.ruledefs import simple_sealing_rules as ssr
 from RecordLib.crecord import CRecord
 from RecordLib.petitions import Expungement, Sealing, Petition
-import copy
 
 
 def expunge_over_70(crecord: CRecord) -> Tuple[CRecord, PetitionDecision]:
@@ -47,7 +47,7 @@ def expunge_over_70(crecord: CRecord) -> Tuple[CRecord, PetitionDecision]:
         for e in exps:
             e.expungement_type = Expungement.ExpungementTypes.FULL_EXPUNGEMENT
         conclusion.value = exps
-        remaining_recordord = CRecord(person=copy.deepcopy(crecord.person), cases=[])
+        remaining_recordord = crecord.slice(cases=[])
     else:
         conclusion.value = []
         remaining_recordord = crecord
@@ -79,7 +79,7 @@ def expunge_deceased(crecord: CRecord) -> Tuple[CRecord, PetitionDecision]:
         for e in exps:
             e.expungement_type = Expungement.ExpungementTypes.FULL_EXPUNGEMENT
         conclusion.value = exps
-        remaining_record = CRecord(person=copy.deepcopy(crecord.person), cases=[])
+        remaining_record = crecord.slice(cases=[])
     else:
         conclusion.value = []
         remaining_record = crecord
@@ -125,21 +125,19 @@ def expunge_summary_convictions(crecord: CRecord) -> Tuple[CRecord, PetitionDeci
             case_d = Decision(
                 name=f"Is {case.docket_number} expungeable?", reasoning=[]
             )
-            expungeable_case = (
-                case.partialcopy()
-            )  # The charges in this case that are expungeable.
-            not_expungeable_case = (
-                case.partialcopy()
-            )  # Charges in this case that are not expungeable.
+            expungeable_charges = []  # The charges in this case that are expungeable.
+            not_expungeable_charges = []  # Charges in this case that are not expungeable.
             for charge in case.charges:
                 charge_d = ser.is_summary_conviction(charge)
                 if all(charge_d.reasoning):
-                    expungeable_case.charges.append(charge)
+                    expungeable_charges.append(charge)
                     charge_d.value = True
                 else:
                     charge_d.value = False
-                    not_expungeable_case.charges.append(charge)
+                    not_expungeable_charges.append(charge)
                 case_d.reasoning.append(charge_d)
+            expungeable_case = case.with_charges(expungeable_charges)
+            not_expungeable_case = case.with_charges(not_expungeable_charges)
 
             # If there are any expungeable charges, add an Expungepent to the Value of the decision about
             # this whole record.
@@ -190,22 +188,25 @@ def expunge_nonconvictions(crecord: CRecord) -> Tuple[CRecord, PetitionDecision]
             name=f"Does {case.docket_number} have expungeable nonconvictions?",
             reasoning=[],
         )
-        unexpungeable_case = case.partialcopy()
-        expungeable_case = case.partialcopy()
+        unexpungeable_charges = []
+        expungeable_charges = []
         for charge in case.charges:
             charge_d = Decision(
                 name=f"Is the charge for {charge.offense} a nonconviction?",
-                value=not charge.is_conviction(),
+                value=not facts(charge).is_conviction,
                 reasoning=f"The charge's disposition {charge.disposition} indicates a conviction"
-                if charge.is_conviction()
+                if facts(charge).is_conviction
                 else f"The charge's disposition {charge.disposition} indicates its not a conviction.",
             )
 
             if bool(charge_d) is True:
-                expungeable_case.charges.append(charge)
+                expungeable_charges.append(charge)
             else:
-                unexpungeable_case.charges.append(charge)
+                unexpungeable_charges.append(charge)
             case_d.reasoning.append(charge_d)
+        # Only a case whose charges are split up needs new containers.
+        unexpungeable_case = case.with_charges(unexpungeable_charges)
+        expungeable_case = case.with_charges(expungeable_charges)
 
         # If there are any expungeable charges, add an Expungepent to the Value of the decision about
         # this whole record.
@@ -266,10 +267,10 @@ def seal_convictions(crecord: CRecord) -> Tuple[CRecord, PetitionDecision]:
             )
             fines_decision = ssr.fines_and_costs_paid(case)  # 18 Pa.C.S. 9122.1(a)
             case_decision.reasoning.append(fines_decision)
-            # create copies of a case that don't include any charges.
-            # sealable or unsealable charges will be added to these.
-            sealable_parts_of_case = case.partialcopy()
-            unsealable_parts_of_case = case.partialcopy()
+            # sealable or unsealable charges will be added to these, and then
+            # sliced out of the case.
+            sealable_charges = []
+            unsealable_charges = []
 
             # Iterate over the charges in a case, to see which charges are sealable.
             charge_decisions = []
@@ -313,11 +314,13 @@ def seal_convictions(crecord: CRecord) -> Tuple[CRecord, PetitionDecision]:
                 ]
                 if all(charge_decision.reasoning):
                     charge_decision.value = "Sealable"
-                    sealable_parts_of_case.charges.append(charge)
+                    sealable_charges.append(charge)
                 else:
                     charge_decision.value = "Not sealable"
-                    unsealable_parts_of_case.charges.append(charge)
+                    unsealable_charges.append(charge)
                 charge_decisions.append(charge_decision)
+            sealable_parts_of_case = case.with_charges(sealable_charges)
+            unsealable_parts_of_case = case.with_charges(unsealable_charges)
             if all([decision.value == "Sealable" for decision in charge_decisions]):
                 # All the charges in the current case are sealable.
                 case_decision.value = "All charges sealable"
@@ -20,6 +20,7 @@ The rules in this module all relate to expungemnts.
 """
 from RecordLib.crecord import CRecord, Charge, Person
 from RecordLib.analysis import Decision
+from RecordLib.analysis.charge_facts import facts
 
 
 def is_over_age(person: Person, age_limit: int) -> Decision:
@@ -57,17 +58,17 @@ def arrest_free_for_n_years(crec: CRecord, year_min=5) -> Decision:
 def is_summary(charge: Charge) -> Decision:
     return Decision(
         name=f"Is this charge for {charge.offense} a summary?",
-        value=charge.grade.strip() == "S",
-        reasoning=f"The charge's grade is {charge.grade.strip()}",
+        value=facts(charge).grade == "S",
+        reasoning=f"The charge's grade is {facts(charge).grade}",
     )
 
 
 def is_conviction(charge: Charge) -> Decision:
     return Decision(
         name=f"Is this charge for {charge.offense} a conviction?",
-        value=charge.is_conviction(),
+        value=facts(charge).is_conviction,
         reasoning=f"The charge's disposition {charge.disposition} indicates a conviction"
-        if charge.is_conviction()
+        if facts(charge).is_conviction
         else f"The charge's disposition {charge.disposition} indicates its not a conviction.",
     )
 
@@ -22,6 +22,8 @@ import copy
 import json
 import re
 from RecordLib.analysis import Decision
+from RecordLib.analysis.charge_facts import facts
+from RecordLib.analysis.statutes import OffenseCategories
 from RecordLib.petitions import Sealing
 import math
 from dateutil.relativedelta import relativedelta
@@ -83,16 +85,15 @@ def no_danger_to_person_offense(
             name="Is this not a conviction for an Article B offense (M1 or more serious)?"
         )
         try:
+            item_facts = facts(item)
             if (
-                item.get_statute_chapter() == 18
-                and item.get_statute_section() > 2300
-                and item.get_statute_section() < 3300
-                and item.is_conviction()
+                OffenseCategories.DANGER_TO_PERSON in item_facts.categories
+                and item_facts.is_conviction
             ):
-                if Charge.grade_GTE(item.grade, "M1"):
+                if item_facts.grade_GTE("M1"):
                     decision.value = False
                     decision.reasoning = f"Statute {item.statute} is an Article B conviction, with a grade of at least M1."
-                elif item.grade.strip() == "":
+                elif item_facts.grade == "":
                     # The grade is missing, and otherwise this is an excluded offense.
                     decision.value = False
                     decision.reasoning = f"Statute {item.statute} is an Article B conviction, but we do not know the grade. It may or may not be an excluded offense."
@@ -131,7 +132,7 @@ def ten_years_since_last_conviction_for_m_or_f(crecord: CRecord) -> Decision:
         case
         for case in crecord.cases
         for charge in case.charges
-        if charge.is_conviction() and Charge.grade_GTE(charge.grade, "M3")
+        if facts(charge).is_conviction and facts(charge).grade_GTE("M3")
     ]
     if len(convictions) == 0:
         decision.value = True
@@ -212,13 +213,14 @@ def not_felony1(charge: Charge) -> Decision:
         a True decision if the charge was NOT a felony1 conviction.
     """
     decision = Decision(name="Is the charge an F1 conviction?")
-    if charge.grade.strip() == "":
+    charge_facts = facts(charge)
+    if charge_facts.grade == "":
         decision.value = False
         decision.reasoning = (
             "The charge's grade is unknown, so we don't know its *not* an F1."
         )
     elif re.match("F1", charge.grade):
-        if charge.is_conviction():
+        if charge_facts.is_conviction:
             decision.value = False
             decision.reasoning = "The charge is an F1 conviction"
         else:
@@ -243,7 +245,7 @@ def not_murder(charge: Charge) -> Decision:
     TODO The Expungement Generator's test is for the statute 18 PaCS 1502. Does the implementation here even work? Need to find real murder convictions to see.
     """
     decision = Decision(name="Is the charge NOT a murder conviction?")
-    if charge.is_conviction():
+    if facts(charge).is_conviction:
         if re.match("murder", charge.offense, re.IGNORECASE):
             decision.value = False
             decision.reasoning = "The charge was a murder conviction."
@@ -294,7 +296,7 @@ def is_felony_conviction(charge: Charge) -> Decision:
     )
     decision.reasoning = [
         re.match("F", charge.grade, re.IGNORECASE),
-        charge.is_conviction(),
+        facts(charge).is_conviction,
     ]
     decision.value = all(decision.reasoning)
     return decision
@@ -341,7 +343,7 @@ def is_misdemeanor_or_ungraded(charge: Charge) -> Decision:
     if re.match("^M", charge.grade):
         decision.reasoning = "Charge is a misdemeanor"
         decision.value = True
-    elif charge.grade.strip() == "":
+    elif facts(charge).grade == "":
         decision.reasoning = "Charge is ungraded. But be careful - we don't know the maximum penalty for the offense."
         decision.value = True
     else:
@@ -374,20 +376,11 @@ def no_offense_against_family(
         decision = Decision(
             name=f"Charge for {item.statute} is not an offense against the family.",
             reasoning=[
-                item.is_conviction(),
-                item.get_statute_chapter() == 18,
-                item.get_statute_section() > 4300,
-                item.get_statute_section() < 4500,
+                facts(item).is_conviction,
+                OffenseCategories.AGAINST_FAMILY in facts(item).categories,
             ],
         )
         decision.value = not all(decision.reasoning)
-    except TypeError:
-        # `item`'s get_statute functions returned something that doesn't have < > defined, such as None.
-        decision = Decision(
-            name=f"Charge for {item.statute} is not an offense against the family.",
-            reasoning="The statute doesn't appear to be one of the Article D offense statutes.",
-            value=True,
-        )
     except AttributeError:
         # `item` may be a whole record.
         decision = Decision(
@@ -404,8 +397,8 @@ def no_offense_against_family(
                     within_years=within_years,
                 )
                 for case in item.cases
-                for charge in case.charges
                 if case.years_passed_disposition() <= within_years
+                for charge in case.charges
             ],
         )
         decision.value = (
@@ -439,20 +432,9 @@ def no_firearms_offense(
     try:
         decision = Decision(
             name=f"Charge for {item.statute} is not a firearms offense.",
-            reasoning=[
-                item.get_statute_chapter() == 18,
-                item.get_statute_section() > 6100,
-                item.get_statute_section() < 6200,
-            ],
+            reasoning=[OffenseCategories.FIREARMS in facts(item).categories],
         )
         decision.value = not all(decision.reasoning)
-    except TypeError:
-        # `item`'s get_statute functions returned something that doesn't have < > defined, such as None.
-        decision = Decision(
-            name=f"Charge for {item.statute} is not a Chapter 61 firearms offense.",
-            reasoning="The statute doesn't appear to be one of the Article D offense statutes.",
-            value=True,
-        )
     except AttributeError:
         # `item` may be a whole record.
         decision = Decision(
@@ -469,8 +451,8 @@ def no_firearms_offense(
                     within_years=within_years,
                 )
                 for case in item.cases
-                for charge in case.charges
                 if case.years_passed_disposition() <= within_years
+                for charge in case.charges
             ],
         )
         decision.value = (
@@ -501,66 +483,22 @@ def no_sexual_offense(
         True if the charge was NOT a disqualifying offense, or if the record does NOT contain any 
         disqulifying offenses.
     """
-    # 18 Pa.C.S. 9799.14 and 9799.55 relate to quite a few other offenses.
-    tiered_sex_offenses = [
-        "2901a.1",
-        "2902b",
-        "2903b",
-        "2904",
-        "2910b",
-        "3011b",
-        "3121",
-        "3122.1b",
-        "3123",
-        "3124.1",
-        "3124.2a",
-        "3124.2a.1",
-        "3124.2a2",
-        "3124.2a3",
-        "3125",
-        "3126a1",
-        "3126a2",
-        "3126a3",
-        "3126a4",
-        "3126a5",
-        "3126a6",
-        "3126a7",
-        "3126a8",
-        "4302b",
-        "5902b",
-        "5902b.1",
-        "5903a3ii",
-        "5903a4ii",
-        "5903a5ii",
-        "5903a6",
-        "6301a1ii",
-        "6312",
-        "6318",
-        "6320",
-        "7507.1",
-    ]
+    # The offenses are listed in RecordLib.analysis.statutes.TIERED_SEX_OFFENSES.
     # presume item is a Charge
     try:
         decision = Decision(
             name="This charge is not a disqualifying sexual or registration offense?"
         )
-        patt = re.compile(
-            r"^(?P<chapt>\d+)\s*§\s(?P<section>\d+\.?\d*)\s*(?P<subsections>[\(\)A-Za-z0-9\.]+).*"
-        )
-        matches = patt.match(item.statute)
-        if not matches:
+        item_facts = facts(item)
+        if item_facts.offense_code is None:
             decision.reasoning = (
                 "This doesn't appear to be one of the tiered sex offense statutes."
             )
             decision.value = True
         else:
-            this_offense = matches.group("section") + matches.group(
-                "subsections"
-            ).replace("(", "").replace(")", "")
             decision.reasoning = [
-                item.is_conviction(),
-                item.get_statute_chapter() == 18,
-                this_offense in tiered_sex_offenses,
+                item_facts.is_conviction,
+                OffenseCategories.TIERED_SEX_OFFENSE in item_facts.categories,
             ]
             decision.value = not all(decision.reasoning)
     except AttributeError:
@@ -578,8 +516,8 @@ def no_sexual_offense(
                     within_years=within_years,
                 )
                 for case in item.cases
-                for charge in case.charges
                 if case.years_passed_disposition() <= within_years
+                for charge in case.charges
             ],
         )
         decision.value = (
@@ -604,23 +542,16 @@ def no_corruption_of_minors_offense(
     decision = Decision(
         name="This charge is not a disqualifying corruption of minors offense?"
     )
-    patt = re.compile(
-        r"^(?P<chapt>\d+)\s*§\s(?P<section>\d+\.?\d*)\s*(?P<subsections>[\(\)A-Za-z0-9\.]+).*"
-    )
-    matches = patt.match(charge.statute)
-    if not matches:
+    charge_facts = facts(charge)
+    if charge_facts.offense_code is None:
         decision.reasoning = (
             "This doesn't appear to be one of the tiered sex offense statutes."
         )
         decision.value = True
     else:
-        this_offense = matches.group("section") + matches.group("subsections").replace(
-            "(", ""
-        ).replace(")", "")
         decision.reasoning = [
-            charge.is_conviction(),
-            charge.get_statute_chapter() == 18,
-            this_offense == "6301a1",
+            charge_facts.is_conviction,
+            OffenseCategories.CORRUPTION_OF_MINORS in charge_facts.categories,
         ]
         decision.value = not all(decision.reasoning)
     return decision
@@ -651,11 +582,12 @@ def more_than_x_convictions_y_grade_z_years(
     )
     qualifying_charges = []
     for case in crecord.cases:
+        if case.years_passed_disposition() < years:
+            continue
         for charge in case.charges:
             if (
-                case.years_passed_disposition() >= years
-                and charge.is_conviction()
-                and Charge.grade_GTE(charge.grade, grade_limit)
+                facts(charge).is_conviction
+                and facts(charge).grade_GTE(grade_limit)
             ):
                 qualifying_charges.append(charge)
     decision.reasoning = qualifying_charges
@@ -691,12 +623,9 @@ def offenses_punishable_by_two_or_more_years(
         reasoning=[
             charge
             for case in crecord.cases
+            if case.years_passed_disposition() < within_years
             for charge in case.charges
-            if (
-                charge.is_conviction()
-                and (charge.grade in proxy_grades)
-                and case.years_passed_disposition() < within_years
-            )
+            if (facts(charge).is_conviction and (charge.grade in proxy_grades))
         ],
     )
     decision.value = len(decision.reasoning) < conviction_limit
@@ -721,12 +650,11 @@ def no_indecent_exposure(
         reasoning=[
             charge
             for case in crecord.cases
+            if case.years_passed_disposition() < within_years
             for charge in case.charges
             if (
-                case.years_passed_disposition() < within_years
-                and charge.is_conviction()
-                and charge.get_statute_chapter() == 18
-                and charge.get_statute_section() == 3127
+                facts(charge).is_conviction
+                and OffenseCategories.INDECENT_EXPOSURE in facts(charge).categories
             )
         ],
     )
@@ -750,12 +678,11 @@ def no_sexual_intercourse_w_animal(
         reasoning=[
             charge
             for case in crecord.cases
+            if case.years_passed_disposition() < within_years
             for charge in case.charges
             if (
-                case.years_passed_disposition() < within_years
-                and charge.is_conviction()
-                and charge.get_statute_chapter() == 18
-                and charge.get_statute_section() == 3129
+                facts(charge).is_conviction
+                and OffenseCategories.INTERCOURSE_WITH_ANIMAL in facts(charge).categories
             )
         ],
     )
@@ -779,15 +706,11 @@ def no_failure_to_register(
         reasoning=[
             charge
             for case in crecord.cases
+            if case.years_passed_disposition() < within_years
             for charge in case.charges
             if (
-                case.years_passed_disposition() < within_years
-                and charge.is_conviction()
-                and charge.get_statute_chapter() == 18
-                and (
-                    charge.get_statute_section() == 4915.1
-                    or charge.get_statute_section() == 4915.2
-                )
+                facts(charge).is_conviction
+                and OffenseCategories.FAILURE_TO_REGISTER in facts(charge).categories
             )
         ],
     )
@@ -808,12 +731,11 @@ def no_weapons_of_escape(
         reasoning=[
             charge
             for case in crecord.cases
+            if case.years_passed_disposition() < within_years
             for charge in case.charges
             if (
-                case.years_passed_disposition() < within_years
-                and charge.is_conviction()
-                and charge.get_statute_chapter() == 18
-                and charge.get_statute_section() == 5122
+                facts(charge).is_conviction
+                and OffenseCategories.WEAPON_OF_ESCAPE in facts(charge).categories
             )
         ],
     )
@@ -834,12 +756,11 @@ def no_abuse_of_corpse(
         reasoning=[
             charge
             for case in crecord.cases
+            if case.years_passed_disposition() < within_years
             for charge in case.charges
             if (
-                case.years_passed_disposition() < within_years
-                and charge.is_conviction()
-                and charge.get_statute_chapter() == 18
-                and charge.get_statute_section() == 5510
+                facts(charge).is_conviction
+                and OffenseCategories.ABUSE_OF_CORPSE in facts(charge).categories
             )
         ],
     )
@@ -860,12 +781,11 @@ def no_paramilitary_training(
         reasoning=[
             charge
             for case in crecord.cases
+            if case.years_passed_disposition() < within_years
             for charge in case.charges
             if (
-                case.years_passed_disposition() < within_years
-                and charge.is_conviction()
-                and charge.get_statute_chapter() == 18
-                and charge.get_statute_section() == 5515
+                facts(charge).is_conviction
+                and OffenseCategories.PARAMILITARY_TRAINING in facts(charge).categories
             )
         ],
     )
@@ -929,10 +849,9 @@ def petition_sealing_for_single_case(case: Case) -> Decision:
     case_decision = Decision(name=f"Sealing case {case.docket_number}", reasoning=[])
     fines_decision = fines_and_costs_paid(case)  # 18 Pa.C.S. 9122.1(a)
     case_decision.reasoning.append(fines_decision)
-    # create copies of a case that don't include any charges.
-    # sealable or unsealable charges will be added to these.
-    sealable_parts_of_case = case.partialcopy()
-    unsealable_parts_of_case = case.partialcopy()
+    # sealable or unsealable charges will be added to these, and then sliced out of the case.
+    sealable_charges = []
+    unsealable_charges = []
 
     # Iterate over the charges in a case, to see which charges are sealable.
     charge_decisions = []
@@ -941,9 +860,11 @@ def petition_sealing_for_single_case(case: Case) -> Decision:
         charge_decision = petition_sealing_for_single_charge(charge)
         charge_decisions.append(charge_decision)
         if bool(charge_decision) is True:
-            sealable_parts_of_case.charges.append(charge)
+            sealable_charges.append(charge)
         else:
-            unsealable_parts_of_case.charges.append(charge)
+            unsealable_charges.append(charge)
+    sealable_parts_of_case = case.with_charges(sealable_charges)
+    unsealable_parts_of_case = case.with_charges(unsealable_charges)
 
     case_decision.value = (
         unsealable_parts_of_case if len(unsealable_parts_of_case.charges) > 0 else None,
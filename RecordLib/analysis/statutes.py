@@ -0,0 +1,177 @@
+"""
+Which categories of offense a statute belongs to, for the rules that disqualify records with certain offenses.
+
+The categories are kept in one `StatuteIndex`, `statute_index`, rather than in checks spread through the rules.
+A statute can be in a category because of:
+
+    * its exact section, like 18 § 3127 (indecent exposure),
+    * a range of sections it falls in, like 18 § 2301 through 18 § 3299 (Article B, offenses against the person), or
+    * its section and subsections, like 18 § 3126(a)(1), written as the offense code "3126a1".
+
+Classifying a statute is a dictionary lookup for sections and offense codes, and a binary search for the ranges.
+
+    statute_index.categories(18, 3127, "3127") == frozenset({OffenseCategories.INDECENT_EXPOSURE})
+"""
+from __future__ import annotations
+from bisect import bisect_left
+from typing import Dict, FrozenSet, List, Optional, Set, Tuple
+
+
+class OffenseCategories:
+    """ The categories a statute can belong to. """
+
+    # Article B of Part II of Title 18.
+    DANGER_TO_PERSON = "danger to person"
+    # Article D of Part II of Title 18.
+    AGAINST_FAMILY = "offense against the family"
+    # Chapter 61 of Title 18.
+    FIREARMS = "firearms"
+    # 42 Pa.C.S. §§ 9799.14 and 9799.55.
+    TIERED_SEX_OFFENSE = "tiered sexual or registration offense"
+    CORRUPTION_OF_MINORS = "corruption of minors"
+    INDECENT_EXPOSURE = "indecent exposure"
+    INTERCOURSE_WITH_ANIMAL = "sexual intercourse with animal"
+    FAILURE_TO_REGISTER = "failure to register"
+    WEAPON_OF_ESCAPE = "implement or weapon of escape"
+    ABUSE_OF_CORPSE = "abuse of corpse"
+    PARAMILITARY_TRAINING = "paramilitary training"
+
+
+class SectionRanges:
+    """
+    A sorted interval map from open ranges of sections to the categories they belong to.
+
+    Ranges may overlap. The bounds of all the ranges split the number line into points and the gaps
+    between them, and each point and gap gets the set of categories of every range that covers it.
+    """
+
+    def __init__(self):
+        self._ranges: List[Tuple[float, float, str]] = []
+        self._bounds: Optional[List[float]] = None
+        self._at_bound: List[FrozenSet[str]] = []
+        self._below_bound: List[FrozenSet[str]] = []
+
+    def add(self, low: float, high: float, category: str) -> None:
+        """ Put the sections strictly between `low` and `high` in `category`. """
+        self._ranges.append((low, high, category))
+        self._bounds = None
+
+    def _build(self) -> None:
+        bounds = sorted({b for low, high, _ in self._ranges for b in (low, high)})
+        # _below_bound[i] covers the gap below bounds[i]. The last one covers the gap above the highest bound.
+        self._at_bound = [
+            frozenset(c for low, high, c in self._ranges if low < b < high) for b in bounds
+        ]
+        gaps = zip([None] + bounds, bounds + [None])
+        self._below_bound = [
+            frozenset(
+                c
+                for low, high, c in self._ranges
+                if below is not None and above is not None and low <= below and above <= high
+            )
+            for below, above in gaps
+        ]
+        self._bounds = bounds
+
+    def categories(self, section: float) -> FrozenSet[str]:
+        if self._bounds is None:
+            self._build()
+        i = bisect_left(self._bounds, section)
+        if i < len(self._bounds) and self._bounds[i] == section:
+            return self._at_bound[i]
+        return self._below_bound[i]
+
+
+class StatuteIndex:
+    """
+    Maps statutes, by title, section, and offense code, to the categories of offense they belong to.
+    """
+
+    def __init__(self):
+        self._sections: Dict[Tuple[float, float], Set[str]] = dict()
+        self._ranges: Dict[float, SectionRanges] = dict()
+        self._offense_codes: Dict[Tuple[float, str], Set[str]] = dict()
+
+    def add_section(self, title: float, section: float, category: str) -> None:
+        self._sections.setdefault((title, section), set()).add(category)
+
+    def add_range(self, title: float, low: float, high: float, category: str) -> None:
+        """ Put the sections of `title` strictly between `low` and `high` in `category`. """
+        self._ranges.setdefault(title, SectionRanges()).add(low, high, category)
+
+    def add_offense_code(self, title: float, offense_code: str, category: str) -> None:
+        self._offense_codes.setdefault((title, offense_code), set()).add(category)
+
+    def categories(
+        self,
+        title: Optional[float],
+        section: Optional[float],
+        offense_code: Optional[str] = None,
+    ) -> FrozenSet[str]:
+        """ All the categories that a statute belongs to. Statutes that can't be read belong to none. """
+        found = set()
+        if title is None:
+            return frozenset()
+        if section is not None:
+            found.update(self._sections.get((title, section), ()))
+            if title in self._ranges:
+                found.update(self._ranges[title].categories(section))
+        if offense_code is not None:
+            found.update(self._offense_codes.get((title, offense_code), ()))
+        return frozenset(found)
+
+
+# 18 Pa.C.S. 9799.14 and 9799.55 relate to quite a few other offenses.
+TIERED_SEX_OFFENSES = [
+    "2901a.1",
+    "2902b",
+    "2903b",
+    "2904",
+    "2910b",
+    "3011b",
+    "3121",
+    "3122.1b",
+    "3123",
+    "3124.1",
+    "3124.2a",
+    "3124.2a.1",
+    "3124.2a2",
+    "3124.2a3",
+    "3125",
+    "3126a1",
+    "3126a2",
+    "3126a3",
+    "3126a4",
+    "3126a5",
+    "3126a6",
+    "3126a7",
+    "3126a8",
+    "4302b",
+    "5902b",
+    "5902b.1",
+    "5903a3ii",
+    "5903a4ii",
+    "5903a5ii",
+    "5903a6",
+    "6301a1ii",
+    "6312",
+    "6318",
+    "6320",
+    "7507.1",
+]
+
+
+statute_index = StatuteIndex()
+statute_index.add_range(18, 2300, 3300, OffenseCategories.DANGER_TO_PERSON)
+statute_index.add_range(18, 4300, 4500, OffenseCategories.AGAINST_FAMILY)
+statute_index.add_range(18, 6100, 6200, OffenseCategories.FIREARMS)
+for offense_code in TIERED_SEX_OFFENSES:
+    statute_index.add_offense_code(18, offense_code, OffenseCategories.TIERED_SEX_OFFENSE)
+statute_index.add_offense_code(18, "6301a1", OffenseCategories.CORRUPTION_OF_MINORS)
+statute_index.add_section(18, 3127, OffenseCategories.INDECENT_EXPOSURE)
+statute_index.add_section(18, 3129, OffenseCategories.INTERCOURSE_WITH_ANIMAL)
+statute_index.add_section(18, 4915.1, OffenseCategories.FAILURE_TO_REGISTER)
+statute_index.add_section(18, 4915.2, OffenseCategories.FAILURE_TO_REGISTER)
+statute_index.add_section(18, 5122, OffenseCategories.WEAPON_OF_ESCAPE)
+statute_index.add_section(18, 5510, OffenseCategories.ABUSE_OF_CORPSE)
+statute_index.add_section(18, 5515, OffenseCategories.PARAMILITARY_TRAINING)
@@ -6,7 +6,7 @@ from typing import List, Optional
 from datetime import date, datetime
 import logging
 from dateutil.relativedelta import relativedelta
-from .helpers import convert_datestring
+from .helpers import attributes, convert_datestring
 
 
 class Case:
@@ -15,6 +15,26 @@ class Case:
 
     """
 
+    # Cases keep their attributes in slots rather than a __dict__, to save memory when screening many records.
+    __slots__ = (
+        "docket_number",
+        "otn",
+        "dc",
+        "charges",
+        "total_fines",
+        "fines_paid",
+        "status",
+        "county",
+        "arrest_date",
+        "complaint_date",
+        "disposition_date",
+        "judge",
+        "judge_address",
+        "affiant",
+        "arresting_agency",
+        "arresting_agency_address",
+    )
+
     status: str
     county: str
     docket_number: str
@@ -170,6 +190,22 @@ class Case:
             arresting_agency_address=self.arresting_agency_address,
         )
 
+    def with_charges(self, charges: List[Charge]) -> Case:
+        """
+        Return a Case with the static info of this case and only `charges`.
+
+        If `charges` are all of this case's charges, the result is this same Case, not a copy. Otherwise it is a
+        partialcopy holding `charges`. Rules use this to split a case's charges into those that meet some
+        condition and those that don't, without copying cases that don't need splitting.
+        """
+        if len(charges) == len(self.charges) and all(
+            new is old for new, old in zip(charges, self.charges)
+        ):
+            return self
+        case = self.partialcopy()
+        case.charges = list(charges)
+        return case
+
     def fines_remaining(self) -> Optional[int]:
         """ Return the value of the fines remaining on the case.
 
@@ -203,10 +239,8 @@ class Case:
         the parser did. Using 'completeness', we can compare cases to each other to evaluate whether one case is more completed than another.
         """
         score = 0
-        attrs = self.__dict__.keys()
-        for attr in attrs:
+        for attr, val in attributes(self):
             # sometimes an attribute is given a blank value, like docket_number='', but that shouldn't count as a filled-in value.
-            val = getattr(self, attr)
             if val is not None:
                 if isinstance(val, (int, float)):
                     score += 1
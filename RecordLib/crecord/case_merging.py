@@ -0,0 +1,157 @@
+"""
+Merging new cases into the cases a CRecord already has.
+
+A `CaseIndex` finds the case in a record with the same docket number as a new case (or, for a case
+without a docket number, the same OTN) with a dictionary lookup, so merging the cases of a source record
+into a record takes time in proportion to the number of new cases plus old cases, rather than new cases times
+old cases. (The old cases are compared with the index once per merge, in case they were changed some other way.)
+A new case with neither a docket number nor an OTN doesn't match any case, so it is always added.
+
+When a new case matches an old one, a merge strategy decides what the record keeps:
+
+    * "ignore_new" keeps the old case.
+    * "overwrite_old" keeps the new case.
+    * "most_complete" keeps whichever case has the higher `Case.completeness()`, or the old one if it's a tie.
+    * "fill_blanks" keeps a copy of whichever case is most complete, with any of its blank fields
+      filled in from the other case.
+"""
+from __future__ import annotations
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Tuple
+import logging
+from weakref import WeakKeyDictionary
+from .case import Case
+
+if TYPE_CHECKING:
+    from .crecord import CRecord
+
+logger = logging.getLogger(__name__)
+
+
+def is_blank(val) -> bool:
+    """ Would `Case.completeness` count this value as not filled in? """
+    if val is None:
+        return True
+    if isinstance(val, (str, list, dict, tuple)):
+        return len(val) == 0
+    return False
+
+
+def most_complete(old: Case, new: Case) -> Case:
+    if new.completeness() > old.completeness():
+        return new
+    return old
+
+
+def fill_blanks(old: Case, new: Case) -> Case:
+    """
+    A copy of the more complete of `old` and `new`, with its blank fields filled in from the other one.
+
+    The charges come from the more complete case, unless it has none.
+    """
+    base, other = (new, old) if new.completeness() > old.completeness() else (old, new)
+    merged = base.partialcopy()
+    merged.charges = list(base.charges or other.charges)
+    for field in Case.__annotations__:
+        if field != "charges" and is_blank(getattr(merged, field, None)):
+            setattr(merged, field, getattr(other, field, None))
+    return merged
+
+
+MERGE_STRATEGIES: Dict[str, Callable[[Case, Case], Case]] = {
+    "ignore_new": lambda old, new: old,
+    "overwrite_old": lambda old, new: new,
+    "most_complete": most_complete,
+    "fill_blanks": fill_blanks,
+}
+
+
+class CaseIndex:
+    """
+    The positions of the cases in a list of cases, by docket number and by OTN.
+
+    The index belongs to one list, and changes to the list are only indexed if they're made through `append`
+    and `replace`. `matches` checks that the list hasn't been changed any other way since, by comparing
+    it with a snapshot of the cases and their docket numbers and OTNs.
+    """
+
+    def __init__(self, cases: List[Case]):
+        self.cases = cases
+        self._build()
+
+    def _build(self) -> None:
+        self._by_docket: Dict[str, int] = dict()
+        self._by_otn: Dict[str, int] = dict()
+        self._snapshot: List[Tuple[Case, str, str]] = []
+        # Whether two cases in the list share a docket number or OTN, so only the first is indexed.
+        self._duplicates = False
+        for position, case in enumerate(self.cases):
+            self._add(position, case)
+
+    def _add(self, position: int, case: Case) -> None:
+        if case.docket_number:
+            if self._by_docket.setdefault(case.docket_number, position) != position:
+                self._duplicates = True
+        if case.otn:
+            if self._by_otn.setdefault(case.otn, position) != position:
+                self._duplicates = True
+        entry = (case, case.docket_number, case.otn)
+        if position == len(self._snapshot):
+            self._snapshot.append(entry)
+        else:
+            self._snapshot[position] = entry
+
+    def matches(self, cases: List[Case]) -> bool:
+        """ Is `cases` this index's list, holding the same cases, with the same docket numbers and OTNs, as when they were indexed? """
+        return (
+            cases is self.cases
+            and len(cases) == len(self._snapshot)
+            and all(
+                case is old and case.docket_number == docket_number and case.otn == otn
+                for case, (old, docket_number, otn) in zip(cases, self._snapshot)
+            )
+        )
+
+    def find(self, case: Case) -> Optional[int]:
+        """
+        The position of the case with the same docket number as `case`.
+
+        Cases are only matched by OTN if `case` doesn't have a docket number, because the cases of one
+        arrest (for example, a case in the Municipal Court and the case it was held for in the Court of Common
+        Pleas) can share an OTN. A case with neither has no match.
+        """
+        if case.docket_number:
+            return self._by_docket.get(case.docket_number)
+        if case.otn:
+            return self._by_otn.get(case.otn)
+        return None
+
+    def append(self, case: Case) -> None:
+        self.cases.append(case)
+        self._add(len(self.cases) - 1, case)
+
+    def replace(self, position: int, case: Case) -> None:
+        _, docket_number, otn = self._snapshot[position]
+        self.cases[position] = case
+        if self._duplicates:
+            # The old case's keys may need to point at another case with the same docket number or OTN.
+            self._build()
+            return
+        if self._by_docket.get(docket_number) == position and docket_number != case.docket_number:
+            del self._by_docket[docket_number]
+        if self._by_otn.get(otn) == position and otn != case.otn:
+            del self._by_otn[otn]
+        self._add(position, case)
+
+
+# The CaseIndex of each CRecord that has merged cases. They're kept here rather than as an attribute of
+# the CRecord, so that serializing a CRecord doesn't include its index.
+_indexes: WeakKeyDictionary = WeakKeyDictionary()
+
+
+def case_index(crecord: CRecord) -> CaseIndex:
+    """ The CaseIndex of `crecord`'s cases, built again if the cases were changed other than through the index. """
+    index = _indexes.get(crecord)
+    if index is None or not index.matches(crecord.cases):
+        index = CaseIndex(crecord.cases)
+        _indexes[crecord] = index
+    return index
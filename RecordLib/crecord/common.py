@@ -3,17 +3,39 @@ Common, simple dataclasses live here.
 """
 from __future__ import annotations
 from dataclasses import dataclass, fields
-from typing import List, Tuple, Optional
+from typing import Dict, List, Tuple, Optional
 from datetime import date, timedelta
 import re
 import logging
 from dateutil.relativedelta import relativedelta
 import json
-import functools
+from .helpers import slotted
 
 logger = logging.getLogger(__name__)
 
+# Charge grades, from least to most serious.
+GRADES = ["", "S", "M", "IC", "M3", "M2", "M1", "F", "F3", "F2", "F1"]
+GRADE_RANKS = {grade: rank for rank, grade in enumerate(GRADES)}
 
+STATUTE_CHAPTER = re.compile(r"^(?P<chapt>\d+)\s*§\s(?P<section>\d+).*")
+STATUTE_SECTION = re.compile(r"^(?P<chapt>\d+)\s*§\s(?P<section>\d+\.?\d*).*")
+STATUTE_SUBSECTIONS = re.compile(
+    r"^(?P<chapt>\d+)\s*§\s(?P<section>\d+\.?\d*)\s*§§\s*(?P<subsections>[\(\)A-Za-z0-9\.\*]+)\s*.*"
+)
+STATUTE_OFFENSE = re.compile(
+    r"^(?P<chapt>\d+)\s*§\s(?P<section>\d+\.?\d*)\s*(?P<subsections>[\(\)A-Za-z0-9\.]+).*"
+)
+
+# Dispositions that end a charge. When a docket lists several events for a charge, the last of these is the
+# charge's final disposition.
+FINAL_DISPOSITION = re.compile(r"nolle|guilt|dismiss|withdraw", re.IGNORECASE)
+
+
+def is_final_disposition(disposition: Optional[str]) -> bool:
+    return disposition is not None and FINAL_DISPOSITION.search(disposition) is not None
+
+
+@slotted
 @dataclass
 class SentenceLength:
     """
@@ -93,6 +115,7 @@ class SentenceLength:
         return cls(min_time=min_time, max_time=max_time)
 
 
+@slotted
 @dataclass
 class Sentence:
     """
@@ -116,6 +139,7 @@ class Sentence:
             return None
 
 
+@slotted
 @dataclass
 class Charge:
     """
@@ -149,16 +173,15 @@ class Charge:
             grade_GTE("M1", "S") == True
             grade_GTE("S","") == False
         """
-        grades = ["", "S", "M", "IC", "M3", "M2", "M1", "F", "F3", "F2", "F1"]
         try:
-            i_a = grades.index(grade_a)
-        except ValueError:
+            i_a = GRADE_RANKS[grade_a]
+        except KeyError:
             logger.error(
                 f"Couldn't understand the first grade, {grade_a}, so assuming it has low seriousness."
             )
             i_a = 0
         try:
-            i_b = grades.index(grade_b)
+            i_b = GRADE_RANKS[grade_b]
         except:
             logger.error(
                 f"Couldn't understand the second grade, {grade_b}, so assuming it has low seriousness."
@@ -186,25 +209,20 @@ class Charge:
         In a Docket, there's often a number of records relating to a single charge. There records explain
         how a charge proceeded through the case. When we parse a docket, if we find lots of records of 
         charges, we need to reduce them into a list where each charge only appears once.
-        """
 
-        def reducer(accumulator, charge):
-            """
-            Add charge to accumulator, if the charge is new. Otherwise combine charge with its pre-existing charge.
-            """
-            if len(accumulator) == 0:
-                return [charge]
-            new_charges = []
-            is_new = True
-            for ch in accumulator:
-                if isinstance(charge.sequence, int) and charge.sequence == ch.sequence:
-                    ch.combine_with(charge)
-                    is_new = False
-            if is_new:
-                accumulator.append(charge)
-            return accumulator
-
-        reduced = functools.reduce(reducer, charges, [])
+        Charges are folded into the first charge with their sequence number, in the order they appear.
+        Charges without a sequence number are never merged.
+        """
+        by_sequence: Dict[int, Charge] = dict()
+        reduced = []
+        for charge in charges:
+            if isinstance(charge.sequence, int):
+                first = by_sequence.get(charge.sequence)
+                if first is not None:
+                    first.combine_with(charge)
+                    continue
+                by_sequence[charge.sequence] = charge
+            reduced.append(charge)
         return reduced
 
     @staticmethod
@@ -237,22 +255,20 @@ class Charge:
         """
         Combine this Charge with another, filling in missing info, or updating certain fields.
         """
-        for attr in self.__dict__.keys():
-            if getattr(self, attr) is None and getattr(charge, attr) is not None:
-                setattr(self, attr, getattr(charge, attr))
-            elif (
-                isinstance(getattr(self, attr), str)
-                and getattr(self, attr).strip() == ""
-            ) and (
-                isinstance(getattr(charge, attr), str)
-                and (getattr(charge, attr).strip() != "")
+        for attr in CHARGE_FIELDS:
+            mine = getattr(self, attr)
+            theirs = getattr(charge, attr)
+            if mine is None:
+                if theirs is not None:
+                    setattr(self, attr, theirs)
+            elif (isinstance(mine, str) and mine.strip() == "") and (
+                isinstance(theirs, str) and theirs.strip() != ""
             ):
-                setattr(self, attr, getattr(charge, attr))
-            elif attr == "disposition":
-                if re.search(r"nolle|guilt|dismiss|withdraw", charge.disposition, re.I):
-                    # the new charge has a disposition that should be saved as the final disposition of this charge.
-                    self.disposition = charge.disposition
-                    self.disposition_date = getattr(charge, "disposition_date", None)
+                setattr(self, attr, theirs)
+            elif attr == "disposition" and is_final_disposition(theirs):
+                # the new charge has a disposition that should be saved as the final disposition of this charge.
+                self.disposition = theirs
+                self.disposition_date = charge.disposition_date
 
         return self
 
@@ -272,8 +288,7 @@ class Charge:
     def get_statute_chapter(self) -> Optional[float]:
         """ Get the Chapter in the PA Code that this charge is related to. 
         """
-        patt = re.compile("^(?P<chapt>\d+)\s*§\s(?P<section>\d+).*")
-        match = patt.match(self.statute)
+        match = STATUTE_CHAPTER.match(self.statute)
         if match:
             return float(match.group("chapt"))
         else:
@@ -282,8 +297,7 @@ class Charge:
     def get_statute_section(self) -> Optional[float]:
         """ Get the Statute section of the PA code, to which this charge is related.
         """
-        patt = re.compile("^(?P<chapt>\d+)\s*§\s(?P<section>\d+\.?\d*).*")
-        match = patt.match(self.statute)
+        match = STATUTE_SECTION.match(self.statute)
         if match:
             return float(match.group("section"))
         else:
@@ -292,15 +306,26 @@ class Charge:
     def get_statute_subsections(self) -> str:
         """ Get the subsection, if any, to which this charge relates
         """
-        patt = re.compile(
-            "^(?P<chapt>\d+)\s*§\s(?P<section>\d+\.?\d*)\s*§§\s*(?P<subsections>[\(\)A-Za-z0-9\.\*]+)\s*.*"
-        )
-        match = patt.match(self.statute)
+        match = STATUTE_SUBSECTIONS.match(self.statute)
         if match:
             return match.group("subsections")
         else:
             return ""
 
+    def get_offense_code(self) -> Optional[str]:
+        """ Get the section and subsections of the statute run together, without parentheses, like "3126a1".
+        """
+        match = STATUTE_OFFENSE.match(self.statute)
+        if match:
+            return match.group("section") + match.group("subsections").replace(
+                "(", ""
+            ).replace(")", "")
+        else:
+            return None
+
+
+CHARGE_FIELDS = tuple(field.name for field in fields(Charge))
+
 
 @dataclass
 class Address:
@@ -13,6 +13,7 @@ from datetime import date
 from dateutil.relativedelta import relativedelta
 from .person import Person
 from .case import Case
+from .case_merging import MERGE_STRATEGIES, CaseIndex, case_index
 
 
 def years_since_last_arrested_or_prosecuted(crecord: CRecord) -> int:
@@ -98,6 +99,17 @@ class CRecord:
         else:
             self.cases = cases
 
+    def slice(self, cases: Optional[List[Case]] = None) -> CRecord:
+        """
+        Return a new CRecord with the same Person as this one, and `cases` (by default, all of this record's cases)
+        in a list of its own.
+
+        Nothing is copied except the list, so this is cheap no matter how big the record is. The new record can
+        gain or lose cases without changing this one, but its Person, Cases, and Charges are shared, and must
+        not be modified.
+        """
+        return CRecord(person=self.person, cases=list(self.cases if cases is None else cases))
+
     def to_dict(self) -> dict:
         # TODO Delete
         return {
@@ -122,7 +134,8 @@ class CRecord:
 
         Args:
             summary (Summary): A parsed summary sheet.
-            case_merge_strategy (str): "ignore_new" or "overwrite_old", which indicate whether duplicate new cases should be dropped or should replace the old ones
+            case_merge_strategy (str): "ignore_new", "overwrite_old", "most_complete", or "fill_blanks", which indicate whether duplicate
+                new cases should be dropped, should replace the old ones, or should be merged with them.
 
         Returns:
             This updated CRecord object.
@@ -131,27 +144,7 @@ class CRecord:
         if override_person or self.person is None:
             self.person = summary.get_defendant()
         # Get the cases from the summary
-        docket_nums = [c.docket_number for c in self.cases]
-        for i, new_case in enumerate(summary.get_cases()):
-            if new_case.docket_number not in docket_nums:
-                logging.info(f"Adding {new_case.docket_number} to record.")
-                self.cases.append(new_case)
-                docket_nums.append(new_case.docket_number)
-            elif case_merge_strategy == "ignore_new":
-                logging.info(
-                    f"Case with docket { new_case.docket_number } already part of record. Ignoring it."
-                )
-            elif case_merge_strategy == "overwrite_old":
-                logging.info(
-                    f"Case with docket { new_case.docket_number } already part of record. Using it."
-                )
-                self.cases[i] = new_case
-            else:
-                logging.info(
-                    f"Case with docket { new_case.docket_number } already part of record, no merge strategy selected. Ignoring duplicate."
-                )
-
-        return self
+        return self.merge_cases(summary.get_cases(), case_merge_strategy)
 
     def add_docket(self: CRecord, docket: "Docket") -> CRecord:
         """
@@ -163,15 +156,8 @@ class CRecord:
         Returns:
             This CRecord, with the information from `docket` incorporated into the record.
         """
-        replaced = False
         self.person = docket._defendant
-        for i, case in enumerate(self.cases):
-            if case.docket_number == docket._case.docket_number:
-                replaced = True
-                self.cases[i] = docket._case
-        if replaced is False:
-            self.cases.append(docket._case)
-        return self
+        return self.merge_case(docket._case, case_merge_strategy="overwrite_old")
 
     def add_sourcerecord(
         self,
@@ -195,8 +181,8 @@ class CRecord:
 
         Args:
             sourcerecord (SourceRecord): A parsed sourcerecord
-            case_merge_strategy (str): "ignore_new" or "overwrite_old", which indicate whether duplicate new cases should be 
-                dropped or should replace the old ones
+            case_merge_strategy (str): "ignore_new", "overwrite_old", "most_complete", or "fill_blanks", which indicate whether
+                duplicate new cases should be dropped, should replace the old ones, or should be merged with them.
             override_person (bool): Should the source record's Person replace the crecord's current Person?
             docket_number (str or None): If provided, and if the sourcerecord only contains one case (i.e., its a Docket, 
                 not a Summary), then give the case this docket number.
@@ -212,28 +198,52 @@ class CRecord:
             # We're done. No modifications of self are necessary.
             return self
 
-        docket_nums = [c.docket_number for c in self.cases]
-        for i, new_case in enumerate(sourcerecord.cases):
-            # If we're only adding one case, and have passed in a docket number, give the new case the docket number.
-            if docket_number is not None and len(sourcerecord.cases) == 1:
-                new_case.docket_number = docket_number
-            if new_case.docket_number not in docket_nums:
+        # If we're only adding one case, and have passed in a docket number, give the new case the docket number.
+        if docket_number is not None and len(sourcerecord.cases) == 1:
+            sourcerecord.cases[0].docket_number = docket_number
+        return self.merge_cases(sourcerecord.cases, case_merge_strategy)
+
+    def case_index(self) -> CaseIndex:
+        """
+        An index of this record's cases by docket number. It's kept between merges, and built again if
+        `cases` was changed some other way since the last merge.
+        """
+        return case_index(self)
+
+    def merge_case(self, new_case: Case, case_merge_strategy: str = "ignore_new") -> CRecord:
+        """
+        Add `new_case` to this record, or if the record already has a case with the same docket number,
+        keep the case that `case_merge_strategy` picks. See RecordLib.crecord.case_merging for the strategies.
+
+        Returns:
+            This updated CRecord object.
+        """
+        return self.merge_cases([new_case], case_merge_strategy)
+
+    def merge_cases(self, new_cases: List[Case], case_merge_strategy: str = "ignore_new") -> CRecord:
+        """
+        Merge each of `new_cases` into this record, like `merge_case`.
+
+        Returns:
+            This updated CRecord object.
+        """
+        index = self.case_index()
+        strategy = MERGE_STRATEGIES.get(case_merge_strategy)
+        for new_case in new_cases:
+            position = index.find(new_case)
+            if position is None:
                 logging.info(f"Adding {new_case.docket_number} to record.")
-                self.cases.append(new_case)
-                docket_nums.append(new_case.docket_number)
-            elif case_merge_strategy == "ignore_new":
+                index.append(new_case)
+            elif strategy is None:
                 logging.info(
-                    f"Case with docket { new_case.docket_number } already part of record. Ignoring it."
-                )
-            elif case_merge_strategy == "overwrite_old":
-                logging.info(
-                    f"Case with docket { new_case.docket_number } already part of record. Using it."
+                    f"Case with docket { new_case.docket_number } already part of record, no merge strategy selected. Ignoring duplicate."
                 )
-                self.cases[i] = new_case
             else:
                 logging.info(
-                    f"Case with docket { new_case.docket_number } already part of record, no merge strategy selected. Ignoring duplicate."
+                    f"Case with docket { new_case.docket_number } already part of record. Merging with {case_merge_strategy}."
                 )
-
+                merged = strategy(self.cases[position], new_case)
+                if merged is not self.cases[position]:
+                    index.replace(position, merged)
         return self
 
@@ -1,4 +1,6 @@
-from typing import Union
+from typing import Iterator, Tuple, Union
+from dataclasses import fields
+import functools
 from datetime import datetime, date
 import logging
 
@@ -20,3 +22,49 @@ def convert_datestring(datestring: Union[str,date,datetime,None]) -> date:
     logger.error(f"Could not read date string: {datestring}")
     return None
 
+
+
+def slotted(cls: type) -> type:
+    """
+    Class decorator that gives a dataclass __slots__ for its fields, so its instances have no __dict__ and take
+    less memory. Use it above @dataclass.
+
+    Dataclasses can't have both __slots__ and field defaults (and Python 3.7's dataclass doesn't have a `slots`
+    option), so this builds the class again, with __slots__ and without the defaults. The dataclass's __init__ keeps
+    its own copy of the defaults.
+    """
+    names = tuple(field.name for field in fields(cls))
+    cls_dict = dict(cls.__dict__)
+    cls_dict["__slots__"] = names
+    for name in names:
+        cls_dict.pop(name, None)
+    cls_dict.pop("__dict__", None)
+    cls_dict.pop("__weakref__", None)
+    return type(cls)(cls.__name__, cls.__bases__, cls_dict)
+
+
+@functools.lru_cache(maxsize=None)
+def attribute_names(cls: type) -> Tuple[str, ...]:
+    """ The names of the attributes held in the __slots__ of `cls` and its bases, in the order they're declared. """
+    names = []
+    for klass in reversed(cls.__mro__):
+        slots = klass.__dict__.get("__slots__", ())
+        if isinstance(slots, str):
+            slots = (slots,)
+        names.extend(name for name in slots if name not in ("__dict__", "__weakref__"))
+    return tuple(names)
+
+
+def attributes(an_object) -> Iterator[Tuple[str, object]]:
+    """
+    The (name, value) pairs of an object's attributes, whether it keeps them in a __dict__ or in __slots__.
+    Slots that haven't been set are left out.
+    """
+    try:
+        yield from an_object.__dict__.items()
+    except AttributeError:
+        for name in attribute_names(type(an_object)):
+            try:
+                yield name, getattr(an_object, name)
+            except AttributeError:
+                continue
@@ -1,14 +1,31 @@
+"""
+Zip archives of rendered petitions.
+
+Each petition is saved into an in-memory buffer and written to the archive from there, so rendering a
+bundle of petitions doesn't write any of them to disk.
+
+    * `write_archive` writes the archive to any writable file object, even one that can't seek.
+    * `spooled_archive` builds it in a SpooledTemporaryFile, which stays in memory until it grows past
+      a threshold and then spills to disk.
+    * `stream_archive` yields the bytes of the archive as each petition is added, for a streaming response.
+    * `Compressor` builds it on disk, for the command line scripts that need a path to the archive.
+"""
 import zipfile
-import io 
-from typing import List, Tuple
+import io
+from typing import Iterable, Iterator, List, Tuple
 import secrets
 from RecordLib.petitions import Petition
 from docxtpl import DocxTemplate
 from contextlib import contextmanager
-import os 
+import os
+import shutil
 import tempfile
 import string
 
+# Archives bigger than this are spooled to disk rather than held in memory.
+MAX_IN_MEMORY = 10 * 1024 * 1024
+
+
 def random_temp_directory() -> str:
     """
     return a random name for a temporary directory.
@@ -17,14 +34,83 @@ def random_temp_directory() -> str:
     return ''.join(secrets.choice(alphabet) for i in range(30))
 
 
+def docx_bytes(document: DocxTemplate) -> bytes:
+    """ Save a rendered document into memory, and return its bytes. """
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+def write_archive(fileobj, files: Iterable[Tuple[str, DocxTemplate]]) -> None:
+    """
+    Write a zip archive of the documents in `files` to `fileobj`.
+
+    `files` may be a generator, so that each document is only rendered when it is about to be written.
+    """
+    with zipfile.ZipFile(fileobj, mode="w") as archive:
+        for file_name, document in files:
+            archive.writestr(file_name, docx_bytes(document))
+
+
+def spooled_archive(
+    files: Iterable[Tuple[str, DocxTemplate]], max_size: int = MAX_IN_MEMORY
+) -> tempfile.SpooledTemporaryFile:
+    """
+    Build a zip archive of the documents in `files` in a temporary file that is only written to disk if it
+    grows bigger than `max_size`. The file is returned open, at its beginning.
+    """
+    spool = tempfile.SpooledTemporaryFile(max_size=max_size)
+    try:
+        write_archive(spool, files)
+    except Exception:
+        spool.close()
+        raise
+    spool.seek(0)
+    return spool
+
+
+class _Chunks:
+    """ A write-only file that collects what is written to it, for stream_archive to hand out. """
+
+    def __init__(self):
+        self.chunks: List[bytes] = []
+
+    def write(self, data: bytes) -> int:
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def take(self) -> bytes:
+        data = b"".join(self.chunks)
+        self.chunks = []
+        return data
+
+
+def stream_archive(files: Iterable[Tuple[str, DocxTemplate]]) -> Iterator[bytes]:
+    """
+    Yield the bytes of a zip archive of the documents in `files`, one document at a time.
+
+    Only the document being added is held in memory. Errors rendering a document surface partway
+    through the stream, so use `spooled_archive` if they need to be reported to whoever asked for the archive.
+    """
+    sink = _Chunks()
+    with zipfile.ZipFile(sink, mode="w") as archive:
+        for file_name, document in files:
+            archive.writestr(file_name, docx_bytes(document))
+            yield sink.take()
+    # closing the archive writes its central directory.
+    yield sink.take()
+
+
 class Compressor:
 
     def __init__(self, archive_name: str, files: List[Tuple[str, DocxTemplate]] = None, tempdir = None):
-        # self.__buffer__ = io.BytesIO()
         """ Compressor takes a set of files and stores them in a zip archive
-        
-        To do this, it takes the files, creates an on-disk archive, and appends the files to the 
-        archive on the disk.
+
+        To do this, it creates an on-disk archive, and appends the files to the archive
+        from memory.
 
         """
 
@@ -32,8 +118,8 @@ class Compressor:
             self.tempdir_object = tempfile.TemporaryDirectory()
             tempdir = self.tempdir_object.name
         while True:
-            # Make sure the new directory we're creating to temporarily 
-            # store files does not exist.
+            # Make sure the new directory we're creating to hold the archive
+            # does not exist.
             self.__rootdir__ = os.path.join(tempdir, random_temp_directory())
             if not os.path.exists(self.__rootdir__):
                 os.makedirs(self.__rootdir__)
@@ -45,23 +131,18 @@ class Compressor:
         if files is not None:
             for fname, f in files:
                 self.append(fname, f)
-    
+
 
     def append(self, filename, file) -> None:
         """
         Add 'file' to this zip archive
-        
-        TODO this should be done in membory somehow.
         """
-
-        filepath = os.path.join(self.__rootdir__, filename)
-        file.save(filepath)
-        self.archive.write(filepath, filename)
+        self.archive.writestr(filename, docx_bytes(file))
 
     def delete_dir(self) -> None:
-        """ Delete the directory where all the files were temporarily written
+        """ Delete the directory where the archive was written
         """
-        os.rmtree(self.__rootdir__)
+        shutil.rmtree(self.__rootdir__)
 
     def save(self) -> str:
         """
@@ -69,3 +150,4 @@ class Compressor:
         return the path to it.
         """
         self.archive.close()
+        return self.archive_path
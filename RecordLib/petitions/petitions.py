@@ -6,7 +6,7 @@ from __future__ import annotations
 from RecordLib.crecord import Case
 from RecordLib.crecord import Attorney
 from RecordLib.crecord import Person
-from typing import Optional, List
+from typing import Optional, List, Union
 from docxtpl import DocxTemplate
 import io
 from datetime import date
@@ -36,10 +36,15 @@ class Petition:
         self.include_crim_hist_report = include_crim_hist_report
         self._template = None
 
-    def set_template(self, template_file: io.BytesIO) -> None:
+    def set_template(self, template_file: Union[io.BytesIO, DocxTemplate]) -> None:
         """ Use set_template to pass a binary object to a Petitions that can then be stored as a docx template.
+
+        An already parsed DocxTemplate is used as it is, so it must not be rendered by anything else.
         """
-        self._template = DocxTemplate(template_file)
+        if isinstance(template_file, DocxTemplate):
+            self._template = template_file
+        else:
+            self._template = DocxTemplate(template_file)
 
     def add_case(self, case: Case) -> None:
         self.cases.append(case)
@@ -0,0 +1,183 @@
+"""
+Parse large batches of pdfs in parallel.
+
+A batch is a directory with one subdirectory per person, each holding that person's docket and
+summary pdfs. Extracting and parsing each pdf happens in a pool of worker processes. Results are
+gathered back into one CRecord per person, and each person's CRecord is yielded as soon as all of their
+files are done, so callers can start analyzing (or writing out) records while the rest of the batch is
+still being parsed.
+
+Only a bounded number of files are handed to the pool at any time, so memory use stays flat no matter
+how large the batch is.
+"""
+from typing import Callable, Iterator, List, Optional, Tuple
+from dataclasses import dataclass, field
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+import glob
+import os
+import logging
+from RecordLib.crecord import CRecord, Person, Case
+from RecordLib.sourcerecords.sourcerecord import SourceRecord
+from RecordLib.sourcerecords.parsingutilities import get_text_from_pdf
+from RecordLib.sourcerecords.docket.re_parse_pdf import re_parse_pdf_text
+from RecordLib.sourcerecords.summary.parse_pdf import parse_text as parse_summary_text
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ParsedFile:
+    """
+    The outcome of parsing a single pdf.
+
+    If parsing failed outright, `failed` is True and `errors` says why.
+    """
+
+    path: str
+    record_type: Optional[str] = None
+    person: Optional[Person] = None
+    cases: List[Case] = field(default_factory=list)
+    errors: List[str] = field(default_factory=list)
+    failed: bool = False
+
+
+@dataclass
+class PersonRecord:
+    """
+    Everything parsed from one person's directory.
+    """
+
+    name: str
+    crecord: CRecord
+    files: List[ParsedFile] = field(default_factory=list)
+
+    @property
+    def failures(self) -> List[ParsedFile]:
+        return [f for f in self.files if f.failed]
+
+
+def parse_pdf_file(path: str) -> ParsedFile:
+    """
+    Extract the text of a docket or summary pdf and parse it.
+
+    Meant to run in a worker process, so it never raises. Any exception is recorded in the
+    returned ParsedFile.
+    """
+    try:
+        text = get_text_from_pdf(path)
+        if text == "":
+            return ParsedFile(
+                path, errors=["could not extract text from pdf"], failed=True
+            )
+        first_five_lines = "\n".join(text.split("\n")[0:5])
+        if "summary" in first_five_lines.lower():
+            record_type = SourceRecord.RECORD_TYPES.SUMMARY
+            person, cases, errors = parse_summary_text(text)
+        else:
+            record_type = SourceRecord.RECORD_TYPES.DOCKET
+            parsed = re_parse_pdf_text(text)
+            if parsed is None:
+                return ParsedFile(
+                    path,
+                    errors=["could not tell which court the docket is from"],
+                    failed=True,
+                )
+            person, cases, errors = parsed
+        return ParsedFile(path, record_type, person, cases or [], errors or [])
+    except Exception as err:
+        return ParsedFile(path, errors=[f"{type(err).__name__}: {err}"], failed=True)
+
+
+def build_crecord(files: List[ParsedFile]) -> CRecord:
+    """
+    Combine the parsed files for one person into a CRecord.
+
+    Summaries are added before dockets, so that the summary's person and cases take precedence.
+    """
+    rec = CRecord()
+    summaries_first = sorted(
+        (f for f in files if not f.failed),
+        key=lambda f: (f.record_type != SourceRecord.RECORD_TYPES.SUMMARY, f.path),
+    )
+    for parsed in summaries_first:
+        rec.add_sourcerecord(parsed)
+    return rec
+
+
+def find_people(directory: str, pattern: str = "*.pdf") -> Iterator[Tuple[str, List[str]]]:
+    """
+    Yield (name of a person's subdirectory, paths of the pdfs in it) for each subdirectory of `directory`.
+    """
+    for entry in sorted(os.scandir(directory), key=lambda e: e.name):
+        if entry.is_dir():
+            yield entry.name, sorted(glob.glob(os.path.join(entry.path, pattern)))
+
+
+def parse_batch(
+    people: Iterator[Tuple[str, List[str]]],
+    workers: Optional[int] = None,
+    max_in_flight: Optional[int] = None,
+    parse_file: Callable[[str], ParsedFile] = parse_pdf_file,
+) -> Iterator[PersonRecord]:
+    """
+    Parse everyone's pdfs in a pool of processes.
+
+    Args:
+        people: (name, list of pdf paths) pairs, one per person.
+        workers: Number of worker processes. Defaults to the number of cpus.
+        max_in_flight: The most files that may be queued or parsing at once. Defaults to four per worker.
+        parse_file: The function that parses one file. It must be picklable, i.e. defined at the top level of
+            a module, and should capture its own failures in the ParsedFile it returns.
+
+    Returns:
+        An iterator of PersonRecords, in the order that people finish.
+    """
+    workers = workers or os.cpu_count() or 1
+    max_in_flight = max_in_flight or workers * 4
+    # future -> (person, path)
+    pending = dict()
+    # person -> number of their files not done yet
+    outstanding = dict()
+    # person -> parsed files
+    parsed = dict()
+
+    def collect() -> Iterator[PersonRecord]:
+        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            person, path = pending.pop(future)
+            try:
+                result = future.result()
+            except Exception as err:
+                result = ParsedFile(
+                    path, errors=[f"{type(err).__name__}: {err}"], failed=True
+                )
+            if result.failed:
+                logger.error(f"Could not parse {path}: {result.errors}")
+            parsed[person].append(result)
+            outstanding[person] -= 1
+            if outstanding[person] == 0:
+                del outstanding[person]
+                files = parsed.pop(person)
+                yield PersonRecord(person, build_crecord(files), files)
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for person, paths in people:
+            if len(paths) == 0:
+                yield PersonRecord(person, CRecord())
+                continue
+            outstanding[person] = len(paths)
+            parsed[person] = []
+            for path in paths:
+                while len(pending) >= max_in_flight:
+                    yield from collect()
+                pending[pool.submit(parse_file, path)] = (person, path)
+        while len(pending) > 0:
+            yield from collect()
+
+
+def parse_directory(directory: str, pattern: str = "*.pdf", **kwargs) -> Iterator[PersonRecord]:
+    """
+    Parse a directory of per-person subdirectories of pdfs. See `parse_batch` for the keyword arguments.
+    """
+    return parse_batch(find_people(directory, pattern), **kwargs)
@@ -1,4 +1,6 @@
 from parsimonious import NodeVisitor  # type: ignore
+from lxml import etree
+
 
 def stringify(node_visitor, content):
     return "".join(content)
@@ -8,23 +10,107 @@ def generic_visit(node_visitor, node, vc):
     return node_visitor.stringify(vc)
 
 
+def flatten(fragments):
+    """
+    Yield the text and elements in a (possibly nested) list of fragments.
+    """
+    for fragment in fragments:
+        if isinstance(fragment, list):
+            yield from flatten(fragment)
+        else:
+            yield fragment
+
+
+def generic_visit_fragments(node_visitor, node, vc):
+    return list(flatten(vc))
+
+
+def build_element(tag, fragments):
+    """
+    Build an lxml element from a list of text and element fragments.
+
+    The element is padded with a space at either end of its contents, so it is the same
+    tree that parsing the xml string "<tag> [some contents] </tag>" would produce.
+    """
+    element = etree.Element(tag)
+    last_child = None
+    text = [" "]
+    for fragment in flatten(fragments):
+        if isinstance(fragment, str):
+            text.append(fragment)
+            continue
+        _set_text(element, last_child, text)
+        element.append(fragment)
+        last_child = fragment
+        text = []
+    text.append(" ")
+    _set_text(element, last_child, text)
+    return element
+
+
+def _set_text(element, last_child, text):
+    """
+    Put text after `last_child`, or at the start of `element` if there isn't a last child yet.
+    """
+    joined = "".join(text)
+    if joined == "":
+        return
+    if last_child is None:
+        element.text = joined
+    else:
+        last_child.tail = joined
+
+
 class CustomVisitorFactory:
     """
     This class creates an object that is an instance of a custom
     subclass of parsimonious' NodeVisitor class.
+
+    Subclasses are memoized, so factories with the same terminals, non-terminals,
+    and overriding methods share one generated NodeVisitor subclass.
+
+    By default a visitor returns a string of xml. With `output="element"`, it builds
+    the equivalent lxml elements directly, so there's no xml string to re-parse.
+    Overriding methods have to return the same kind of output; in element mode that is
+    text, an lxml element, or a list of those.
     """
 
-    def __init__(self, terminals, non_terminals, non_default_methods):
+    OUTPUTS = ("xml_string", "element")
+
+    # signature -> generated NodeVisitor subclass
+    _subclasses = dict()
+
+    def __init__(
+        self, terminals, non_terminals, non_default_methods, output="xml_string"
+    ):
         """
         Input: a) list of terminal symbols,
-               b) list of non-terminal symbols, and
+               b) list of non-terminal symbols,
                c) list of tuples (method_name, method) to override the default methods
-                  this class creaes.
+                  this class creaes, and
+               d) optionally, the kind of output the visitor creates, "xml_string" or "element".
         Inside: Sets these as attributes of the instance of the class.
         """
+        if output not in self.OUTPUTS:
+            raise ValueError(f"Unknown visitor output {output}")
         self.terminals = terminals
         self.non_terminals = non_terminals
         self.non_default_methods = non_default_methods
+        self.output = output
+
+    def signature(self):
+        """
+        A hashable key identifying the visitor class this factory creates.
+        """
+        overrides = self.non_default_methods
+        if isinstance(overrides, dict):
+            overrides = overrides.items()
+        return (
+            tuple(self.terminals),
+            tuple(self.non_terminals),
+            tuple(overrides),
+            self.output,
+        )
 
     def create_subclass(self, subclass_name="CustomVisitor"):
         """
@@ -35,9 +121,21 @@ class CustomVisitorFactory:
             A subclass of NodeVisitor with certain default terminal and
                 non-terminal methods.
         """
+        signature = self.signature()
+        if signature not in self._subclasses:
+            self._subclasses[signature] = self._build_subclass(subclass_name)
+        return self._subclasses[signature]
+
+    def _build_subclass(self, subclass_name):
+        """
+        Actually build the NodeVisitor subclass that `create_subclass` memoizes.
+        """
         custom_methods = dict()
         custom_methods["stringify"] = stringify
-        custom_methods["generic_visit"] = generic_visit
+        if self.output == "element":
+            custom_methods["generic_visit"] = generic_visit_fragments
+        else:
+            custom_methods["generic_visit"] = generic_visit
 
         method_name = "visit_{}"
         for terminal in self.terminals:
@@ -79,6 +177,8 @@ class CustomVisitorFactory:
         The default method for visiting terminal sysmbols will simply return
         the content, as a string, of the symbol.
         """
+        if self.output == "element":
+            return lambda self, node, children: node.text
         return lambda self, node, children: self.stringify(node.text)
 
     def generate_default_non_terminal_method(self, non_terminal_name):
@@ -87,7 +187,15 @@ class CustomVisitorFactory:
         The default method for visiting nonterminal symbols will return the
         output of the node's children wrapped in xml tags with the name of the
         nonterminal symbol, as in <parent> [some contents] </parent>
+
+        In element mode, it returns the lxml element for <parent> instead.
         """
+        if self.output == "element":
+
+            def non_terminal_element_method(self, node, children):
+                return build_element(non_terminal_name, children)
+
+            return non_terminal_element_method
 
         def non_terminal_method(self, node, children):
             contents = self.stringify(children)
@@ -21,6 +21,31 @@ from datetime import datetime, date
 logger = logging.getLogger(__name__)
 
 
+# Grammars and visitors are built once, when the module is imported, and reused for every docket.
+docket_sections_grammar = Grammar(docket_sections)
+docket_sections_visitor = CustomVisitorFactory(
+    common_terminals, docket_sections_nonterminals, docket_sections_custom_nodevisitors
+).create_instance()
+
+# (name-of-section, grammar, visitor) for each section with its own grammar.
+section_parsers = [
+    (
+        section_name,
+        Grammar(grammar),
+        CustomVisitorFactory(
+            terminals, nonterminals, custom_visitors
+        ).create_instance(),
+    )
+    for (
+        section_name,
+        grammar,
+        terminals,
+        nonterminals,
+        custom_visitors,
+    ) in section_grammars
+]
+
+
 def text_to_pages(txt: str) -> Tuple[str, List[str]]:
     """ Convert raw text of a docket to an xml-string, where the nodes are the pages and sections of the docket.
     
@@ -40,15 +65,9 @@ def text_to_pages(txt: str) -> Tuple[str, List[str]]:
         </docket>
     """
     errors = []
-    grammar = Grammar(docket_sections)
     try:
-        nodes = grammar.parse(txt)
-        visitor = CustomVisitorFactory(
-            common_terminals,
-            docket_sections_nonterminals,
-            docket_sections_custom_nodevisitors,
-        ).create_instance()
-        return visitor.visit(nodes), errors
+        nodes = docket_sections_grammar.parse(txt)
+        return docket_sections_visitor.visit(nodes), errors
     except Exception as e:
         slines = txt.split("\n")
         logger.error("text_to_pages failed.")
@@ -479,20 +498,13 @@ def parse_cp_pdf_text(
     # parse individual sections with grammars for those sections
     # TODO add try catch blocks that allow for continuing even after certain parts fail, like
     #       if a single section fails to parse.
-    for (
-        section_name,
-        grammar,
-        terminals,
-        nonterminals,
-        custom_visitors,
-    ) in section_grammars:
+    for section_name, grammar, visitor in section_parsers:
         try:
             section = sections_tree.xpath(f"//section[@name='{section_name}']")[0]
             # remove blank lines at the ends of the section.
             section_text = "\n".join(
                 [ln for ln in section.text.split("\n") if ln.strip()]
             )
-            grammar = Grammar(grammar)
             try:
                 nodes = grammar.parse(section_text)
             except Exception as e:
@@ -500,9 +512,6 @@ def parse_cp_pdf_text(
                 errors.append(f"    Text for {section_name} failed to parse.")
                 logger.error(f"    Text for {section_name} failed to parse.")
                 continue
-            visitor = CustomVisitorFactory(
-                terminals, nonterminals, custom_visitors
-            ).create_instance()
             parsed_section_text = visitor.visit(nodes)
             parsed_section_xml = etree.fromstring(parsed_section_text)
             # replace original unparsed section's text w/ the parsed xml.
@@ -4,7 +4,7 @@ Regex parsing functions for Common Pleas pdf dockets.
 
 import logging
 import re
-from typing import Union, BinaryIO, Tuple, List, Optional, Dict
+from typing import Union, BinaryIO, Tuple, List, Optional, Dict, Callable, Pattern
 from RecordLib.crecord import Charge, Person, Case, Address
 from RecordLib.sourcerecords.parsingutilities import (
     get_text_from_pdf,
@@ -15,6 +15,7 @@ from RecordLib.sourcerecords.parsingutilities import (
     find_pattern,
     find_index_for_pattern,
 )
+from RecordLib.sourcerecords.documentindex import DocumentIndex
 
 logger = logging.getLogger(__name__)
 
@@ -35,18 +36,265 @@ section_headers = [
     "PETITIONER INFORMATION",
 ]
 
+# Text before the first section header, i.e., the caption on the first page.
+PREAMBLE = "PREAMBLE"
 
-def parse_person(txt: str) -> Tuple[Person, List[str]]:
+
+class PATTERNS:
+    section_header = re.compile(
+        r"^\s*(" + "|".join(re.escape(h) for h in section_headers) + r")\s*$"
+    )
+    defendant_name = re.compile(
+        r"^Defendant\s+(?P<last_name>.*), (?P<first_name>.*)", re.M
+    )
+    date_of_birth = re.compile(
+        r"Date Of Birth:?\s+(?P<date_of_birth>\d{1,2}\/\d{1,2}\/\d{4})"
+    )
+    aliases = re.compile(r"Alias Name\s*\n+(?P<aliases>(.+\s*\n*)*)")
+    address = re.compile(r"City/State/Zip:\s*(?P<addr>.*)\s*")
+    # The headers of the Charges and Disposition sections. Nothing but whitespace may follow a header.
+    charges_header = re.compile(r"CHARGES\s*$")
+    disposition_header = re.compile(r"DISPOSITION SENTENCING/PENALTIES\s*$")
+    # A line of capital letters ends the Charges section. It's usually the next section's header.
+    charges_section_end = re.compile(r"[A-Z\/ ]+")
+    disposition_charge = re.compile(
+        r"(?P<sequence>\d)\s+\/\s+(?P<offense>.+)\s{12,}(?P<disposition>\w.+?)(?=\s\s)\s{12,}(?P<grade>\w{0,2})\s+(?P<statute>\w{1,2}\s?\u00A7\s?\d+(\-|\u00A7|\w+)*)"
+    )
+    disposition_charge_overflow = re.compile(
+        r"^\s+(?P<offense_overflow>\w+\s*\w*)\s*$", re.I
+    )
+    disposition_date = re.compile(
+        r"(?m)^\s*(\S+\s)+\s+(?P<disposition_date>\d\d/\d\d/\d\d\d\d).*$"
+    )
+    docket_number = re.compile(
+        r"Docket Number:\s+(?P<docket_number>(MC|CP)\-\d{2}\-(\D{2})\-\d*\-\d{4})"
+    )
+    otn = re.compile(r"OTN:\s+(?P<otn>\D(\s)?\d+(\-\d)?)")
+    costs = re.compile(
+        r"Totals:\s+\$(?P<charged>[\d\,]+\.\d{2})\s+"
+        + r"-?\(?\$(?P<paid>[\d\,]+\.\d{2})\)?\s+-?\(?\$"
+        + r"(?P<adjusted>[\d\,]+\.\d{2})\)?\s+-?\(?\$([\d\,]+"
+        + r"\.\d{2})\)?\s+-?\(?\$(?P<total>[\d\,]+\.\d{2})\)?"
+    )
+    status = re.compile(r"case status:\s+(?P<status>(?:\w+\s)+)", re.I)
+    county = re.compile(r"\sof\s(?P<county>\w+)\sCOUNTY", re.I)
+    complaint_date = re.compile(
+        r"Complaint Date:\s+(?P<complaint_date>\d{1,2}\/\d{1,2}\/\d{4})"
+    )
+    arrest_date = re.compile(
+        r"Arrest Date:\s+(?P<arrest_date>\d{1,2}\/\d{1,2}\/\d{4})"
+    )
+    case_disposition_date = re.compile(
+        r"(?:Plea|Status|Status of Restitution|Status - Community Court|"
+        + r"Status Listing|Migrated Dispositional Event|Trial|Preliminary Hearing|"
+        + r"Pre-Trial Conference)\s+(?P<disposition_date>\d{1,2}\/\d{1,2}\/\d{4})\s+"
+        + r"Final Disposition"
+    )
+    judge_assigned = re.compile(
+        r"Judge Assigned:\s+(?P<judge_assigned>.*)\s+(Date Filed|Issue Date):"
+    )
+    judge_assigned_overflow = re.compile(
+        r"Judge Assigned:\s+(?P<judge_assigned>.*)\s+(Date Filed|Issue Date):"
+        + "\n"
+        + r"^\s+(?P<judge_overflow>\w+\s*\w*)\s*$"
+    )
+    migrated = re.compile("migrated", re.I)
+    final_issuing_authority = re.compile(
+        r"Final Issuing Authority:\s+(?P<judge_name>.*)"
+    )
+    dc = re.compile(r"District Control Number\s+(?P<dc>\d+)")
+    arresting_agency = re.compile(
+        r"Arresting Agency:\s+(?P<agency>.*)\s+Arresting Officer: (?P<officer>\D+)"
+    )
+    affiant = re.compile("Affiant")
+
+
+def _section_starts(lines: List[str], header: int) -> List[int]:
+    """
+    The lines a section's body may start on, in order of preference.
+
+    The body starts on the first line after the header with any text. Failing that, it may start on
+    one of the whitespace-only lines before it.
+    """
+    first = header + 1
+    while first < len(lines) - 1 and lines[first].strip() == "":
+        first += 1
+    return [start for start in range(first, header, -1) if lines[start] != ""]
+
+
+def _charges_section_from(lines: List[str], start: int) -> Optional[int]:
+    """
+    The last line of a Charges section whose body starts at line `start`, or None if it has no end.
+
+    The section runs through consecutive non-blank lines, and ends with the last line of capital
+    letters among them.
+    """
+    last_line = len(lines) - 2
+    if start > last_line:
+        return None
+    end = start
+    while end < last_line and lines[end + 1] != "":
+        end += 1
+    for line_number in range(end, start, -1):
+        if PATTERNS.charges_section_end.fullmatch(lines[line_number]):
+            return line_number
+    return None
+
+
+_DISPOSITION_CONTINUES = frozenset("ABCDEFGHIJKLMNOPQRSTUVWXYZ ")
+
+
+def _disposition_section_from(lines: List[str], start: int) -> Optional[int]:
+    """
+    The last line of a Disposition section whose body starts at line `start`, or None if the section is
+    only one line long.
+
+    The section continues, past blank lines, as long as the next line with anything on it starts with a
+    capital letter or a space.
+    """
+    end = start
+    while True:
+        following = end + 1
+        while following < len(lines) and lines[following] == "":
+            following += 1
+        if following < len(lines) and lines[following][0] in _DISPOSITION_CONTINUES:
+            end = following
+        else:
+            break
+    if end == start:
+        return None
+    return end
+
+
+def _header_column(
+    lines: List[str], line_number: int, header: Pattern
+) -> Optional[int]:
+    """
+    The column where a section header starts on a line, or None if there is no header on the line.
+    """
+    if line_number >= len(lines) - 1:
+        # The body of a section starts on the line after its header, so there has to be one.
+        return None
+    search = header.search(lines[line_number])
+    if search is None:
+        return None
+    return search.start()
+
+
+def _header_candidates(
+    lines: List[str], line_number: int, header: Pattern, include_own: bool = True
+) -> List[int]:
+    """
+    The lines with section headers that can be reached from a line, in the order to try them.
+
+    A header has to follow whitespace. The header on the next line with any text is tried first, if only
+    whitespace comes before it on its line. Then the header on the line itself, if there is one.
+    """
+    candidates = []
+    following = line_number + 1
+    while following < len(lines) and lines[following].strip() == "":
+        following += 1
+    column = _header_column(lines, following, header)
+    if column is not None and lines[following][:column].strip() == "":
+        candidates.append(following)
+    column = _header_column(lines, line_number, header)
+    if (
+        include_own
+        and column is not None
+        and column > 0
+        and lines[line_number][column - 1].isspace()
+    ):
+        candidates.append(line_number)
+    return candidates
+
+
+def find_sections(
+    lines: List[str],
+    header: Pattern,
+    section_from: Callable[[List[str], int], Optional[int]],
+) -> List[str]:
+    """
+    Find the bodies of every section with the header `header`, by walking over the lines of a docket once.
+
+    This finds the same sections as searching the whole text with a pattern like
+    `(?:.*\\s+)HEADER\\s*\\n(?P<section>...)`, without the risk of that pattern's backtracking.
+
+    Args:
+        lines: The lines of a docket.
+        header: Matches a header at the end of a line.
+        section_from: Given the lines and the line a section's body starts on, return the section's last line,
+            or None if there isn't a section there.
+
+    Returns:
+        The text of each section's body.
+    """
+    sections = []
+    line_number = 0
+    # After a section is found, only headers on later lines can start the next one.
+    include_own = True
+    while line_number < len(lines):
+        found = None
+        for header_line in _header_candidates(
+            lines, line_number, header, include_own
+        ):
+            for start in _section_starts(lines, header_line):
+                end = section_from(lines, start)
+                if end is not None:
+                    found = (start, end)
+                    break
+            if found is not None:
+                break
+        if found is None:
+            line_number += 1
+            include_own = True
+            continue
+        start, end = found
+        sections.append("\n".join(lines[start : end + 1]))
+        line_number = end
+        include_own = False
+    return sections
+
+
+def find_defendant_info(txt: str) -> Optional[str]:
+    """
+    Find the text between the DEFENDANT INFORMATION header and the last CASE PARTICIPANTS header after it.
+    """
+    start = txt.find("DEFENDANT INFORMATION")
+    if start == -1:
+        return None
+    start += len("DEFENDANT INFORMATION")
+    end = txt.rfind("CASE PARTICIPANTS", start + 1)
+    # The CASE PARTICIPANTS header has to follow some whitespace.
+    while end != -1 and not txt[end - 1].isspace():
+        end = txt.rfind(
+            "CASE PARTICIPANTS", start + 1, end + len("CASE PARTICIPANTS") - 1
+        )
+    if end == -1:
+        return None
+    return txt[start : end - 1]
+
+
+def index_docket(txt: str) -> DocumentIndex:
+    """ Index the lines and sections of the text of a CP docket. """
+    return DocumentIndex(txt, section_header=PATTERNS.section_header, preamble=PREAMBLE)
+
+
+def parse_person(
+    txt: str, index: Optional[DocumentIndex] = None
+) -> Tuple[Person, List[str]]:
     """
     Extract a Person from the text of a CP docket.
+
+    Args:
+        txt: The text of a CP docket.
+        index: The docket's index, if it has already been built.
     """
+    if index is None:
+        index = index_docket(txt)
     person = Person(first_name=None, last_name=None, date_of_birth=None)
     errs = []
-    defendant_name, d_errs = find_pattern(
-        "defendant_name",
-        r"^Defendant\s+(?P<last_name>.*), (?P<first_name>.*)",
-        txt,
-        re.M,
+    defendant_name, d_errs = index.find(
+        "defendant_name", PATTERNS.defendant_name, [PREAMBLE, "CASE PARTICIPANTS"]
     )
     if defendant_name is not None:
         person.first_name = defendant_name.group("first_name")
@@ -54,26 +302,18 @@ def parse_person(txt: str) -> Tuple[Person, List[str]]:
     else:
         errs.extend(d_errs)
 
-    defendant_dob, dob_errs = find_pattern(
-        "date_of_birth",
-        r"Date Of Birth:?\s+(?P<date_of_birth>\d{1,2}\/\d{1,2}\/\d{4})",
-        txt,
+    defendant_dob, dob_errs = index.find(
+        "date_of_birth", PATTERNS.date_of_birth, [PREAMBLE, "DEFENDANT INFORMATION"]
     )
     if defendant_dob is not None:
         person.date_of_birth = date_or_none(defendant_dob.group("date_of_birth"))
     else:
         errs.extend(dob_errs)
 
-    defendant_info_section, d_section_errs = find_pattern(
-        "defendant_info",
-        r"DEFENDANT INFORMATION(?P<defendant_info>.*)\s+CASE PARTICIPANTS",
-        txt,
-        re.DOTALL,
-    )
-    if defendant_info_section is not None:
-        defendant_info_text = defendant_info_section.group("defendant_info")
+    defendant_info_text = find_defendant_info(txt)
+    if defendant_info_text is not None:
         alias_search, a_errs = find_pattern(
-            "aliases", r"Alias Name\s*\n+(?P<aliases>(.+\s*\n*)*)", defendant_info_text
+            "aliases", PATTERNS.aliases, defendant_info_text
         )
         if alias_search is not None:
             person.aliases = [
@@ -85,22 +325,24 @@ def parse_person(txt: str) -> Tuple[Person, List[str]]:
             errs.extend(a_errs)
 
         addr_search, addr_errs = find_pattern(
-            "address", r"City/State/Zip:\s*(?P<addr>.*)\s*", defendant_info_text
+            "address", PATTERNS.address, defendant_info_text
         )
         if addr_search is not None:
             person.address = Address(addr_search.group("addr"), "")
         else:
             errs.extend(addr_errs)
     else:
-        errs.extend(d_section_errs)
+        errs.append("Could not find defendant_info")
 
     return person, errs
 
 
-def parse_charges(txt: str) -> Tuple[Optional[List[Charge]], List[str]]:
+def parse_charges(
+    txt: str, index: Optional[DocumentIndex] = None
+) -> Tuple[Optional[List[Charge]], List[str]]:
     """
     Find the charges in the text of a docket.
-    
+
 
     Returns:
         Tuple[0] is either None or a list of Charges.
@@ -108,10 +350,12 @@ def parse_charges(txt: str) -> Tuple[Optional[List[Charge]], List[str]]:
     """
     logger.info("      parsing charges")
     # First, parse the Charges section to get a list of the charges, type [Charge]
-    charges, errs = parse_charges_section(txt)
+    if index is None:
+        index = index_docket(txt)
+    charges, errs = parse_charges_section(txt, index)
 
     # Second, parse the Dispositions section to find any dispositions.
-    charges_w_dispositions, more_errs = parse_disposition_section(txt)
+    charges_w_dispositions, more_errs = parse_disposition_section(txt, index)
     errs.extend(more_errs)
     # now update the Charges from the [Charge] list with dispositions from the list of dispositions.
     charges = update_charges_with_dispositions(charges, charges_w_dispositions)
@@ -195,31 +439,37 @@ def update_charge_dict(
     return updated
 
 
-def parse_charges_section(txt: str) -> Tuple[dict, List[str]]:
+def parse_charges_section(
+    txt: str, index: Optional[DocumentIndex] = None
+) -> Tuple[dict, List[str]]:
     """
     Collect a list of the charges described in the Charges section of a docket. 
 
     Args:
         txt (str): Text that may contain a Charges section listing out
         criminal charges in a tabular format.
+        index (DocumentIndex): The index of `txt`, if it has already been built.
 
     Returns:
         A tuple. Item 0 is a dict with the columns of charges filled in, indexed by the
             sequence number of the charge. 
             Item 1 is a list of error messages. 
     """
-    charges_section_searcher = re.compile(
-        r"(?:.*\s+)CHARGES\s*\n((?P<charges_section>(?:.+\n)+?(?=[A-Z\/ ]+\n))+.*)"
-    )  # TODO - grr - this still has the first line of the next section, like ATTORNEY INFORMATION ...
     errs = []
-    charges_sections = charges_section_searcher.findall(txt)
+    if index is None:
+        index = index_docket(txt)
+    charges_sections = find_sections(
+        index.lines,
+        PATTERNS.charges_header,
+        _charges_section_from,
+    )
     if len(charges_sections) == 0:
         errs.append("Could not find a CHARGES section.")
         return {}, errs
     charges = dict()  # storing charges as a dict, where keys are sequence numbers.
     for charges_section in charges_sections:
         # in case, because of page overflows, there are multiple charges sections
-        lines = charges_section[0].split("\n")
+        lines = charges_section.split("\n")
         header_line = lines[0]
         col_dict = dict()
         col_dict["sequence"] = {
@@ -252,7 +502,7 @@ def parse_charges_section(txt: str) -> Tuple[dict, List[str]]:
 
 
 def parse_disposition_section(
-    txt: str,
+    txt: str, index: Optional[DocumentIndex] = None
 ) -> Tuple[Optional[Dict[str, Charge]], List[str]]:
     """
     Parse the disposition section of a docket.
@@ -261,34 +511,30 @@ def parse_disposition_section(
     the values are the last events to happen to the charge with each sequence number
     (i.e., the final disposition, if any).
     """
-    disposition_section_searcher = re.compile(
-        r"(?:.*\s+)DISPOSITION SENTENCING/PENALTIES\s*\n(?P<disposition_section>(.+\n+(?=[A-Z ]+))+.*)"
-    )
     errs = []
-    disposition_sections = disposition_section_searcher.findall(txt)
-    if disposition_section_searcher == []:
-        errs.append("Could not find the disposition/sentencing section.")
-        return {}, errs
+    if index is None:
+        index = index_docket(txt)
+    disposition_sections = find_sections(
+        index.lines,
+        PATTERNS.disposition_header,
+        _disposition_section_from,
+    )
     charges = []
-    charges_pattern = r"(?P<sequence>\d)\s+\/\s+(?P<offense>.+)\s{12,}(?P<disposition>\w.+?)(?=\s\s)\s{12,}(?P<grade>\w{0,2})\s+(?P<statute>\w{1,2}\s?\u00A7\s?\d+(\-|\u00A7|\w+)*)"
     # there may be multiple disposition sections
     for disposition_section in disposition_sections:
-        section_text = disposition_section[0]
-        section_lines = section_text.split("\n")
+        section_lines = disposition_section.split("\n")
         for idx, ln in enumerate(section_lines):
             # Need to use a copy of the index, to advance if we find a charge overflow line, so that
             # when we reach forward for the disposition date, we compensate if we've also found a charge overflow line.
             idx_copy = idx
             # not using the find_pattern function here because we're doing repeated searches on every line,
             # and failing to match is not an error, in that case.
-            charge_line_search = re.search(charges_pattern, ln)
+            charge_line_search = PATTERNS.disposition_charge.search(ln)
             if charge_line_search is not None:
                 logger.debug(f"found a charge in line: {ln}")
                 offense = charge_line_search.group("offense").strip()
-                charge_overflow_search = re.search(
-                    r"^\s+(?P<offense_overflow>\w+\s*\w*)\s*$",
-                    section_lines[idx + 1],
-                    re.I,
+                charge_overflow_search = PATTERNS.disposition_charge_overflow.search(
+                    section_lines[idx + 1]
                 )
                 if charge_overflow_search is not None:
                     offense += (
@@ -308,23 +554,21 @@ def parse_disposition_section(
                     sentences=[],  # TODO: re_parse_cp_pdf parser does not collect Sentences yet.
                 )
 
-                disp_date_search_pattern = (
-                    r"(?m)^\s*(\S+\s)+\s+(?P<disposition_date>\d\d/\d\d/\d\d\d\d).*$"
-                )
-                # disp_date_search_pattern = r"(.*)\s(?P<disposition_date>\d{1,2}\/\d{1,2}\/\d{4})"
                 # sometimes a single charge may have multiple successive disposition dates. We need the last one.
                 next_line_index = idx_copy + 1
-                disp_date_search = re.search(
-                    disp_date_search_pattern, section_lines[next_line_index],
+                disp_date_search = PATTERNS.disposition_date.search(
+                    section_lines[next_line_index]
                 )
                 next_line_index += 1
-                while re.search(
-                    disp_date_search_pattern, section_lines[next_line_index],
-                ):
-                    disp_date_search = re.search(
-                        disp_date_search_pattern, section_lines[next_line_index],
-                    )
+                next_disp_date_search = PATTERNS.disposition_date.search(
+                    section_lines[next_line_index]
+                )
+                while next_disp_date_search:
+                    disp_date_search = next_disp_date_search
                     next_line_index += 1
+                    next_disp_date_search = PATTERNS.disposition_date.search(
+                        section_lines[next_line_index]
+                    )
 
                 #
                 # disposition_date_line = section_lines[idx_copy + 1]
@@ -351,52 +595,49 @@ def parse_disposition_section(
     return charges, errs
 
 
-def parse_case(txt: str) -> Tuple[Case, List[str]]:
+def parse_case(
+    txt: str, index: Optional[DocumentIndex] = None
+) -> Tuple[Case, List[str]]:
     """
     Use regexes to extract case information from the text of a docket.
 
     Args:
         txt (str): The text of a CP or MC docket. 
+        index (DocumentIndex): The docket's index, if it has already been built.
 
     """
-
+    if index is None:
+        index = index_docket(txt)
     errs = []
     case = Case(
         status=None, county=None, docket_number=None, otn=None, dc=None, charges=[]
     )
 
-    docket_number_search, dn_errs = find_pattern(
-        "docket_number",
-        r"Docket Number:\s+(?P<docket_number>(MC|CP)\-\d{2}\-(\D{2})\-\d*\-\d{4})",
-        txt,
+    docket_number_search, dn_errs = index.find(
+        "docket_number", PATTERNS.docket_number, [PREAMBLE]
     )
     if docket_number_search is not None:
         case.docket_number = docket_number_search.group("docket_number")
     else:
         errs.extend(dn_errs)
 
-    otn_search, otn_errs = find_pattern(
-        "otn", r"OTN:\s+(?P<otn>\D(\s)?\d+(\-\d)?)", txt
+    otn_search, otn_errs = index.find(
+        "otn", PATTERNS.otn, [PREAMBLE, "CASE INFORMATION"]
     )
     if otn_search is not None:
         case.otn = otn_search.group("otn")
     else:
         errs.extend(otn_errs)
 
-    charges, charge_errs = parse_charges(txt)
+    charges, charge_errs = parse_charges(txt, index)
     case.charges = charges
     errs.extend(charge_errs)
 
     # TODO Bail search.
-    costs_search, costs_errs = find_pattern(
+    costs_search, costs_errs = index.find(
         "costs",
-        (
-            r"Totals:\s+\$(?P<charged>[\d\,]+\.\d{2})\s+"
-            + r"-?\(?\$(?P<paid>[\d\,]+\.\d{2})\)?\s+-?\(?\$"
-            + r"(?P<adjusted>[\d\,]+\.\d{2})\)?\s+-?\(?\$([\d\,]+"
-            + r"\.\d{2})\)?\s+-?\(?\$(?P<total>[\d\,]+\.\d{2})\)?"
-        ),
-        txt,
+        PATTERNS.costs,
+        ["PAYMENT PLAN SUMMARY", "CASE FINANCIAL INFORMATION"],
     )
     if costs_search is not None:
         case.total_fines = money_or_none(costs_search.group("charged"))
@@ -406,26 +647,24 @@ def parse_case(txt: str) -> Tuple[Case, List[str]]:
     else:
         errs.extend(costs_errs)
 
-    status_search, status_search_errs = find_pattern(
-        "status", r"case status:\s+(?P<status>(?:\w+\s)+)", txt, re.I
+    status_search, status_search_errs = index.find(
+        "status", PATTERNS.status, [PREAMBLE, "CASE INFORMATION", "STATUS INFORMATION"]
     )
     if status_search is not None:
         case.status = status_search.group("status")
     else:
         errs.extend(status_search_errs)
 
-    cty_search, cty_errs = find_pattern(
-        "county", r"\sof\s(?P<county>\w+)\sCOUNTY", txt, re.I
-    )
+    cty_search, cty_errs = index.find("county", PATTERNS.county, [PREAMBLE])
     if cty_search is not None:
         case.county = cty_search.group("county")
     else:
         errs.extend(cty_errs)
 
-    complaint_date_search, cd_errs = find_pattern(
+    complaint_date_search, cd_errs = index.find(
         "complaint_date",
-        r"Complaint Date:\s+(?P<complaint_date>\d{1,2}\/\d{1,2}\/\d{4})",
-        txt,
+        PATTERNS.complaint_date,
+        ["CASE INFORMATION", "STATUS INFORMATION"],
     )
     if complaint_date_search is not None:
         complaint_date = date_or_none(complaint_date_search.group("complaint_date"))
@@ -438,8 +677,8 @@ def parse_case(txt: str) -> Tuple[Case, List[str]]:
     else:
         errs.extend(cd_errs)
 
-    arrest_date_search, arrest_date_errs = find_pattern(
-        "arrest_date", r"Arrest Date:\s+(?P<arrest_date>\d{1,2}\/\d{1,2}\/\d{4})", txt
+    arrest_date_search, arrest_date_errs = index.find(
+        "arrest_date", PATTERNS.arrest_date, ["CASE INFORMATION", "STATUS INFORMATION"]
     )
     if arrest_date_search is not None:
         arrest_date = date_or_none(arrest_date_search.group("arrest_date"))
@@ -452,13 +691,10 @@ def parse_case(txt: str) -> Tuple[Case, List[str]]:
     else:
         errs.extend(arrest_date_errs)
 
-    disp_date_search, _ = find_pattern(
+    disp_date_search, _ = index.find(
         "disposition_date",
-        r"(?:Plea|Status|Status of Restitution|Status - Community Court|"
-        + r"Status Listing|Migrated Dispositional Event|Trial|Preliminary Hearing|"
-        + r"Pre-Trial Conference)\s+(?P<disposition_date>\d{1,2}\/\d{1,2}\/\d{4})\s+"
-        + r"Final Disposition",
-        txt,
+        PATTERNS.case_disposition_date,
+        ["DISPOSITION SENTENCING/PENALTIES"],
     )
     if disp_date_search is not None:
         disp_date = date_or_none(disp_date_search.group("disposition_date"))
@@ -480,11 +716,8 @@ def parse_case(txt: str) -> Tuple[Case, List[str]]:
     #   judge's name appears in the Judge Assigned field.  If it does, then set it.
     #   Later on, we'll check in the "Final Issuing Authority" field.  If it appears there
     #   and doesn't show up as "migrated," we'll reassign the judge name.
-    judge_assignment_pattern = (
-        r"Judge Assigned:\s+(?P<judge_assigned>.*)\s+(Date Filed|Issue Date):"
-    )
-    judge_assigned_search, judge_assigned_errs = find_pattern(
-        "judge_assigned", judge_assignment_pattern, txt
+    judge_assigned_search, judge_assigned_errs = index.find(
+        "judge_assigned", PATTERNS.judge_assigned, ["CASE INFORMATION"]
     )
     if judge_assigned_search is not None:
         judge_assigned = judge_assigned_search.group("judge_assigned")
@@ -494,31 +727,31 @@ def parse_case(txt: str) -> Tuple[Case, List[str]]:
         # a new_line, and the overflow pattern.
 
         # N.B. the EG only searches for overflow if "Magisterial District Judge" was in the assigned judge name. is that necessary?
-        judge_overflow_search, _ = find_pattern(
-            "judge_overflow_info",
-            judge_assignment_pattern + "\n" + r"^\s+(?P<judge_overflow>\w+\s*\w*)\s*$",
-            txt,
+        judge_overflow_search, _ = index.find(
+            "judge_overflow_info", PATTERNS.judge_assigned_overflow, ["CASE INFORMATION"]
         )
         if judge_overflow_search is not None:
             judge_assigned += (
                 " " + judge_overflow_search.group("judge_overflow").strip()
             )
-        if re.search("migrated", judge_assigned, re.I):
+        if PATTERNS.migrated.search(judge_assigned):
             judge_assigned = None
         case.judge = judge_assigned
     else:
         errs.extend(judge_assigned_errs)
 
     # sometimes the judge is identified as the Final Issuing Authority.
-    final_issue_auth_search, _ = find_pattern(
-        "final_issuing_authority", r"Final Issuing Authority:\s+(?P<judge_name>.*)", txt
+    final_issue_auth_search, _ = index.find(
+        "final_issuing_authority",
+        PATTERNS.final_issuing_authority,
+        ["CASE INFORMATION"],
     )
     if final_issue_auth_search is not None:
         judge_name = final_issue_auth_search.group("judge_name").strip()
-        if not re.search("migrated", judge_name, re.I):
+        if not PATTERNS.migrated.search(judge_name):
             case.judge = judge_name
 
-    dc_search, _ = find_pattern("dc", r"District Control Number\s+(?P<dc>\d+)", txt)
+    dc_search, _ = index.find("dc", PATTERNS.dc, [PREAMBLE, "CASE INFORMATION"])
     if dc_search is not None:
         case.dc = dc_search.group("dc")
     # The District Control Number actually seems pretty rare,
@@ -526,14 +759,12 @@ def parse_case(txt: str) -> Tuple[Case, List[str]]:
     # else:
     # errs.extend(dc_errs)
 
-    arresting_agency_search, arresting_agency_errs = find_pattern(
-        "arresting_agency and officer",
-        r"Arresting Agency:\s+(?P<agency>.*)\s+Arresting Officer: (?P<officer>\D+)",
-        txt,
+    arresting_agency_search, arresting_agency_errs = index.find(
+        "arresting_agency and officer", PATTERNS.arresting_agency, ["CASE INFORMATION"]
     )
     if arresting_agency_search is not None:
         case.affiant = arresting_agency_search.group("officer")
-        if case.affiant.strip() == "" or re.search("Affiant", case.affiant):
+        if case.affiant.strip() == "" or PATTERNS.affiant.search(case.affiant):
             case.affiant = "Unknown Officer"
         case.arresting_agency = arresting_agency_search.group("agency")
     else:
@@ -550,8 +781,9 @@ def parse_cp_pdf_text(txt: str) -> Tuple[Person, List[Case], List[str]]:
 
     This function takes the text of the docket, extracted from a pdf.
     """
-    person, person_errs = parse_person(txt)
-    case, case_errs = parse_case(txt)
+    index = index_docket(txt)
+    person, person_errs = parse_person(txt, index)
+    case, case_errs = parse_case(txt, index)
     return person, [case], person_errs + case_errs
 
 
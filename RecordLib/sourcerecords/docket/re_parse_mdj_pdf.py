@@ -1,5 +1,6 @@
 from RecordLib.crecord import Person, Case
 from RecordLib.sourcerecords.parsingutilities import get_text_from_pdf
+from RecordLib.sourcerecords.documentindex import DocumentIndex
 from typing import Union, BinaryIO, Tuple, Callable, List, Optional
 import re
 import logging
@@ -64,31 +65,38 @@ def parse_mdj_pdf_text(txt: str) -> Tuple[Person, List[Case], List[str]]:
     person_info = dict()
     person_info["aliases"] = []
 
-    lines = txt.split("\n")
+    index = DocumentIndex(txt)
+    lines = index.lines
     for idx, line in enumerate(lines):
-        m = PATTERNS.mdj_district_number.search(line)
+        # Each pattern starts with a keyword, so only search lines that contain the keyword.
+        folded = index.folded_lines[idx]
+        m = "magisterial district judge" in folded and PATTERNS.mdj_district_number.search(
+            line
+        )
         if m:
             # what's the mdj district number for?
             case_info["mdj_district_number"] = m.group(1)
 
-        m = PATTERNS.mdj_county_and_disposition.search(line)
+        m = "county:" in folded and PATTERNS.mdj_county_and_disposition.search(line)
         if m:
             case_info["county"] = m.group(1)
             case_info["disposition_date"] = m.group(2)
 
-        m = PATTERNS.docket_number.search(line)
+        m = "docket number:" in folded and PATTERNS.docket_number.search(line)
         if m:
             case_info["docket_number"] = m.group(1)
 
-        m = PATTERNS.otn.search(line)
+        m = "otn:" in folded and PATTERNS.otn.search(line)
         if m:
             case_info["otn"] = m.group(1)
 
-        m = PATTERNS.dc_number.search(line)
+        m = "district control number" in folded and PATTERNS.dc_number.search(line)
         if m:
             case_info["dc_num"] = m.group(1)
 
-        m = PATTERNS.arrest_agency_and_date.search(line)
+        m = "arresting agency:" in folded and PATTERNS.arrest_agency_and_date.search(
+            line
+        )
         if m:
             case_info["arresting_agency"] = m.group(1)
             try:
@@ -96,11 +104,11 @@ def parse_mdj_pdf_text(txt: str) -> Tuple[Person, List[Case], List[str]]:
             except:
                 pass
 
-        m = PATTERNS.complaint_date.search(line)
+        m = "issue date:" in folded and PATTERNS.complaint_date.search(line)
         if m:
             case_info["complaint_date"] = m.group(1)
 
-        m = PATTERNS.affiant.search(line)
+        m = "arresting officer " in folded and PATTERNS.affiant.search(line)
         if m:
             # TODO - mdj docket parse should reverse order of names of affiant
             case_info["affiant"] = m.group(1)
@@ -110,7 +118,7 @@ def parse_mdj_pdf_text(txt: str) -> Tuple[Person, List[Case], List[str]]:
         # judge's name appears in the Judge Assigned field.  If it does, then set it.
         # Later on, we'll check in the "Final Issuing Authority" field.  If it appears there
         # and doesn't show up as "migrated," we'll reassign the judge name.
-        m = PATTERNS.judge_assigned.search(line)
+        m = "judge assigned:" in folded and PATTERNS.judge_assigned.search(line)
         if m:
             judge = m.group(1).strip()
             next_line = lines[idx + 1]
@@ -121,37 +129,37 @@ def parse_mdj_pdf_text(txt: str) -> Tuple[Person, List[Case], List[str]]:
             if "igrated" not in judge:
                 case_info["judge"] = judge
 
-        m = PATTERNS.judge.search(line)
+        m = "final issuing authority:" in folded and PATTERNS.judge.search(line)
         if m:
             if len(m.group(1)) > 0 and "igrated" not in m.group(1):
                 case_info["judge"] = m.group(1)
 
-        m = PATTERNS.dob.search(line)
+        m = "date of birth" in folded and PATTERNS.dob.search(line)
         if m:
             person_info["date_of_birth"] = m.group(1)
 
-        m = PATTERNS.name.search(line)
+        m = "defendant" in folded and PATTERNS.name.search(line)
         if m:
             person_info["first_name"] = m.group(2)
             person_info["last_name"] = m.group(1)
             person_info["aliases"].append(f"{m.group(1)}, {m.group(2)}")
 
-        m = PATTERNS.alias_names_start.search(line)
+        m = "alias name" in folded and PATTERNS.alias_names_start.search(line)
         if already_searched_aliases is False and m:
             idx2 = idx + 1
-            end_of_aliases = False
-            while not end_of_aliases:
-                if PATTERNS.end_of_page.search(lines[idx2]):
-                    continue
-                if re.search(r"\w", lines[idx2]):
+            while idx2 < len(lines):
+                # skip the footer at the bottom of a page.
+                if not PATTERNS.end_of_page.search(lines[idx2]) and re.search(
+                    r"\w", lines[idx2]
+                ):
                     person_info["aliases"].append(lines[idx2].strip())
                 idx2 += 1
 
-                end_of_aliases = PATTERNS.alias_names_end.search(lines[idx2])
-                if end_of_aliases:
+                if idx2 < len(lines) and PATTERNS.alias_names_end.search(lines[idx2]):
                     already_searched_aliases = True
+                    break
 
-        m = PATTERNS.charges.search(line)  # Arrest.php;595
+        m = "/" in line and PATTERNS.charges.search(line)  # Arrest.php;595
         if m:
             charge_info = dict()
             charge_info["statute"] = m.group(1)
@@ -170,7 +178,7 @@ def parse_mdj_pdf_text(txt: str) -> Tuple[Person, List[Case], List[str]]:
 
             case_info["charges"].append(charge_info)
 
-        m = PATTERNS.bail.search(line)
+        m = "bail" in folded and PATTERNS.bail.search(line)
         if m:
             # TODO charges won't use the detailed bail info yet.
             case_info["bail_charged"] = m.group(1)
@@ -178,7 +186,7 @@ def parse_mdj_pdf_text(txt: str) -> Tuple[Person, List[Case], List[str]]:
             case_info["bail_adjusted"] = m.group(3)
             case_info["bail_total"] = m.group(5)
 
-        m = PATTERNS.costs.search(line)
+        m = "totals:" in folded and PATTERNS.costs.search(line)
         if m:
             case_info["total_fines"] = m.group(1)
             case_info["fines_paid"] = m.group(2)
@@ -0,0 +1,103 @@
+r"""
+An index of the lines and sections of the text of a document.
+
+The docket and summary parsers each need to know where lines and sections start and end.
+Instead of each parser splitting the text again, or running patterns over the whole document to
+find a section, a parser builds a DocumentIndex once and takes slices of the text from it.
+
+    index = DocumentIndex(text, section_header=re.compile(r"^\s*(CHARGES|CASE INFORMATION)\s*$"))
+    index.lines             # the lines of the document
+    index.sections          # the Sections, in the order they appear
+    index.section_text("CHARGES")
+"""
+from typing import List, Optional, Pattern, Tuple, Match
+from dataclasses import dataclass
+from RecordLib.sourcerecords.parsingutilities import find_pattern
+
+
+@dataclass
+class Section:
+    """
+    A section of a document, from the line of its header up to (but not including) the line of the
+    next section's header.
+    """
+
+    name: str
+    start: int
+    end: int
+
+
+class DocumentIndex:
+    """
+    The lines and sections of a document's text.
+
+    Args:
+        text: The text of a document, with pages separated by form feeds.
+        section_header: A pattern that matches lines that start a section. The first group of the match
+            is the section's name. If None, the whole document is one section.
+        preamble: The name of the section made of the lines before the first section header.
+    """
+
+    def __init__(
+        self,
+        text: str,
+        section_header: Optional[Pattern] = None,
+        preamble: str = "PREAMBLE",
+    ):
+        self.text = text
+        self.lines = text.split("\n")
+        self.preamble = preamble
+        self.sections = []
+        current = Section(preamble, 0, len(self.lines))
+        if section_header is not None:
+            for line_number, line in enumerate(self.lines):
+                header = section_header.match(line)
+                if header is not None:
+                    current.end = line_number
+                    self.sections.append(current)
+                    current = Section(header.group(1), line_number, len(self.lines))
+        self.sections.append(current)
+        self._section_texts = dict()
+        self._folded_lines = None
+
+    @property
+    def folded_lines(self) -> List[str]:
+        """ The lines of the document, lowercased, for cheap case-insensitive keyword checks. """
+        if self._folded_lines is None:
+            self._folded_lines = [line.lower() for line in self.lines]
+        return self._folded_lines
+
+    def sections_named(self, name: str) -> List[Section]:
+        """ All the sections with the header `name`, in order. """
+        return [section for section in self.sections if section.name == name]
+
+    def section_lines(self, name: str) -> List[str]:
+        """ The lines of every section with the header `name`, including the header lines. """
+        lines = []
+        for section in self.sections_named(name):
+            lines.extend(self.lines[section.start : section.end])
+        return lines
+
+    def section_text(self, name: str) -> str:
+        """
+        The text of every section with the header `name`, joined together. Empty if there is no such section.
+        """
+        if name not in self._section_texts:
+            self._section_texts[name] = "\n".join(self.section_lines(name))
+        return self._section_texts[name]
+
+    def find(
+        self, label: str, pattern: Pattern, section_names: List[str]
+    ) -> Tuple[Optional[Match], List[str]]:
+        """
+        Search for `pattern` in each of the sections named in `section_names`, in order,
+        and then in the whole document.
+
+        Returns:
+            A tuple of the match or None, and a list of errors, like `find_pattern`.
+        """
+        for name in section_names:
+            search = pattern.search(self.section_text(name))
+            if search is not None:
+                return search, []
+        return find_pattern(label, pattern, self.text)
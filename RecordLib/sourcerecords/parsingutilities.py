@@ -1,46 +1,78 @@
 from typing import Union, BinaryIO, Optional, Tuple, List
-import os
 import re
-import tempfile
 import logging
 from datetime import datetime
+from RecordLib.sourcerecords.pdfextractors import (
+    PDFTextExtractor,
+    ExtractionError,
+    default_extractor,
+)
+from RecordLib.sourcerecords.textcache import TextCache, shared_text_cache
 
 
 logger = logging.getLogger(__name__)
 
 
-def get_text_from_pdf(pdf: Union[BinaryIO, str]) -> str:
+def read_pdf_bytes(pdf: Union[BinaryIO, str, bytes, memoryview]) -> bytes:
     """
-    Function which extracts the text from a pdf document.
+    Get the contents of a pdf, however it was handed to us.
+
     Args:
-        pdf:  Either a file object or the location of a pdf document.
-        tempdir:  Place to store intermediate files.
+        pdf: A file object, the path to a pdf document, or the pdf's bytes.
 
+    Returns:
+        The bytes of the pdf.
+    """
+    if isinstance(pdf, (bytes, bytearray, memoryview)):
+        return bytes(pdf)
+    if hasattr(pdf, "read"):
+        return pdf.read()
+    with open(pdf, "rb") as f:
+        return f.read()
+
+
+def get_text_from_pdf(
+    pdf: Union[BinaryIO, str, bytes, memoryview],
+    extractor: Optional[PDFTextExtractor] = None,
+    cache: Optional[TextCache] = None,
+) -> str:
+    """
+    Function which extracts the text from a pdf document.
+    Args:
+        pdf:  A file object, the location of a pdf document, or the bytes of a pdf.
+        extractor: The engine to use for extracting text. Defaults to `default_extractor()`.
+        cache: A cache of previously extracted texts. Defaults to the cache configured in
+            the environment, if there is one (see `RecordLib.sourcerecords.textcache`).
 
     Returns:
         The extracted text of the pdf.
     """
-    with tempfile.TemporaryDirectory() as out_dir:
-        if hasattr(pdf, "read"):
-            # the pdf attribute is a file object,
-            # and we need to write it out, for pdftotext to use it.
-            pdf_path = os.path.join(out_dir, "tmp.pdf")
-            with open(pdf_path, "wb") as f:
-                f.write(pdf.read())
-        else:
-            pdf_path = pdf
-        # TODO - remove the option of making tempdir anything other than a tempfile.
-        #        Only doing it this way to avoid breaking old tests that send tempdir.
-        # out_path = os.path.join(tempdir, "tmp.txt")
-        out_path = os.path.join(out_dir, "tmp.txt")
-        os.system(f'pdftotext -layout -enc "UTF-8" { pdf_path } { out_path }')
+    if extractor is None:
+        extractor = default_extractor()
+    if cache is None:
+        cache = shared_text_cache()
+    try:
+        data = read_pdf_bytes(pdf)
+        if cache is None:
+            return extractor.extract(data)
+        key = cache.key(data, extractor)
         try:
-            with open(os.path.join(out_dir, "tmp.txt"), "r", encoding="utf8") as f:
-                text = f.read()
-                return text
-        except IOError as e:
-            logger.error("Cannot extract pdf text..")
-            return ""
+            text = cache.get(key)
+        except Exception as err:
+            # A cache that's down (like a redis server that's gone away) shouldn't stop text extraction.
+            logger.warning(f"Could not read from the pdf text cache: {err}")
+            return extractor.extract(data)
+        if text is None:
+            text = extractor.extract(data)
+            try:
+                cache.put(key, text)
+            except Exception as err:
+                logger.warning(f"Could not write to the pdf text cache: {err}")
+        return text
+    except (IOError, ExtractionError) as e:
+        logger.error("Cannot extract pdf text..")
+        logger.error(str(e))
+        return ""
 
 
 def date_or_none(date_text: str, fmtstr: str = r"%m/%d/%Y") -> datetime:
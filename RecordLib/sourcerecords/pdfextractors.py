@@ -0,0 +1,157 @@
+"""
+Engines for turning the bytes of a pdf into text.
+
+The docket and summary parsers are written against the text that `pdftotext -layout` produces,
+so every engine here aims to produce that same layout-preserving text.
+
+There are two engines:
+
+    PopplerExtractor:    Uses the `pdftotext` python package, which binds to the same poppler library
+                         the command line tool uses. The pdf never leaves memory. This engine is only
+                         available if the `pdftotext` package is installed.
+    SubprocessExtractor: Pipes the pdf through the `pdftotext` command line tool over stdin/stdout.
+                         No temporary files, but there's still a fork/exec for each document.
+
+`default_extractor()` picks the first available engine, or the one named in the
+PDF_TEXT_EXTRACTOR environment variable, if that one is available.
+"""
+from typing import Union
+import abc
+import io
+import os
+import subprocess
+import logging
+
+try:
+    import pdftotext
+except ImportError:
+    pdftotext = None
+
+
+logger = logging.getLogger(__name__)
+
+
+class ExtractionError(Exception):
+    """ An engine could not turn a pdf into text. """
+
+
+class PDFTextExtractor(abc.ABC):
+    """
+    Base class for engines that extract the text of a pdf.
+
+    Subclasses set a `name` and a `version`, and implement `extract`. The version should change
+    whenever a change to the engine could change the text it produces.
+    """
+
+    name = "base"
+    version = "0"
+
+    @classmethod
+    def available(cls) -> bool:
+        """ Can this engine run in the current environment? """
+        return False
+
+    @property
+    def fingerprint(self) -> str:
+        """ A string identifying this engine and its version. """
+        return f"{self.name}-{self.version}"
+
+    @abc.abstractmethod
+    def extract(self, data: Union[bytes, memoryview]) -> str:
+        """
+        Extract the text of a pdf.
+
+        Args:
+            data: The contents of a pdf file.
+
+        Returns:
+            The layout-preserving text of the pdf, with pages separated by form feeds.
+
+        Raises:
+            ExtractionError, if the pdf could not be read.
+        """
+
+
+class PopplerExtractor(PDFTextExtractor):
+    """
+    Extract text in-process with the `pdftotext` python bindings to poppler.
+
+    The bindings' `physical` mode is the same as the command line tool's `-layout` option.
+    """
+
+    name = "poppler"
+    version = "1"
+
+    @classmethod
+    def available(cls) -> bool:
+        return pdftotext is not None
+
+    def extract(self, data: Union[bytes, memoryview]) -> str:
+        try:
+            pages = pdftotext.PDF(io.BytesIO(data), physical=True)
+        except pdftotext.Error as err:
+            raise ExtractionError(str(err)) from err
+        # The command line tool ends every page with a form feed, so do the same here.
+        return "".join(page + "\f" for page in pages)
+
+
+class SubprocessExtractor(PDFTextExtractor):
+    """
+    Extract text by piping the pdf through the `pdftotext` command line tool.
+    """
+
+    name = "subprocess"
+    version = "1"
+
+    def __init__(self, command: str = "pdftotext"):
+        self.command = command
+
+    @classmethod
+    def available(cls) -> bool:
+        # Whether the binary is actually on the PATH is only discovered when we try to use it.
+        return True
+
+    def extract(self, data: Union[bytes, memoryview]) -> str:
+        try:
+            completed = subprocess.run(
+                [self.command, "-layout", "-enc", "UTF-8", "-", "-"],
+                input=bytes(data),
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+            )
+        except OSError as err:
+            raise ExtractionError(str(err)) from err
+        if completed.returncode != 0:
+            raise ExtractionError(completed.stderr.decode("utf8", errors="replace"))
+        return completed.stdout.decode("utf8")
+
+
+EXTRACTORS = {
+    PopplerExtractor.name: PopplerExtractor,
+    SubprocessExtractor.name: SubprocessExtractor,
+}
+
+
+def default_extractor() -> PDFTextExtractor:
+    """
+    Choose an extraction engine.
+
+    If the environment variable PDF_TEXT_EXTRACTOR names an engine that is available, use that one.
+    Otherwise prefer the in-process engine, and fall back to the subprocess engine.
+    """
+    requested = os.environ.get("PDF_TEXT_EXTRACTOR")
+    if requested:
+        extractor_class = EXTRACTORS.get(requested)
+        if extractor_class is None:
+            logger.error(f"Unknown pdf text extractor {requested}. Using the default.")
+        elif not extractor_class.available():
+            logger.warning(
+                f"The pdf text extractor {requested} isn't available here. Using pdftotext on the command line."
+            )
+            return SubprocessExtractor()
+        else:
+            return extractor_class()
+    for extractor_class in EXTRACTORS.values():
+        if extractor_class.available():
+            return extractor_class()
+    return SubprocessExtractor()
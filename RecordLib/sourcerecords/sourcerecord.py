@@ -1,4 +1,8 @@
-from typing import Any, Callable, Optional
+from typing import Any, Callable, List, Optional
+import functools
+import glob
+import hashlib
+import os
 import re
 
 
@@ -9,6 +13,32 @@ def null_parser(_):
     return None, None, ["No parser used"]
 
 
+@functools.lru_cache(maxsize=None)
+def code_fingerprint() -> str:
+    """
+    A hash of the source code of the parsers and of the classes that they produce, so that any change to
+    either gives a new fingerprint.
+    """
+    recordlib = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    digest = hashlib.sha256()
+    for package in ["sourcerecords", "crecord"]:
+        for path in sorted(
+            glob.glob(os.path.join(recordlib, package, "**", "*.py"), recursive=True)
+        ):
+            with open(path, "rb") as f:
+                digest.update(f.read())
+    return digest.hexdigest()[:16]
+
+
+def parser_version(parser: Callable) -> str:
+    """
+    A stamp identifying a parser and the version of the code it runs.
+
+    Parse results stored under one stamp shouldn't be reused by code with a different one.
+    """
+    return f"{parser.__module__}.{parser.__qualname__}-{code_fingerprint()}"
+
+
 class SourceRecord:
     """
     A generic class for tranforming raw inputs with information about cases and criminal records into
@@ -57,3 +87,25 @@ class SourceRecord:
         self.cases = cases or []
         self.errors = errors
         self.record_type = record_type
+
+    @classmethod
+    def from_parsed(
+        cls,
+        src: Any,
+        person,
+        cases: List,
+        errors: List[str],
+        parser: Optional[Callable] = None,
+        record_type: Optional[str] = None,
+    ) -> "SourceRecord":
+        """
+        Create a SourceRecord from the results of parsing `src` earlier, without parsing it again.
+        """
+        sourcerecord = cls.__new__(cls)
+        sourcerecord.raw_source = src
+        sourcerecord.parser = parser or null_parser
+        sourcerecord.person = person
+        sourcerecord.cases = cases or []
+        sourcerecord.errors = errors
+        sourcerecord.record_type = record_type
+        return sourcerecord
@@ -33,6 +33,27 @@ from .grammars import (
 )
 
 
+# Visitors hold no state between visits, so each is built once and reused for every summary.
+# They build lxml trees directly, rather than xml strings that would need to be parsed again.
+summary_page_visitor = CustomVisitorFactory(
+    summary_page_terminals, summary_page_nonterminals, dict(), output="element"
+).create_instance()
+
+md_summary_body_visitor = CustomVisitorFactory(
+    summary_body_terminals,
+    md_summary_body_nonterminals,
+    [("sentence_length", visit_sentence_length_element)],
+    output="element",
+).create_instance()
+
+cp_summary_body_visitor = CustomVisitorFactory(
+    summary_body_terminals,
+    cp_summary_body_nonterminals,
+    [("sentence_length", visit_sentence_length_element)],
+    output="element",
+).create_instance()
+
+
 def get_processors(text: str) -> Dict:
     """
     Get the functions for processing this text. It will be a set of processers either for MDJ court
@@ -52,13 +73,7 @@ def parse_md_summary(parsed_pages: Node) -> Tuple[etree.Element, etree.Element]:
 
     TODO - it might make sense later to recombine these cp/md functions to make
     code more DRY, but for now i don't know how different they will need to be from each other."""
-    summary_page_visitor = CustomVisitorFactory(
-        summary_page_terminals, summary_page_nonterminals, dict()
-    ).create_instance()
-    xml_parser = etree.XMLParser(encoding="UTF-8", recover=True)
-    pages_xml_tree = etree.fromstring(
-        summary_page_visitor.visit(parsed_pages), xml_parser
-    )
+    pages_xml_tree = summary_page_visitor.visit(parsed_pages)
 
     # combine the body sections from each page and parse the combined body
     summary_info_sections = pages_xml_tree.findall(".//summary_info")
@@ -144,27 +159,12 @@ def parse_md_summary(parsed_pages: Node) -> Tuple[etree.Element, etree.Element]:
     # And recombine into one string.
     summary_info_combined = "\n".join(slines)
 
-    # Remove.
-    summary_info_visitor = CustomVisitorFactory(
-        summary_body_terminals,
-        md_summary_body_nonterminals,
-        [("sentence_length", visit_sentence_length)],
-    ).create_instance()
-
     try:
         parsed_summary_body = md_summary_body_grammar.parse(summary_info_combined)
     except Exception as e:
         raise e
 
-    summary_info_visitor = CustomVisitorFactory(
-        summary_body_terminals,
-        md_summary_body_nonterminals,
-        [("sentence_length", visit_sentence_length)],
-    ).create_instance()
-
-    summary_body_xml_tree = etree.fromstring(
-        summary_info_visitor.visit(parsed_summary_body)
-    )
+    summary_body_xml_tree = md_summary_body_visitor.visit(parsed_summary_body)
     return pages_xml_tree, summary_body_xml_tree
 
 
@@ -172,17 +172,11 @@ def parse_cp_summary(parsed_pages: Node) -> Tuple[etree.Element, etree.Element]:
     """ handle parsing the rest of a cp summary pdf
 
     (After parse_pdf has separated pages) """
-    summary_page_visitor = CustomVisitorFactory(
-        summary_page_terminals, summary_page_nonterminals, dict()
-    ).create_instance()
 
-    # the summary is now a string of xml along the lines of:
+    # the summary is now an xml tree along the lines of:
     # <summary> <first_page> ... </first_page>
-    # <following_page> ... </following_page> </summary>\
-    xml_parser = etree.XMLParser(encoding="UTF-8", recover=True)
-    pages_xml_tree = etree.fromstring(
-        summary_page_visitor.visit(parsed_pages), xml_parser
-    )
+    # <following_page> ... </following_page> </summary>
+    pages_xml_tree = summary_page_visitor.visit(parsed_pages)
 
     # combine the body sections from each page and parse the combined body
     summary_info_sections = pages_xml_tree.findall(".//summary_info")
@@ -197,16 +191,10 @@ def parse_cp_summary(parsed_pages: Node) -> Tuple[etree.Element, etree.Element]:
                 if "(Continued)" in summary_info_sections[i + 1].text[0:50]:
                     section.text = section.text[:-2]
 
-    def find_in_lines(lines, cp_id):
-        for line in lines:
-            if cp_id in line:
-                return True
-
-        return False
-
     # Then split into lines, so we can remove lines that say (Continued) and other overflow lines.
     slines = []
     previous_sec_lines = []
+    previous_sec_text = ""
     for i, sec in enumerate(summary_info_sections):
         sec_lines = sec.text.split("\n")
         line_count = len(sec_lines)
@@ -222,7 +210,9 @@ def parse_cp_summary(parsed_pages: Node) -> Tuple[etree.Element, etree.Element]:
                     if match:
                         cp_id = match.group(1)
                         # print(cp_id)
-                        if find_in_lines(previous_sec_lines, cp_id):
+                        # cp_id has no newlines, so it's in one of the previous
+                        # page's lines if it's anywhere in the page's text.
+                        if cp_id in previous_sec_text:
                             lines_to_remove += 1
                             if line_count > 3 and "Arrest Dt" in sec_lines[3]:
                                 lines_to_remove += 1
@@ -267,6 +257,7 @@ def parse_cp_summary(parsed_pages: Node) -> Tuple[etree.Element, etree.Element]:
             slines.append(ln)
 
         previous_sec_lines = sec_lines
+        previous_sec_text = sec.text
 
     # And recombine into one string.
     summary_info_combined = "\n".join(slines)
@@ -276,15 +267,7 @@ def parse_cp_summary(parsed_pages: Node) -> Tuple[etree.Element, etree.Element]:
     except Exception as e:
         raise e
 
-    summary_info_visitor = CustomVisitorFactory(
-        summary_body_terminals,
-        cp_summary_body_nonterminals,
-        [("sentence_length", visit_sentence_length)],
-    ).create_instance()
-
-    summary_body_xml_tree = etree.fromstring(
-        summary_info_visitor.visit(parsed_summary_body)
-    )
+    summary_body_xml_tree = cp_summary_body_visitor.visit(parsed_summary_body)
     return pages_xml_tree, summary_body_xml_tree
 
 
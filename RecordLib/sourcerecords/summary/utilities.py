@@ -4,108 +4,125 @@ Simple functions used for reading summary sheets.
 
 
 import re
+from typing import Optional, Tuple
 from lxml import etree
 from datetime import datetime
-
-def visit_sentence_length(self, node, vc):
+from RecordLib.sourcerecords.customnodevisitorfactory import build_element
+
+# Sentence lengths can appear in lots of formats, so there are patterns for the different
+# possibilities.
+min_pattern = re.compile(
+    r".*(?:min of|Min:) (?P<time>[0-9\./]*) (?P<unit>\w+).*",
+    flags=re.IGNORECASE | re.DOTALL,
+)
+max_pattern = re.compile(
+    r".*(?:max of|Max:) (?P<time>[0-9\./]*) (?P<unit>\w+).*",
+    flags=re.IGNORECASE | re.DOTALL,
+)
+# Original from DocketParse
+# range_pattern = re.compile(r".*?(?P<min_time>(?:[0-9\.\/]+(?:\s|$))+)(?P<min_unit>\w+ )?(?:to|-)? (?P<max_time>(?:[0-9\.\/]+(?:\s|$))+)(?P<max_unit>\w+).*", flags=re.IGNORECASE|re.DOTALL)
+
+range_pattern = re.compile(
+    r".*: (?P<min_time>[0-9\.\/]+) (?P<min_unit>\w+)?(?:to|-)?.*: (?P<max_time>[0-9\.\/]+) (?P<max_unit>\w+).*",
+    flags=re.IGNORECASE | re.DOTALL,
+)
+
+single_term_pattern = re.compile(
+    r".*\s{5,}(?P<time>[0-9\./]+)\s(?P<unit>\w+)$.*", flags=re.IGNORECASE | re.DOTALL,
+)
+
+
+def sentence_length_bounds(
+    text: str,
+) -> Tuple[Optional[Tuple[str, str]], Optional[Tuple[str, str]]]:
     """
-    Custom node visitor for parsing a setence in a conviction.
-
-    Returns an xml tree along the lines of
-    
-    .. code-block:: xml 
+    Find the minimum and maximum lengths of a sentence in the text describing the sentence.
 
-        <sentence_length>
-            <min_length> <time> __ </time> <unit> __ </unit> </min_length>
-            <max_length> <time> __ </time> <unit> __ </unit> </max_length>
-        </sentence_length>
+    Returns:
+        A tuple of the (time, unit) of the minimum length and the (time, unit) of the maximum length.
+        Either may be None.
     """
-
-    # Sentence lengths can appear in lots of formats, so this attempts to parse different
-    # possibilities.
-    min_pattern = re.compile(
-        r".*(?:min of|Min:) (?P<time>[0-9\./]*) (?P<unit>\w+).*",
-        flags=re.IGNORECASE | re.DOTALL,
-    )
-    max_pattern = re.compile(
-        r".*(?:max of|Max:) (?P<time>[0-9\./]*) (?P<unit>\w+).*",
-        flags=re.IGNORECASE | re.DOTALL,
-    )
-    # Original from DocketParse
-    # range_pattern = re.compile(r".*?(?P<min_time>(?:[0-9\.\/]+(?:\s|$))+)(?P<min_unit>\w+ )?(?:to|-)? (?P<max_time>(?:[0-9\.\/]+(?:\s|$))+)(?P<max_unit>\w+).*", flags=re.IGNORECASE|re.DOTALL)
-
-    range_pattern = re.compile(
-        r".*: (?P<min_time>[0-9\.\/]+) (?P<min_unit>\w+)?(?:to|-)?.*: (?P<max_time>[0-9\.\/]+) (?P<max_unit>\w+).*",
-        flags=re.IGNORECASE | re.DOTALL,
-    )
-
-    single_term_pattern = re.compile(
-        r".*\s{5,}(?P<time>[0-9\./]+)\s(?P<unit>\w+)$.*",
-        flags=re.IGNORECASE | re.DOTALL,
-    )
-    # temp_string = node.text
-    #    print(temp_string)
     min_length = None
     max_length = None
-    min_length_match = re.match(min_pattern, node.text)
-    max_length_match = re.match(max_pattern, node.text)
-    range = re.match(range_pattern, node.text)
-    single_term = re.match(single_term_pattern, node.text)
+    min_length_match = re.match(min_pattern, text)
+    max_length_match = re.match(max_pattern, text)
+    range = re.match(range_pattern, text)
+    single_term = re.match(single_term_pattern, text)
     if min_length_match is not None:
-        min_length = (
-            f"<min_length> <time> {min_length_match.group('time')} </time> "
-            + f"<unit> {min_length_match.group('unit')} </unit> </min_length>"
-        )
+        min_length = (min_length_match.group("time"), min_length_match.group("unit"))
         if max_length_match is None:
-            max_length = (
-                f"<max_length> <time> {min_length_match.group('time')} </time> "
-                + f" <unit> {min_length_match.group('unit')} </unit> </max_length>"
-            )
+            max_length = min_length
 
     if max_length_match is not None:
-        max_length = (
-            "<max_length> <time> %s </time> <unit> %s </unit> </max_length>"
-            % (max_length_match.group("time"), max_length_match.group("unit"))
-        )
+        max_length = (max_length_match.group("time"), max_length_match.group("unit"))
         if min_length_match is None:
-            min_length = (
-                "<min_length> <time> %s </time> <unit> %s </unit> </min_length>"
-                % (max_length_match.group("time"), max_length_match.group("unit"))
-            )
+            min_length = max_length
 
     if range is not None:
         if range.group("min_unit") is not None:
-            min_length = (
-                "<min_length> <time> %s </time> <unit> %s </unit> </min_length>"
-                % (range.group("min_time"), range.group("min_unit"))
-            )
+            min_length = (range.group("min_time"), range.group("min_unit"))
         else:
-            min_length = (
-                "<min_length> <time> %s </time> <unit> %s </unit> </min_length>"
-                % (range.group("min_time"), range.group("max_unit"))
-            )
-        max_length = (
-            "<max_length> <time> %s </time> <unit> %s </unit> </max_length>"
-            % (range.group("max_time"), range.group("max_unit"))
-        )
+            min_length = (range.group("min_time"), range.group("max_unit"))
+        max_length = (range.group("max_time"), range.group("max_unit"))
 
     if single_term is not None:
-        min_length = (
-            "<min_length> <time> %s </time> <unit> %s </unit> </min_length>"
-            % (single_term.group("time"), single_term.group("unit"))
-        )
-        max_length = (
-            "<max_length> <time> %s </time> <unit> %s </unit> </max_length>"
-            % (single_term.group("time"), single_term.group("unit"))
-        )
+        min_length = (single_term.group("time"), single_term.group("unit"))
+        max_length = min_length
 
+    return min_length, max_length
+
+
+def visit_sentence_length(self, node, vc):
+    """
+    Custom node visitor for parsing a setence in a conviction.
+
+    Returns an xml tree along the lines of
+    
+    .. code-block:: xml 
+
+        <sentence_length>
+            <min_length> <time> __ </time> <unit> __ </unit> </min_length>
+            <max_length> <time> __ </time> <unit> __ </unit> </max_length>
+        </sentence_length>
+    """
+    min_length, max_length = sentence_length_bounds(node.text)
     contents = self.stringify(vc)
     if min_length is not None and max_length is not None:
-        contents = min_length + " " + max_length
+        contents = (
+            "<min_length> <time> %s </time> <unit> %s </unit> </min_length> " % min_length
+            + "<max_length> <time> %s </time> <unit> %s </unit> </max_length>"
+            % max_length
+        )
 
     return " <sentence_length> %s </sentence_length> " % contents
 
 
+def visit_sentence_length_element(self, node, vc):
+    """
+    Custom node visitor for parsing a sentence in a conviction, for visitors that build
+    lxml elements. Builds the same tree as `visit_sentence_length`.
+    """
+    min_length, max_length = sentence_length_bounds(node.text)
+    if min_length is None or max_length is None:
+        return [" ", build_element("sentence_length", vc), " "]
+
+    def length_element(tag, time_unit):
+        time, unit = time_unit
+        return build_element(
+            tag, [build_element("time", [time]), " ", build_element("unit", [unit])]
+        )
+
+    sentence_length = build_element(
+        "sentence_length",
+        [
+            length_element("min_length", min_length),
+            " ",
+            length_element("max_length", max_length),
+        ],
+    )
+    return [" ", sentence_length, " "]
+
+
 def text_or_blank(element: etree.Element) -> str:
     """
     Extract the text of an element, if any, or return a blank string.
@@ -0,0 +1,190 @@
+"""
+Caches for the text extracted from pdfs.
+
+The same docket and summary pdfs get extracted over and over (on upload, on every screening of a person,
+on every re-run of a script). A cache entry is keyed by the SHA-256 of the pdf's bytes plus the
+fingerprint of the extractor that produced the text, so a new extractor version never gets stale text.
+
+There are two backends:
+
+    DiskTextCache:  Text files in a local directory, with the least recently used files evicted once
+                    the directory grows past a size limit.
+    RedisTextCache: Entries in redis, stored through a RedisHelper so they share its key namespace.
+
+`default_text_cache()` builds a cache from the environment variables PDF_TEXT_CACHE_DIR (and
+PDF_TEXT_CACHE_MAX_MB) or PDF_TEXT_CACHE_REDIS. If neither is set, there is no cache.
+"""
+from typing import Optional, Union, Dict
+from collections import OrderedDict
+import functools
+import hashlib
+import os
+import threading
+import logging
+from RecordLib.sourcerecords.pdfextractors import PDFTextExtractor
+
+
+logger = logging.getLogger(__name__)
+
+
+class TextCache:
+    """
+    Base class for a cache of extracted pdf text.
+
+    Subclasses implement `_get` and `_put`. The public `get` and `put` methods keep count of
+    hits and misses.
+    """
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(data: Union[bytes, memoryview], extractor: PDFTextExtractor) -> str:
+        """ The cache key for a pdf's bytes extracted with `extractor`. """
+        return f"{hashlib.sha256(data).hexdigest()}-{extractor.fingerprint}"
+
+    def get(self, key: str) -> Optional[str]:
+        """ Look up the text for a key, or None if it isn't cached. """
+        text = self._get(key)
+        if text is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return text
+
+    def put(self, key: str, text: str) -> None:
+        """ Store the text for a key. """
+        self._put(key, text)
+
+    def stats(self) -> Dict[str, int]:
+        """ Counts of the lookups that found, and did not find, cached text. """
+        return {"hits": self.hits, "misses": self.misses}
+
+    def _get(self, key: str) -> Optional[str]:
+        raise NotImplementedError
+
+    def _put(self, key: str, text: str) -> None:
+        raise NotImplementedError
+
+
+class DiskTextCache(TextCache):
+    """
+    Cache extracted text in files in a local directory.
+
+    Once the files in the directory add up to more than `max_bytes`, the least recently used
+    files are deleted. Reading an entry touches its file, so recency survives restarts.
+    """
+
+    suffix = ".txt"
+
+    def __init__(self, directory: str, max_bytes: int = 256 * 1024 * 1024):
+        super().__init__()
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        # key -> size of the cached file, ordered from least to most recently used.
+        self._entries = OrderedDict()
+        existing = []
+        for entry in os.scandir(directory):
+            if entry.is_file() and entry.name.endswith(self.suffix):
+                stat = entry.stat()
+                existing.append(
+                    (stat.st_mtime, entry.name[: -len(self.suffix)], stat.st_size)
+                )
+        for _, key, size in sorted(existing):
+            self._entries[key] = size
+        self.size = sum(self._entries.values())
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key + self.suffix)
+
+    def _get(self, key: str) -> Optional[str]:
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf8") as f:
+                text = f.read()
+            os.utime(path)
+        except FileNotFoundError:
+            with self._lock:
+                self.size -= self._entries.pop(key, 0)
+            return None
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+        return text
+
+    def _put(self, key: str, text: str) -> None:
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf8") as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+        size = os.path.getsize(path)
+        with self._lock:
+            self.size += size - self._entries.pop(key, 0)
+            self._entries[key] = size
+            self._evict()
+
+    def _evict(self) -> None:
+        """ Delete least recently used entries until the cache fits in max_bytes. """
+        while self.size > self.max_bytes and len(self._entries) > 1:
+            key, size = self._entries.popitem(last=False)
+            self.size -= size
+            try:
+                os.remove(self._path(key))
+            except FileNotFoundError:
+                pass
+
+
+class RedisTextCache(TextCache):
+    """
+    Cache extracted text in redis.
+
+    Args:
+        redis_helper: A RedisHelper. Keys are stored in its namespace, under "pdftext:".
+        ttl: Seconds until an entry expires, or None to keep entries until redis evicts them.
+    """
+
+    def __init__(self, redis_helper, ttl: Optional[int] = None):
+        super().__init__()
+        self.redis_helper = redis_helper
+        self.ttl = ttl
+
+    def _get(self, key: str) -> Optional[str]:
+        text = self.redis_helper.get("pdftext:" + key)
+        if isinstance(text, bytes):
+            text = text.decode("utf8")
+        return text
+
+    def _put(self, key: str, text: str) -> None:
+        self.redis_helper.set("pdftext:" + key, text, ex=self.ttl)
+
+
+def default_text_cache() -> Optional[TextCache]:
+    """
+    Build the text cache described by the environment, if any.
+
+    PDF_TEXT_CACHE_DIR is a directory for a DiskTextCache, limited to PDF_TEXT_CACHE_MAX_MB megabytes.
+    PDF_TEXT_CACHE_REDIS is a redis connection for a RedisTextCache, in the
+    form [host]:[port]:[db number]:[environment name].
+    """
+    cache_dir = os.environ.get("PDF_TEXT_CACHE_DIR")
+    if cache_dir:
+        max_mb = int(os.environ.get("PDF_TEXT_CACHE_MAX_MB", 256))
+        return DiskTextCache(cache_dir, max_bytes=max_mb * 1024 * 1024)
+    redis_connection = os.environ.get("PDF_TEXT_CACHE_REDIS")
+    if redis_connection:
+        # imported here so that redis is only needed by those who use it.
+        from RecordLib.utilities.redis_helper import RedisHelper
+
+        host, port, db, env = redis_connection.split(":")
+        return RedisTextCache(RedisHelper(host=host, port=port, db=db, env=env))
+    return None
+
+
+@functools.lru_cache(maxsize=None)
+def shared_text_cache() -> Optional[TextCache]:
+    """ The text cache that `get_text_from_pdf` uses by default. Built once per process. """
+    return default_text_cache()
@@ -0,0 +1,289 @@
+"""
+Benchmarks for parsing documents, analyzing records, and rendering petitions.
+
+Each stage of the pipeline runs on synthetic documents (see `RecordLib.utilities.synthetic_documents`)
+of a chosen size, so it is easy to see how a stage scales. For each stage we record the best time
+out of several runs, the throughput, and the peak memory allocated during one run.
+
+Results can be saved as json, and a later run can be compared against them to catch regressions:
+
+    results = run_benchmarks(scale=50)
+    regressions = compare_results(results, baseline, tolerance=0.1)
+
+The `benchmark` command line tool (scripts/benchmark.py) wraps these functions.
+"""
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from dataclasses import dataclass, asdict
+from datetime import datetime
+import io
+import platform
+import random
+import time
+import tracemalloc
+import logging
+from RecordLib.analysis import Analysis
+from RecordLib.analysis.ruledefs import (
+    expunge_summary_convictions,
+    expunge_nonconvictions,
+    expunge_deceased,
+    expunge_over_70,
+    seal_convictions,
+)
+from RecordLib.crecord import Attorney
+from RecordLib.petitions import Expungement
+from RecordLib.petitions.compressor import spooled_archive
+from RecordLib.sourcerecords.parsingutilities import get_text_from_pdf
+from RecordLib.sourcerecords.textcache import TextCache
+from RecordLib.sourcerecords.docket.re_parse_cp_pdf import parse_cp_pdf_text
+from RecordLib.sourcerecords.docket.re_parse_mdj_pdf import parse_mdj_pdf_text
+from RecordLib.sourcerecords.summary.parse_pdf import parse_text as parse_summary_text
+from RecordLib.utilities.serializers import dump_json
+from RecordLib.utilities import synthetic_documents
+
+
+logger = logging.getLogger(__name__)
+
+
+class NoTextCache(TextCache):
+    """ A text cache that never has anything in it, so that extraction is timed every time. """
+
+    def _get(self, key: str) -> Optional[str]:
+        return None
+
+    def _put(self, key: str, text: str) -> None:
+        pass
+
+
+@dataclass
+class StageResult:
+    """
+    The measurements for one stage.
+
+    `items` is the number of things the stage handles in one run (charges for dockets,
+    cases for everything else), and `input_bytes` the size of its input text, if it has one.
+    If a stage could not run here, `skipped` says why, and there are no measurements.
+    """
+
+    stage: str
+    items: int
+    input_bytes: Optional[int] = None
+    runs: int = 0
+    best_seconds: Optional[float] = None
+    mean_seconds: Optional[float] = None
+    items_per_second: Optional[float] = None
+    bytes_per_second: Optional[float] = None
+    peak_memory_bytes: Optional[int] = None
+    skipped: Optional[str] = None
+
+
+class StageUnavailable(Exception):
+    """ A benchmark stage can't run in this environment. """
+
+
+# A stage's setup function takes the size of the input to build, and returns the function to time,
+# the number of items that function handles, and the size in bytes of its input text, if any.
+Setup = Callable[[int], Tuple[Callable[[], Any], int, Optional[int]]]
+
+
+def setup_extract_pdf_text(size: int):
+    pdf = synthetic_documents.pdf_from_text(synthetic_documents.cp_docket_text(size))
+    cache = NoTextCache()
+
+    def run():
+        return get_text_from_pdf(pdf, cache=cache)
+
+    if run() == "":
+        raise StageUnavailable("No pdf text extractor could read the pdf.")
+    return run, size, len(pdf)
+
+
+def setup_parse_cp_docket(size: int):
+    text = synthetic_documents.cp_docket_text(size)
+    return lambda: parse_cp_pdf_text(text), size, len(text.encode("utf8"))
+
+
+def setup_parse_mdj_docket(size: int):
+    text = synthetic_documents.mdj_docket_text(size)
+    return lambda: parse_mdj_pdf_text(text), size, len(text.encode("utf8"))
+
+
+def setup_parse_summary(size: int):
+    text = synthetic_documents.cp_summary_text(n_cases=size, charges_per_case=2)
+    return lambda: parse_summary_text(text), size, len(text.encode("utf8"))
+
+
+def analyze(crecord) -> Analysis:
+    """ The chain of rules that the web app applies to a record. """
+    return (
+        Analysis(crecord)
+        .rule(expunge_deceased)
+        .rule(expunge_over_70)
+        .rule(expunge_nonconvictions)
+        .rule(expunge_summary_convictions)
+        .rule(seal_convictions)
+    )
+
+
+def setup_analyze(size: int):
+    crecord = synthetic_documents.crecord(n_cases=size, charges_per_case=3)
+    return lambda: analyze(crecord), size, None
+
+
+def setup_serialize(size: int):
+    analysis = analyze(synthetic_documents.crecord(n_cases=size, charges_per_case=3))
+
+    def run():
+        return dump_json(analysis)
+
+    return run, size, None
+
+
+def setup_render_petitions(size: int):
+    crecord = synthetic_documents.crecord(n_cases=size, charges_per_case=3)
+    template = synthetic_documents.petition_template().getvalue()
+    attorney = Attorney(full_name="Ada Attorney", organization="Legal Aid")
+
+    def run():
+        petitions = []
+        for number, case in enumerate(crecord.cases):
+            petition = Expungement(
+                attorney=attorney,
+                client=crecord.person,
+                cases=[case],
+                expungement_type=Expungement.ExpungementTypes.FULL_EXPUNGEMENT,
+                procedure=Expungement.ExpungementProcedures.NONSUMMARY_EXPUNGEMENT,
+            )
+            petition.set_template(io.BytesIO(template))
+            petitions.append((f"{number}_{petition.file_name()}", petition.render()))
+        with spooled_archive(petitions) as package:
+            return package.seek(0, io.SEEK_END)
+
+    return run, size, None
+
+
+STAGES: Dict[str, Setup] = {
+    "extract_pdf_text": setup_extract_pdf_text,
+    "parse_cp_docket": setup_parse_cp_docket,
+    "parse_mdj_docket": setup_parse_mdj_docket,
+    "parse_summary": setup_parse_summary,
+    "analyze": setup_analyze,
+    "serialize": setup_serialize,
+    "render_petitions": setup_render_petitions,
+}
+
+
+def peak_memory(run: Callable[[], Any]) -> int:
+    """ The most memory, in bytes, allocated at any one time while `run` runs. """
+    tracemalloc.start()
+    try:
+        run()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def run_stage(name: str, size: int, repeat: int = 5) -> StageResult:
+    """
+    Time one stage.
+
+    Args:
+        name: The name of a stage in STAGES.
+        size: The size of the synthetic input.
+        repeat: How many times to run the stage. The best time is the one reported.
+    """
+    try:
+        run, items, input_bytes = STAGES[name](size)
+    except StageUnavailable as err:
+        logger.warning(f"Skipping {name}: {err}")
+        return StageResult(name, size, skipped=str(err))
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - start)
+    best = min(timings)
+    return StageResult(
+        stage=name,
+        items=items,
+        input_bytes=input_bytes,
+        runs=repeat,
+        best_seconds=best,
+        mean_seconds=sum(timings) / len(timings),
+        items_per_second=items / best if best > 0 else None,
+        bytes_per_second=input_bytes / best if input_bytes and best > 0 else None,
+        # measured in a separate run, because tracing allocations slows everything down.
+        peak_memory_bytes=peak_memory(run),
+    )
+
+
+def run_benchmarks(
+    scale: int = 50,
+    repeat: int = 5,
+    stages: Optional[List[str]] = None,
+    seed: int = 0,
+) -> Dict:
+    """
+    Run benchmark stages and collect their results.
+
+    Args:
+        scale: The size of each stage's input: the number of charges on a docket, or the number of cases in a
+            summary or record.
+        repeat: How many times to time each stage.
+        stages: The names of the stages to run. Defaults to all of them.
+        seed: Seed for the random parts of the synthetic documents.
+
+    Returns:
+        A dict that can be written out as json, with the results of each stage under "stages".
+    """
+    random.seed(seed)
+    results = dict()
+    for name in stages or STAGES.keys():
+        logger.info(f"Running {name} at scale {scale}")
+        results[name] = asdict(run_stage(name, scale, repeat))
+    return {
+        "created": datetime.now().isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "scale": scale,
+        "repeat": repeat,
+        "stages": results,
+    }
+
+
+def compare_results(results: Dict, baseline: Dict, tolerance: float = 0.1) -> List[str]:
+    """
+    Find the stages that got slower, or used more memory, than they did in a baseline.
+
+    Args:
+        results: Results from `run_benchmarks`.
+        baseline: Earlier results from `run_benchmarks`, to compare against.
+        tolerance: How much worse a measurement may get, as a fraction of the baseline, before it
+            counts as a regression.
+
+    Returns:
+        A list of messages describing regressions. Empty if there were none.
+    """
+    regressions = []
+    for name, result in results["stages"].items():
+        before = baseline.get("stages", {}).get(name)
+        if before is None or result["skipped"] or before["skipped"]:
+            continue
+        if result["items"] != before["items"]:
+            logger.warning(
+                f"Not comparing {name}: it ran on {result['items']} items, but the baseline ran on {before['items']}."
+            )
+            continue
+        if result["items_per_second"] and before["items_per_second"]:
+            if result["items_per_second"] < before["items_per_second"] * (1 - tolerance):
+                regressions.append(
+                    f"{name}: throughput fell from {before['items_per_second']:.1f} "
+                    + f"to {result['items_per_second']:.1f} items/second."
+                )
+        if result["peak_memory_bytes"] and before["peak_memory_bytes"]:
+            if result["peak_memory_bytes"] > before["peak_memory_bytes"] * (1 + tolerance):
+                regressions.append(
+                    f"{name}: peak memory grew from {before['peak_memory_bytes']} "
+                    + f"to {result['peak_memory_bytes']} bytes."
+                )
+    return regressions
@@ -1,7 +1,8 @@
-from typing import Dict, Set, List, Tuple
+from typing import Dict, Set, List, Optional, Tuple
+import functools
 from RecordLib.crecord import Case
 from RecordLib.petitions import Petition
-from RecordLib.analysis import Analysis
+from RecordLib.analysis import Analysis, Decision
 from RecordLib.analysis.ruledefs import simple_sealing_rules as ssr
 from mako.lookup import TemplateLookup
 from mako.template import Template
@@ -10,23 +11,83 @@ from sendgrid.helpers.mail import Email, To, Content, Mail
 import os
 
 
+@functools.lru_cache(maxsize=None)
+def template_lookup(template_dir: str, module_dir: str) -> TemplateLookup:
+    """
+    The TemplateLookup for email templates in `template_dir`, shared by every EmailBuilder so each template is only
+    compiled once per process.
+    """
+    return TemplateLookup(directories=[template_dir], module_directory=module_dir)
+
+
+class SealingEvaluation:
+    """
+    The sealing decisions about a whole record and its cases that EmailBuilder explains, each worked out once.
+
+    The email template asks about every case, and the whole-record decisions are the same for each of them, so
+    they are remembered after the first time they're needed. The Analysis's charge facts are reused while making
+    the decisions.
+    """
+
+    def __init__(self, analysis: Analysis):
+        self.analysis = analysis
+        self._full_record: Optional[Decision] = None
+        self._ten_years: Optional[Decision] = None
+        # Case decisions, by the id of the case. The case is kept so its id can't be reused.
+        self._cases: Dict[int, Tuple[Case, Decision]] = dict()
+
+    def full_record_requirements(self) -> Decision:
+        if self._full_record is None:
+            with self.analysis.facts.active():
+                self._full_record = ssr.full_record_requirements_for_petition_sealing(
+                    self.analysis.record
+                )
+        return self._full_record
+
+    def ten_years_since_last_conviction(self) -> Decision:
+        if self._ten_years is None:
+            with self.analysis.facts.active():
+                self._ten_years = ssr.ten_years_since_last_conviction_for_m_or_f(
+                    self.analysis.record
+                )
+        return self._ten_years
+
+    def case_sealability(self, case: Case) -> Decision:
+        try:
+            return self._cases[id(case)][1]
+        except KeyError:
+            with self.analysis.facts.active():
+                decision = ssr.petition_sealing_for_single_case(case)
+            self._cases[id(case)] = (case, decision)
+            return decision
+
+
 class EmailBuilder:
     """
     build an email out of an analysis of a criminal record. 
     
     """
 
-    def __init__(self, sources, analysis: Analysis):
+    def __init__(
+        self, sources, analysis: Analysis, evaluation: Optional[SealingEvaluation] = None
+    ):
         """
 
 
         Args:
             analysis: a dictionary representing the results of a clean slate analysis.
+            evaluation: the sealing decisions about the analysis's record, if they've already been worked out.
         """
         self.sourcerecords = sources
         self.analysis = analysis
+        self.evaluation = evaluation or SealingEvaluation(analysis)
         self.counties = None
         self.num_petitions = None
+        # Docket numbers of the cases passed to caseExist, and the petition types of the petitions passed
+        # to petionDetails, by the id of the list they were passed in.
+        self._docket_numbers: Dict[int, Tuple[list, Set[str]]] = dict()
+        self._petition_types: Dict[int, Tuple[list, Dict[str, str]]] = dict()
+        self._unsealable_until: Dict[int, Tuple[Case, Optional[List]]] = dict()
 
     def email(self, to_address):
         """Send an html email"""
@@ -109,18 +170,23 @@ class EmailBuilder:
         pass
 
     def caseExist(self, case, cases) -> bool:
-        result = False;
-        for c in cases:
-            if(c.docket_number == case.docket_number):
-                result = True;
-                break;
-        return result;
+        try:
+            docket_numbers = self._docket_numbers[id(cases)][1]
+        except KeyError:
+            docket_numbers = {c.docket_number for c in cases}
+            self._docket_numbers[id(cases)] = (cases, docket_numbers)
+        return case.docket_number in docket_numbers
+
     def petionDetails(self, case, petitions):
-        for petition_type in petitions:
-            for petition in petition_type.value:
-                if(petition.cases[0].docket_number == case.docket_number):
-                    return petition_type.name
-        return "";
+        try:
+            petition_types = self._petition_types[id(petitions)][1]
+        except KeyError:
+            petition_types = dict()
+            for petition_type in petitions:
+                for petition in petition_type.value:
+                    petition_types.setdefault(petition.cases[0].docket_number, petition_type.name)
+            self._petition_types[id(petitions)] = (petitions, petition_types)
+        return petition_types.get(case.docket_number, "")
 
     def get_unsealable_until_date(self, case) -> List:
         """
@@ -128,8 +194,15 @@ class EmailBuilder:
 
         In other words, charges that are sealble but-for the charge being too recent. 
         """
+        try:
+            return self._unsealable_until[id(case)][1]
+        except KeyError:
+            unsealable_until = self._unsealable_until_date(case)
+            self._unsealable_until[id(case)] = (case, unsealable_until)
+            return unsealable_until
 
-        case_sealability = ssr.petition_sealing_for_single_case(case)
+    def _unsealable_until_date(self, case) -> Optional[List]:
+        case_sealability = self.evaluation.case_sealability(case)
         if case_sealability.value[1] is None:
             # If the [1] position of the value tuple is None, that means nothing in this case is sealable, when we're
             # looking just at the case- and charge-specific requirements.
@@ -137,8 +210,7 @@ class EmailBuilder:
             # the date-of-last-conviction cannot be the only reason the case isn't sealable.
             return None
 
-        crecord = self.analysis.record
-        global_rules = ssr.full_record_requirements_for_petition_sealing(crecord)
+        global_rules = self.evaluation.full_record_requirements()
         if (
             sum(list(map(int, map(bool, global_rules.reasoning))))
             != len(global_rules.reasoning) - 1
@@ -149,7 +221,7 @@ class EmailBuilder:
             # then the date-of-last-conviction cant be the only reason the case isn't sealable.
             return None
 
-        ten_years_decision = ssr.ten_years_since_last_conviction_for_m_or_f(crecord)
+        ten_years_decision = self.evaluation.ten_years_since_last_conviction()
         if bool(ten_years_decision) is True:
             # This record passes the ten years since conviction requirement, so
             # that rule is not what's preventing this case from being sealable.
@@ -186,9 +258,8 @@ class EmailBuilder:
         """
         Return an html-formatted string that describes the analysis.
         """
-        mylookup = TemplateLookup(
-            directories=[os.environ["EMAIL_TEMPLATE_DIR"]],
-            module_directory=os.environ["MAKO_MODULE_DIR"],
+        mylookup = template_lookup(
+            os.environ["EMAIL_TEMPLATE_DIR"], os.environ["MAKO_MODULE_DIR"]
         )
         if len(self.sourcerecords) > 0:
             base_template = mylookup.get_template("found_record.html")
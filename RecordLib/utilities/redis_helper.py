@@ -33,6 +33,18 @@ class RedisHelper:
             obj = ""
         self.r.sadd(key, obj)
 
+    def get(self, key):
+        """ Get the value of a key in this helper's namespace. """
+        if not re.match("^" + self.env + ":", key):
+            key = self.env + ":" + key
+        return self.r.get(key)
+
+    def set(self, key, value, ex=None):
+        """ Set the value of a key in this helper's namespace, optionally expiring after `ex` seconds. """
+        if not re.match("^" + self.env + ":", key):
+            key = self.env + ":" + key
+        self.r.set(key, value, ex=ex)
+
     def sadd_sentence(self, sentence: Sentence) -> None:
         """
         Add a sentence to the redis store
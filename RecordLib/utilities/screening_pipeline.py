@@ -0,0 +1,215 @@
+"""
+Collect and parse the documents of a person's cases, with downloading, text extraction, and parsing
+running at the same time.
+
+Each stage has its own worker threads, and documents move from one stage to the next through queues:
+
+    downloads -> extractions -> parses
+
+The queues into extraction and parsing are bounded, so a fast stage waits for a slow one instead of
+piling up files. When a summary's text is extracted, the docket numbers in it that haven't been seen yet are
+looked up and fed back into the downloads queue right away. (That queue is unbounded, so extraction
+never waits on downloading, which waits on extraction.)
+
+    pipeline = ScreeningPipeline(directory, search_by_docket=search_by_docket)
+    pipeline.run(search_results)
+    pipeline.cases           # every case, in the order they were found
+    pipeline.sourcerecords   # the SourceRecord parsed from each case's docket, by docket number
+"""
+from typing import Callable, Dict, List, Optional, Union
+from dataclasses import dataclass
+import os
+import queue
+import re
+import threading
+import logging
+import requests
+from RecordLib.sourcerecords import SourceRecord
+from RecordLib.sourcerecords.parsingutilities import get_text_from_pdf
+from RecordLib.sourcerecords.docket.re_parse_cp_pdf import parse_cp_pdf_text
+from RecordLib.sourcerecords.docket.re_parse_mdj_pdf import parse_mdj_pdf_text
+
+
+logger = logging.getLogger(__name__)
+
+DOCKET_NUMBER = re.compile(r"(?:MC|CP)\-\d{2}\-\D{2}\-\d*\-\d{4}|MJ-\d{5}-\D{2}-\d+-\d{4}")
+
+
+def pick_pdf_parser(docket_num):
+    if "CP" in docket_num or "MC" in docket_num:
+        parser = parse_cp_pdf_text
+    elif "MJ" in docket_num:
+        parser = parse_mdj_pdf_text
+    else:
+        logger.error(f"   Cannot determine the right parser for: {docket_num}")
+        parser = None
+    return parser
+
+
+@dataclass
+class Document:
+    """ The docket sheet or summary of a case, on its way through the pipeline. """
+
+    case: Dict
+    # "docket_sheet" or "summary"
+    source_type: str
+    path: Optional[str] = None
+    text: str = ""
+
+
+@dataclass
+class Lookup:
+    """ A docket number to look up in the portal, because a summary mentioned it. """
+
+    docket_number: str
+
+
+class ScreeningPipeline:
+    """
+    Download, extract, and parse the documents of a person's cases.
+
+    Args:
+        directory: Where to write downloaded pdfs.
+        search_by_docket: A function that looks up a docket number and returns a list of search results, like
+            `ujs_search.services.searchujs.search_by_docket`.
+        session: The requests session to download with. Its connections are shared by all the download workers.
+        extract_text: The function that extracts the text of a pdf, given its path.
+        download_workers: Number of threads downloading at once.
+        extract_workers: Number of threads extracting text at once.
+        queue_size: The most documents that may wait for extraction, or for parsing.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        search_by_docket: Callable[[str], List[Dict]],
+        session: Optional[requests.Session] = None,
+        extract_text: Callable[[str], str] = get_text_from_pdf,
+        download_workers: int = 8,
+        extract_workers: int = 4,
+        queue_size: int = 8,
+    ):
+        self.directory = directory
+        self.search_by_docket = search_by_docket
+        self.session = session or requests.Session()
+        self.extract_text = extract_text
+        self.download_workers = download_workers
+        self.extract_workers = extract_workers
+        self.downloads = queue.Queue()
+        self.extractions = queue.Queue(maxsize=queue_size)
+        self.parses = queue.Queue(maxsize=queue_size)
+        self.cases = []
+        self.sourcerecords = dict()
+        self._seen = set()
+        # The number of documents and lookups that have entered the pipeline but aren't finished.
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._finished = threading.Condition(self._lock)
+
+    def run(self, search_results: List[Dict]) -> None:
+        """
+        Collect and parse the docket sheet and summary of each case in `search_results`, and the
+        docket sheets of the other cases their summaries mention. Returns when everything is done.
+        """
+        for case in search_results:
+            self._add_case(case, ["docket_sheet", "summary"])
+        stages = [(self.downloads, self._download, self.download_workers)]
+        stages.append((self.extractions, self._extract, self.extract_workers))
+        # sourcerecords is only written by the one parsing thread.
+        stages.append((self.parses, self._parse, 1))
+        threads = []
+        for jobs, handle, count in stages:
+            for _ in range(count):
+                thread = threading.Thread(target=self._work, args=(jobs, handle), daemon=True)
+                thread.start()
+                threads.append((jobs, thread))
+        with self._finished:
+            self._finished.wait_for(lambda: self._pending == 0)
+        for jobs, _ in threads:
+            jobs.put(None)
+        for _, thread in threads:
+            thread.join()
+
+    def _add_case(self, case: Dict, source_types: List[str]) -> None:
+        with self._lock:
+            self._seen.add(case["docket_number"])
+            self.cases.append(case)
+            self._pending += len(source_types)
+        for source_type in source_types:
+            case[f"{source_type}_text"] = ""
+            self.downloads.put(Document(case, source_type))
+
+    def _look_up(self, docket_number: str) -> None:
+        with self._lock:
+            if docket_number in self._seen:
+                return
+            self._seen.add(docket_number)
+            self._pending += 1
+        logger.info(f"    Found {docket_number} in a summary, but not through the portal.")
+        self.downloads.put(Lookup(docket_number))
+
+    def _finish(self) -> None:
+        with self._lock:
+            self._pending -= 1
+            if self._pending == 0:
+                self._finished.notify_all()
+
+    def _work(self, jobs: queue.Queue, handle: Callable) -> None:
+        while True:
+            job = jobs.get()
+            if job is None:
+                return
+            try:
+                handle(job)
+            except Exception as err:
+                logger.error(f"Screening pipeline failed on {job}: {err}")
+                self._finish()
+
+    def _download(self, job: Union[Document, Lookup]) -> None:
+        if isinstance(job, Lookup):
+            cases = self.search_by_docket(job.docket_number)
+            if len(cases) > 0:
+                self._add_case(cases[0], ["docket_sheet"])
+            else:
+                logger.error(f"Did not find case for docket {job.docket_number}")
+            self._finish()
+            return
+        try:
+            resp = self.session.get(
+                job.case[f"{job.source_type}_url"],
+                headers={"User-Agent": "CleanSlateScreener"},
+            )
+        except requests.exceptions.MissingSchema:
+            # the case search results is missing a url. this happens when
+            # a docket doesn't have a summary, and is fairly common.
+            resp = None
+        if resp is None or resp.status_code != 200:
+            self._next_after_extraction(job)
+            return
+        job.path = os.path.join(
+            self.directory, f"{job.case['docket_number']}_{job.source_type}"
+        )
+        with open(job.path, "wb") as fp:
+            fp.write(resp.content)
+        self.extractions.put(job)
+
+    def _extract(self, job: Document) -> None:
+        job.text = self.extract_text(job.path)
+        job.case[f"{job.source_type}_text"] = job.text
+        if job.source_type == "summary":
+            for docket_number in sorted(set(DOCKET_NUMBER.findall(job.text))):
+                self._look_up(docket_number)
+        self._next_after_extraction(job)
+
+    def _next_after_extraction(self, job: Document) -> None:
+        # Every docket gets parsed, even if its text is missing, so each case has a SourceRecord.
+        if job.source_type == "docket_sheet":
+            self.parses.put(job)
+        else:
+            self._finish()
+
+    def _parse(self, job: Document) -> None:
+        parser = pick_pdf_parser(job.case["docket_number"])
+        if parser is not None:
+            self.sourcerecords[job.case["docket_number"]] = SourceRecord(job.text, parser)
+        self._finish()
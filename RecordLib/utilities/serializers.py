@@ -5,7 +5,8 @@ Transform RecordLib objects into json representations.
 
 
 import functools
-from typing import Union
+import json
+from typing import Callable, Dict, Iterator, Union
 from datetime import date, datetime, timedelta
 from lxml import etree
 from lxml.etree import _ElementTree
@@ -17,6 +18,7 @@ from RecordLib.petitions import Expungement, Sealing
 from RecordLib.analysis import Decision
 from RecordLib.crecord import CRecord
 from RecordLib.crecord import Attorney
+from RecordLib.crecord.helpers import attributes
 from RecordLib.sourcerecords import Docket, Summary, SourceRecord
 
 
@@ -85,7 +87,7 @@ def ts_sourcerecord(sr):
 @to_serializable.register(Address)
 def ts_object(an_object):
     return {
-        k: to_serializable(v) for k, v in an_object.__dict__.items() if v is not None
+        k: to_serializable(v) for k, v in attributes(an_object) if v is not None
     }
     # return {k: to_serializable(v) for k, v in an_object.__dict__.items()}
 
@@ -110,3 +112,93 @@ def ts_sentencelength(sentence_length):
         "max_unit": "days",
     }
 
+
+
+# A faster path to the same json as `to_serializable`, for large payloads like an Analysis.
+#
+# `to_serializable` dispatches on the type of every value it meets. `serialize` looks up how to encode each class
+# once, and remembers it. With `refs=True`, a Case or Charge that appears more than once in the payload, as they do
+# throughout the Decisions of an Analysis, is written in full only the first time, with an "$id". After that,
+# it is written as {"$ref": <that id>}.
+
+CHUNK_SIZE = 64 * 1024
+
+REFERENCED_CLASSES = (Case, Charge)
+
+
+class Serialization:
+    """ The state of serializing one payload. """
+
+    def __init__(self, refs: bool = False):
+        self.refs = refs
+        self.ids: Dict[int, int] = dict()
+
+    def value(self, val):
+        cls = type(val)
+        if cls is str:
+            return val
+        return encoder_for(cls)(self, val)
+
+    def object(self, an_object) -> dict:
+        if self.refs and isinstance(an_object, REFERENCED_CLASSES):
+            key = id(an_object)
+            if key in self.ids:
+                return {"$ref": self.ids[key]}
+            self.ids[key] = len(self.ids) + 1
+            serialized = {"$id": self.ids[key]}
+        else:
+            serialized = dict()
+        for k, v in attributes(an_object):
+            if v is not None:
+                serialized[k] = self.value(v)
+        return serialized
+
+    def list(self, a_list) -> list:
+        return [self.value(el) for el in a_list]
+
+
+_encoders: Dict[type, Callable[[Serialization, object], object]] = dict()
+
+
+def encoder_for(cls: type) -> Callable[[Serialization, object], object]:
+    """ How to serialize instances of `cls`, worked out from the implementations registered with `to_serializable`. """
+    try:
+        return _encoders[cls]
+    except KeyError:
+        impl = to_serializable.dispatch(cls)
+        if impl is ts_object:
+            encoder = Serialization.object
+        elif impl is ts_list:
+            encoder = Serialization.list
+        else:
+            encoder = lambda serialization, val: impl(val)
+        _encoders[cls] = encoder
+        return encoder
+
+
+def serialize(val, refs: bool = False):
+    """ The same as `to_serializable(val)`, or with `refs`, the same but with repeated Cases and Charges as references. """
+    return Serialization(refs).value(val)
+
+
+def dump_json(val, refs: bool = False) -> bytes:
+    """ Serialize `val` straight to compact json bytes. """
+    return json.dumps(
+        serialize(val, refs), separators=(",", ":"), check_circular=False
+    ).encode("utf-8")
+
+
+def stream_json(val, refs: bool = False, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    """ Serialize `val` to compact json, yielding chunks of about `chunk_size` bytes, for a streaming response. """
+    encoder = json.JSONEncoder(separators=(",", ":"), check_circular=False)
+    pieces = []
+    size = 0
+    for piece in encoder.iterencode(serialize(val, refs)):
+        pieces.append(piece)
+        size += len(piece)
+        if size >= chunk_size:
+            yield "".join(pieces).encode("utf-8")
+            pieces = []
+            size = 0
+    if pieces:
+        yield "".join(pieces).encode("utf-8")
@@ -0,0 +1,328 @@
+"""
+Synthetic documents, for exercising the parsers and analysis on inputs of any size.
+
+The texts here imitate what `pdftotext -layout` makes of real dockets and summaries, closely
+enough for the parsers to read them. They're for benchmarks and tests, not for checking that the
+parsers handle every quirk of real documents.
+
+Docket numbers come from `RecordLib.utilities.number_generator`, so seed `random` first to get
+the same documents every time.
+"""
+from typing import List
+from datetime import date
+import io
+import random
+from docx import Document
+from RecordLib.crecord import CRecord, Person, Case, Charge, Sentence, SentenceLength
+from RecordLib.utilities.number_generator import create_docket_numbers
+
+
+OFFENSES = [
+    ("18 § 2701 §§ A1", "M2", "Simple Assault"),
+    ("18 § 3921 §§ A", "F3", "Theft By Unlaw Taking-Movable Prop"),
+    ("35 § 780-113 §§ A16", "M", "Int Poss Contr Subst By Per Not Reg"),
+    ("18 § 5503 §§ A1", "S", "Disorderly Conduct Engage In Fighting"),
+    ("75 § 3802 §§ A1", "M", "DUI: Gen Imp/Inc of Driving Safely"),
+]
+
+DISPOSITIONS = ["Guilty Plea", "Nolle Prossed", "Withdrawn", "Guilty", "Not Guilty"]
+
+
+def docket_number(court: str) -> str:
+    return next(create_docket_numbers(court))
+
+
+def cp_docket_text(n_charges: int = 3) -> str:
+    """
+    The text of a one-page Common Pleas docket with `n_charges` charges.
+    """
+    number = docket_number("CP")
+    lines = [
+        "                             COURT OF COMMON PLEAS OF PHILADELPHIA COUNTY",
+        f"                                                                  Docket Number: {number}",
+        "                                    DOCKET                                    CRIMINAL DOCKET",
+        "                                                      Commonwealth of Pennsylvania",
+        "                                                                     v.",
+        "                                                                John Doe",
+        "                                                      CASE INFORMATION",
+        "Judge Assigned: Smith, Jane                    Date Filed: 01/02/2010      Initiation Date: 01/01/2010",
+        "OTN: N 123456-1           LOTN:                Originating Docket No:",
+        "Initial Issuing Authority: Bob Jones                 Final Issuing Authority: Jane Smith",
+        "Arresting Agency: Philadelphia Pd                    Arresting Officer: Officer, Joe",
+        "Complaint/Citation No.:                              Incident Number: 123456",
+        "County: Philadelphia                                 Township: Philadelphia",
+        "District Control Number                              201012345",
+        "                                                      STATUS INFORMATION",
+        "Case Status:       Closed        Status Date   Processing Status        Arrest Date:     01/01/2010",
+        "                                 05/05/2011    Completed",
+        "Complaint Date:  01/01/2010",
+        "                                                     DEFENDANT INFORMATION",
+        "Date Of Birth:            01/01/1980             City/State/Zip: Philadelphia, PA 19100",
+        "Alias Name",
+        "Doe, John",
+        "Doe, Johnny",
+        "                                                      CASE PARTICIPANTS",
+        "Participant Type                                      Name",
+        "Defendant                                             Doe, John",
+        "                                                      CHARGES",
+        "Seq.    Orig Seq.   Grade    Statute                    Statute Description                          Offense Dt.      OTN",
+    ]
+    for seq in range(1, n_charges + 1):
+        statute, grade, offense = OFFENSES[seq % len(OFFENSES)]
+        lines.append(
+            f"{seq:<8}{seq:<12}{grade:<9}{statute:<27}{offense:<45}01/01/2010       N 123456-1"
+        )
+    lines.extend(
+        [
+            "                                          DISPOSITION SENTENCING/PENALTIES",
+            "Disposition",
+            "  Case Event                                            Disposition Date                    Final Disposition",
+            "    Sequence/Description                                                        Offense Disposition                                     Grade    Section",
+            "Trial                                                   05/05/2011                           Final Disposition",
+        ]
+    )
+    for seq in range(1, n_charges + 1):
+        statute, grade, offense = OFFENSES[seq % len(OFFENSES)]
+        disposition = DISPOSITIONS[seq % len(DISPOSITIONS)]
+        lines.append(
+            f"   {seq % 10} / {offense:<50}              {disposition:<40}  {grade:<8} {statute}"
+        )
+        lines.append(
+            "         Smith, Jane                                                        05/05/2011"
+        )
+    lines.extend(
+        [
+            "                                                 CASE FINANCIAL INFORMATION",
+            "                     Totals:          $1,234.50              -$234.50              $0.00              $0.00              $1,000.00",
+            "",
+            "CPCMS 9082                                                                                         Printed: 01/01/2020",
+            "\f",
+        ]
+    )
+    return "\n".join(lines)
+
+
+def mdj_docket_text(n_charges: int = 3) -> str:
+    """
+    The text of a one-page Magisterial District Court docket with `n_charges` charges.
+    """
+    number = docket_number("MDJ")
+    lines = [
+        "                     MAGISTERIAL DISTRICT JUDGE 05-2-01",
+        "                                   DOCKET",
+        f"                                                     Docket Number: {number}",
+        "                                                                 Criminal Docket",
+        "                            Commonwealth of Pennsylvania",
+        "                                          v.",
+        "                                      John Doe",
+        "                                               CASE INFORMATION",
+        "Judge Assigned: Magisterial District Judge Jane Smith        Issue Date:     01/02/2015",
+        "OTN: T 123456-1              File Date:     01/02/2015",
+        "Arresting Agency: Pittsburgh Police         Arrest Date:     01/01/2015",
+        "County: Allegheny             Disposition Date:   03/03/2015",
+        "District Control Number  123456789",
+        "Final Issuing Authority: Jane Smith",
+        "                                               DEFENDANT INFORMATION",
+        "Date Of Birth:   01/01/1980        City/State/Zip: Pittsburgh, PA 15222",
+        "Alias Name",
+        "Doe, Johnny",
+        "                                               CASE PARTICIPANTS",
+        "Participant Type    Participant Name",
+        "Defendant           Doe, John",
+        "                                               CHARGES",
+    ]
+    for seq in range(1, n_charges + 1):
+        statute, grade, offense = OFFENSES[seq % len(OFFENSES)]
+        disposition = DISPOSITIONS[seq % len(DISPOSITIONS)]
+        lines.append(
+            f"  {seq % 10}   {statute:<24} {grade:<7}  {offense:<40}   01/01/2015    {disposition}"
+        )
+    lines.extend(
+        [
+            "Totals:   $100.00   $50.00   $0.00   $0.00   $50.00",
+            "MDJS 1200                                          Page 1 of 1",
+            "\f",
+        ]
+    )
+    return "\n".join(lines)
+
+
+def cp_summary_text(n_cases: int = 3, charges_per_case: int = 2) -> str:
+    """
+    The text of a one-page Common Pleas court summary, listing `n_cases` closed cases.
+    """
+    lines = [
+        "                     COURT OF COMMON PLEAS OF PHILADELPHIA COUNTY",
+        "                                  Court Summary",
+        "",
+        "Doe, John    DOB: 01/01/1980    Sex: Male",
+        "   123 Main St Philadelphia, PA 19100    Eyes: Brown",
+        "Aliases:    Hair: Black",
+        "Doe, Johnny    Race: White",
+        "Doe, J.",
+        "",
+        "Closed",
+        "Philadelphia",
+    ]
+    for _ in range(n_cases):
+        lines.extend(
+            [
+                f"  {docket_number('CP')}  Proc Status: Completed  DC No: 201012345  OTN: N1234567",
+                "     Arrest Dt: 01/01/2010  Disp Date: 05/05/2011  Disp Judge: Smith, Jane",
+                "     Def Atty: Public Defender",
+                "        Seq No    Statute    Grade    Description    Disposition",
+                "            Sentence Dt.    Sentence Type    Program Period    Sentence Length",
+            ]
+        )
+        for seq in range(1, charges_per_case + 1):
+            statute, grade, offense = OFFENSES[seq % len(OFFENSES)]
+            disposition = DISPOSITIONS[seq % len(DISPOSITIONS)]
+            lines.extend(
+                [
+                    f"        {seq}    {statute}  {grade}  {offense}    {disposition}",
+                    "            06/06/2011  Probation    Max of 2.00 Years",
+                ]
+            )
+    lines.extend(
+        [
+            "",
+            "CPCMS 3541                                              Printed: 01/01/2020",
+            "   Recent entries made in the court filing offices may not be immediately reflected.",
+            "\f",
+        ]
+    )
+    return "\n".join(lines)
+
+
+def crecord(n_cases: int = 3, charges_per_case: int = 2) -> CRecord:
+    """
+    A CRecord with `n_cases` cases, each with `charges_per_case` charges of different grades and
+    dispositions.
+    """
+    person = Person(
+        first_name="John",
+        last_name="Doe",
+        date_of_birth=date(1980, 1, 1),
+        aliases=["Doe, Johnny"],
+    )
+    cases = []
+    for case_num in range(n_cases):
+        charges = []
+        for seq in range(1, charges_per_case + 1):
+            statute, grade, offense = OFFENSES[(case_num + seq) % len(OFFENSES)]
+            charges.append(
+                Charge(
+                    offense,
+                    grade,
+                    statute,
+                    DISPOSITIONS[(case_num + seq) % len(DISPOSITIONS)],
+                    disposition_date=date(2011, 5, 5),
+                    sentences=[
+                        Sentence(
+                            sentence_date=date(2011, 6, 6),
+                            sentence_type="Probation",
+                            sentence_period="",
+                            sentence_length=SentenceLength.from_tuples(
+                                min_time=("1", "Year"), max_time=("2", "Year")
+                            ),
+                        )
+                    ],
+                )
+            )
+        cases.append(
+            Case(
+                status="Closed",
+                county="Philadelphia",
+                docket_number=docket_number(random.choice(["CP", "MDJ"])),
+                otn="N 123456-1",
+                dc="201012345",
+                charges=charges,
+                total_fines=100,
+                fines_paid=100,
+                arrest_date=date(2010, 1, 1),
+                disposition_date=date(2011, 5, 5),
+                judge="Jane Smith",
+            )
+        )
+    return CRecord(person=person, cases=cases)
+
+
+def petition_template() -> io.BytesIO:
+    """
+    A docx template that uses the same context variables as the real petition templates.
+    """
+    document = Document()
+    document.add_paragraph("{{ petition_type }} petition for {{ client.first_name }} {{ client.last_name }}")
+    document.add_paragraph("Dated {{ date }}. Dispositions: {{ disposition_list }}")
+    document.add_paragraph("{% for case in cases %}")
+    document.add_paragraph(
+        "{{ case.docket_number }} in {{ case.county }}, before {{ case.judge }}"
+    )
+    document.add_paragraph("{% for charge in case.charges %}")
+    document.add_paragraph(
+        "{{ charge.statute }} {{ charge.offense }} ({{ charge.grade }}): {{ charge.disposition }}"
+    )
+    document.add_paragraph("{% endfor %}")
+    document.add_paragraph("{% endfor %}")
+    template = io.BytesIO()
+    document.save(template)
+    template.seek(0)
+    return template
+
+
+def pdf_from_text(text: str) -> bytes:
+    """
+    A minimal pdf that shows `text` in a fixed-width font, one pdf page per form-feed separated page.
+    """
+    pages = [page for page in text.split("\f") if page.strip() != ""] or [""]
+    objects: List[bytes] = []
+
+    def add(obj: bytes) -> int:
+        objects.append(obj)
+        return len(objects)
+
+    catalog = add(b"")
+    page_tree = add(b"")
+    font = add(
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Courier /Encoding /WinAnsiEncoding >>"
+    )
+    page_ids = []
+    for page in pages:
+        stream = [b"BT /F1 6 Tf 7 TL 10 780 Td"]
+        for line in page.split("\n"):
+            escaped = (
+                line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+            )
+            stream.append(b"(" + escaped.encode("cp1252", errors="replace") + b") '")
+        stream.append(b"ET")
+        content = b"\n".join(stream)
+        contents = add(
+            b"<< /Length %d >>\nstream\n" % len(content) + content + b"\nendstream"
+        )
+        page_ids.append(
+            add(
+                b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 612 792] " % page_tree
+                + b"/Resources << /Font << /F1 %d 0 R >> >> /Contents %d 0 R >>"
+                % (font, contents)
+            )
+        )
+    objects[catalog - 1] = b"<< /Type /Catalog /Pages %d 0 R >>" % page_tree
+    objects[page_tree - 1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (
+        b" ".join(b"%d 0 R" % page_id for page_id in page_ids),
+        len(page_ids),
+    )
+    pdf = io.BytesIO()
+    pdf.write(b"%PDF-1.4\n")
+    offsets = []
+    for number, obj in enumerate(objects, start=1):
+        offsets.append(pdf.tell())
+        pdf.write(b"%d 0 obj\n" % number + obj + b"\nendobj\n")
+    xref = pdf.tell()
+    pdf.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+    for offset in offsets:
+        pdf.write(b"%010d 00000 n \n" % offset)
+    pdf.write(
+        b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n"
+        % (len(objects) + 1, catalog, xref)
+    )
+    return pdf.getvalue()
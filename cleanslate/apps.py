@@ -1,5 +1,20 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_save, post_delete
+
+
+def invalidate_petition_template(sender, instance, **kwargs):
+    from cleanslate.services.petition_templates import petition_templates
+
+    petition_templates.invalidate(instance)
 
 
 class CleanslateConfig(AppConfig):
     name = 'cleanslate'
+
+    def ready(self):
+        # Parsed petition templates are cached, so a changed or deleted template has to be parsed again.
+        from cleanslate.models import ExpungementPetitionTemplate, SealingPetitionTemplate
+
+        for model in [ExpungementPetitionTemplate, SealingPetitionTemplate]:
+            post_save.connect(invalidate_petition_template, sender=model)
+            post_delete.connect(invalidate_petition_template, sender=model)
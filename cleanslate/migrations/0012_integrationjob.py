@@ -0,0 +1,30 @@
+# Generated by Django 2.2.13 on 2026-10-17 05:12
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('cleanslate', '0011_sourcerecord_raw_text'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IntegrationJob',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('status', models.CharField(choices=[('QUEUED', 'QUEUED'), ('RUNNING', 'RUNNING'), ('FINISHED', 'FINISHED'), ('FAILED', 'FAILED')], default='QUEUED', max_length=20)),
+                ('crecord', models.TextField()),
+                ('errors', models.TextField(default='[]')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('owner', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+                ('source_records', models.ManyToManyField(blank=True, to='cleanslate.SourceRecord')),
+            ],
+        ),
+    ]
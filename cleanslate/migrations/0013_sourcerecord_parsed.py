@@ -0,0 +1,23 @@
+# Generated by Django 2.2.13 on 2026-10-17 05:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cleanslate', '0012_integrationjob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='sourcerecord',
+            name='parsed',
+            field=models.TextField(null=True),
+        ),
+        migrations.AddField(
+            model_name='sourcerecord',
+            name='parser_version',
+            field=models.CharField(blank=True, default='', max_length=300),
+        ),
+    ]
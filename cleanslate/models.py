@@ -1,6 +1,8 @@
 from __future__ import annotations
 import uuid
+import hashlib
 import re
+import json
 import logging
 from typing import Optional
 from dataclasses import dataclass, asdict
@@ -8,7 +10,11 @@ from django.db import models
 from django.contrib.auth.models import User
 from django.core.files.uploadedfile import InMemoryUploadedFile
 from django.db.models.signals import post_save
+from RecordLib.crecord import Person, Case
+from RecordLib.sourcerecords import SourceRecord as RLSourceRecord
+from RecordLib.sourcerecords.sourcerecord import parser_version
 from RecordLib.sourcerecords.parsingutilities import get_text_from_pdf
+from RecordLib.utilities.serializers import to_serializable
 from RecordLib.sourcerecords.docket.re_parse_pdf import (
     re_parse_pdf as docket_pdf_parser,
     re_parse_pdf_text as docket_text_parser,
@@ -338,3 +344,106 @@ class SourceRecord(models.Model):
     owner = models.ForeignKey(User, on_delete=models.CASCADE)
 
     raw_text = models.TextField(null=True)
+
+    # json of the person, cases, and errors that parsing this record produced, so the record doesn't
+    # need parsing again. Only valid while `parser_version` matches the current parser and the
+    # record's current text or file.
+    parsed = models.TextField(null=True)
+
+    parser_version = models.CharField(max_length=300, blank=True, default="")
+
+    def input_digest(self) -> str:
+        """ A hash of the text or file that parsing this record would read. """
+        digest = hashlib.sha256()
+        if self.raw_text:
+            digest.update(self.raw_text.encode("utf-8"))
+        else:
+            with open(self.file.path, "rb") as f:
+                for chunk in iter(lambda: f.read(64 * 1024), b""):
+                    digest.update(chunk)
+        return digest.hexdigest()[:16]
+
+    def parse(self) -> RLSourceRecord:
+        """
+        Parse this record, or load the results of parsing it before, if neither the parser nor the
+        record's text or file has changed since.
+
+        A new parse result is stored on this object, but not saved to the database.
+        """
+        parser = self.get_parser()
+        src = self.raw_text or self.file.path
+        version = f"{parser_version(parser)}:{self.input_digest()}"
+        if self.parsed is not None and self.parser_version == version:
+            try:
+                stored = json.loads(self.parsed)
+                return RLSourceRecord.from_parsed(
+                    src,
+                    person=Person.from_dict(stored["person"])
+                    if stored["person"] is not None
+                    else None,
+                    cases=[Case.from_dict(c) for c in stored["cases"]],
+                    errors=stored["errors"],
+                    parser=parser,
+                )
+            except Exception as err:
+                logger.warning("Could not load stored parse of %s: %s", self.id, err)
+        rlsource = RLSourceRecord(src, parser=parser)
+        self.parsed = json.dumps(
+            {
+                "person": to_serializable(rlsource.person)
+                if rlsource.person is not None
+                else None,
+                "cases": to_serializable(rlsource.cases),
+                "errors": to_serializable(rlsource.errors or []),
+            }
+        )
+        self.parser_version = version
+        return rlsource
+
+
+class IntegrationJob(models.Model):
+    """
+    A request to integrate source records with a crecord, running in the background.
+
+    The job starts with the crecord that was sent, and `crecord` is updated each time another source record is
+    parsed and integrated, so someone polling the job can show the record as it is built. Each source record's own
+    `fetch_status` and `parse_status` tell how far along it is.
+    """
+
+    class Statuses:
+        """ Where a job is in its life. """
+
+        QUEUED = "QUEUED"
+        RUNNING = "RUNNING"
+        FINISHED = "FINISHED"
+        FAILED = "FAILED"
+        __choices__ = [
+            ("QUEUED", "QUEUED"),
+            ("RUNNING", "RUNNING"),
+            ("FINISHED", "FINISHED"),
+            ("FAILED", "FAILED"),
+        ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+
+    owner = models.ForeignKey(User, on_delete=models.CASCADE)
+
+    status = models.CharField(
+        max_length=20, choices=Statuses.__choices__, default=Statuses.QUEUED
+    )
+
+    # json of a CRecord, as serialized by cleanslate.serializers.CRecordSerializer.
+    crecord = models.TextField()
+
+    source_records = models.ManyToManyField(SourceRecord, blank=True)
+
+    # json list of messages about source records that couldn't be integrated.
+    errors = models.TextField(default="[]")
+
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    @property
+    def done(self) -> bool:
+        return self.status in [self.Statuses.FINISHED, self.Statuses.FAILED]
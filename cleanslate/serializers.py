@@ -4,7 +4,8 @@ Serialize models for the RecordLib web app.
 """
 
 from rest_framework import serializers as S
-from cleanslate.models import UserProfile, SourceRecord
+from cleanslate.models import UserProfile, SourceRecord, IntegrationJob
+import json
 from django.contrib.auth.models import User
 from RecordLib.crecord import CRecord
 from RecordLib.crecord import Case
@@ -179,6 +180,9 @@ class SourceRecordSerializer(S.ModelSerializer):
         exclude = [
             "owner",  # only the database knows who owns what files
             "file",
+            # stored parse results are only for the server's use.
+            "parsed",
+            "parser_version",
         ]  # the file itself isn't sent back and forth as a SourceRecord. The SourceRecord is a pointer to a file in the server.
 
     id = S.UUIDField(format="hex_verbose", required=False)
@@ -207,3 +211,31 @@ class DownloadDocsSerializer(S.Serializer):
             for rec in validated_data["source_records"]
         ]
 
+
+
+class IntegrationJobSerializer(S.ModelSerializer):
+    """
+    Serialize the progress of an IntegrationJob: its status, the crecord so far, its source records, and errors.
+    """
+
+    class Meta:
+        model = IntegrationJob
+        fields = [
+            "id",
+            "status",
+            "crecord",
+            "source_records",
+            "errors",
+            "created_at",
+            "updated_at",
+        ]
+
+    crecord = S.SerializerMethodField()
+    source_records = SourceRecordSerializer(many=True, read_only=True)
+    errors = S.SerializerMethodField()
+
+    def get_crecord(self, job):
+        return json.loads(job.crecord)
+
+    def get_errors(self, job):
+        return json.loads(job.errors)
@@ -1,41 +1,30 @@
 from datetime import datetime
 from cleanslate.models import SourceRecord
-from typing import List
-import requests
-from django.core.files.base import ContentFile
+from typing import List, Optional
 from ujs_search.services import searchujs
+from cleanslate.services.fetch import fetch_source_records, Transport
 import logging
-import urllib3
 
-requests.packages.urllib3.util.ssl_.DEFAULT_CIPHERS += "HIGH:!DH:!aNULL"
 logger = logging.getLogger(__name__)
 
 
-def source_records(records: List[SourceRecord]) -> None:
+def source_records(
+    records: List[SourceRecord], transport: Optional[Transport] = None
+) -> None:
     """ Download the source records in a list of source records, if they're not already present. 
-    
-    TODO: fetch these urls asynchronously.
+
+    The downloads happen concurrently. See `cleanslate.services.fetch`.
     """
-    for rec in records:
-        if rec.file._file is None:
-            resp = requests.get(
-                rec.url, headers={"User-Agent": "ExpungmentGeneratorTesting"}
-            )
-            if resp.status_code == 200:
-                rec.file.save(f"{rec.id}.pdf", ContentFile(resp.content))
-                rec.fetch_status = SourceRecord.FetchStatuses.FETCHED
-                rec.save()
-            else:
-                rec.fetch_status = SourceRecord.FetchStatuses.FETCH_FAILED
-                rec.save()
+    fetch_source_records(records, transport=transport)
 
 
-def dockets(docket_nums: List[str], owner: "User") -> [SourceRecord]:
+def dockets(
+    docket_nums: List[str], owner: "User", transport: Optional[Transport] = None
+) -> [SourceRecord]:
     """
     Download the dockets in `docket_nums` and create SourceRecords for them.
     
     Return the list of newly generated source records.
-    TODO do this asynchronously.
     """
     new_source_records = []
     for docket_number in docket_nums:
@@ -52,6 +41,6 @@ def dockets(docket_nums: List[str], owner: "User") -> [SourceRecord]:
         except Exception as err:
             logger.error("Downloading docket %s failed: %s", docket_number, str(err))
     # download all these new source records.
-    source_records(new_source_records)
+    source_records(new_source_records, transport=transport)
     return new_source_records
 
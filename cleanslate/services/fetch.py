@@ -0,0 +1,230 @@
+"""
+Fetch the documents that SourceRecords point to, concurrently.
+
+All the downloads in a call to `fetch_source_records` share one pool of keep-alive connections,
+with a limit on how many connections go to any one host, so that a summary that names dozens
+of cases doesn't wait on each docket in turn, and the UJS portal isn't flooded either. Failed
+requests are retried with exponential backoff. Each response is streamed to a temporary file
+in chunks, and then saved to the SourceRecord's `file`.
+
+Where the requests actually go is up to a `Transport`. The default, `AiohttpTransport`, sends
+them to the urls of the records, or to a different server, such as a local stub standing in for
+the portal in tests, if it is given a `base_url`.
+
+The limits can be set with environment variables:
+
+    FETCH_CONNECTIONS_PER_HOST (default 4)
+    FETCH_MAX_CONNECTIONS (default 16)
+    FETCH_RETRIES (default 3)
+    FETCH_TIMEOUT_SECONDS (default 60)
+"""
+from __future__ import annotations
+from typing import AsyncIterator, Dict, Iterable, List, Optional, Tuple
+from dataclasses import dataclass
+from contextlib import asynccontextmanager
+from tempfile import SpooledTemporaryFile
+from urllib.parse import urlsplit, urlunsplit
+import asyncio
+import os
+import ssl
+import logging
+import aiohttp
+from django.core.files import File
+from cleanslate.models import SourceRecord
+
+
+logger = logging.getLogger(__name__)
+
+HEADERS = {"User-Agent": "ExpungmentGeneratorTesting"}
+
+CHUNK_SIZE = 64 * 1024
+
+# Responses bigger than this are spooled to disk rather than held in memory.
+MAX_IN_MEMORY = 1024 * 1024
+
+
+class RetryableStatus(Exception):
+    """ The server answered with a status that might not happen if we ask again. """
+
+
+@dataclass
+class FetchSettings:
+    """
+    Limits on how documents get fetched.
+
+    Args:
+        connections_per_host: The most connections open to any one host at once.
+        max_connections: The most connections open at once, to all hosts together.
+        retries: How many times to retry a request that failed with a connection error, a timeout,
+            or a 429 or 5xx status.
+        backoff: Seconds to wait before the first retry. The wait doubles after each one.
+        timeout: Seconds to wait for a connection to a server, or for the next chunk of a response. Time spent
+            waiting for a free connection in the pool doesn't count.
+    """
+
+    connections_per_host: int = 4
+    max_connections: int = 16
+    retries: int = 3
+    backoff: float = 0.5
+    timeout: float = 60
+
+    @classmethod
+    def from_environment(cls) -> FetchSettings:
+        return cls(
+            connections_per_host=int(os.environ.get("FETCH_CONNECTIONS_PER_HOST", 4)),
+            max_connections=int(os.environ.get("FETCH_MAX_CONNECTIONS", 16)),
+            retries=int(os.environ.get("FETCH_RETRIES", 3)),
+            timeout=float(os.environ.get("FETCH_TIMEOUT_SECONDS", 60)),
+        )
+
+
+class Transport:
+    """
+    Sends the requests for documents.
+
+    Subclasses implement `open`, `close`, and `get`.
+    """
+
+    async def open(self, settings: FetchSettings) -> None:
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        raise NotImplementedError
+
+    def get(self, url: str):
+        """
+        An async context manager that makes a GET request for `url`, and yields a
+        tuple of the response's status and an async iterator over chunks of its body.
+        """
+        raise NotImplementedError
+
+
+class AiohttpTransport(Transport):
+    """
+    Send requests through an aiohttp session with a shared pool of keep-alive connections.
+
+    Args:
+        base_url: If given, send every request to this scheme and host instead of the one in the
+            record's url, keeping the path and query. Useful for pointing at a local stub server.
+    """
+
+    def __init__(self, base_url: Optional[str] = None):
+        self.base_url = base_url
+        self.session = None
+
+    def ssl_context(self) -> ssl.SSLContext:
+        # The UJS portal needs ciphers that aren't in python's default set.
+        context = ssl.create_default_context()
+        context.set_ciphers("DEFAULT:HIGH:!DH:!aNULL")
+        return context
+
+    async def open(self, settings: FetchSettings) -> None:
+        connector = aiohttp.TCPConnector(
+            limit=settings.max_connections,
+            limit_per_host=settings.connections_per_host,
+            ssl=self.ssl_context(),
+        )
+        self.session = aiohttp.ClientSession(
+            connector=connector,
+            headers=HEADERS,
+            timeout=aiohttp.ClientTimeout(
+                total=None, sock_connect=settings.timeout, sock_read=settings.timeout
+            ),
+        )
+
+    async def close(self) -> None:
+        await self.session.close()
+
+    def target(self, url: str) -> str:
+        if self.base_url is None:
+            return url
+        base = urlsplit(self.base_url)
+        return urlunsplit(urlsplit(url)._replace(scheme=base.scheme, netloc=base.netloc))
+
+    @asynccontextmanager
+    async def get(self, url: str) -> AsyncIterator[Tuple[int, AsyncIterator[bytes]]]:
+        async with self.session.get(self.target(url)) as resp:
+            yield resp.status, resp.content.iter_chunked(CHUNK_SIZE)
+
+
+async def fetch_to_file(
+    url: str, transport: Transport, settings: FetchSettings
+) -> Tuple[int, Optional[SpooledTemporaryFile]]:
+    """
+    Download a url into a temporary file, retrying failures.
+
+    Returns:
+        The final status of the response, and the file with its body if the status was 200. The status is 0
+        if no response ever came back.
+    """
+    status = 0
+    for attempt in range(settings.retries + 1):
+        if attempt > 0:
+            await asyncio.sleep(settings.backoff * 2 ** (attempt - 1))
+        try:
+            async with transport.get(url) as (status, chunks):
+                if status == 429 or status >= 500:
+                    raise RetryableStatus(status)
+                if status != 200:
+                    return status, None
+                body = SpooledTemporaryFile(max_size=MAX_IN_MEMORY)
+                try:
+                    async for chunk in chunks:
+                        body.write(chunk)
+                    body.seek(0)
+                except BaseException:
+                    # A download that fails part way leaves nothing open, whether it's retried or not.
+                    body.close()
+                    raise
+                return status, body
+        except (aiohttp.ClientError, asyncio.TimeoutError, RetryableStatus) as err:
+            logger.warning(
+                "Fetching %s failed on attempt %d: %s", url, attempt + 1, repr(err)
+            )
+    return status, None
+
+
+async def fetch_all(
+    urls: List[str], transport: Transport, settings: FetchSettings
+) -> List[Tuple[int, Optional[SpooledTemporaryFile]]]:
+    """ Download the urls concurrently, through one transport. """
+    await transport.open(settings)
+    try:
+        return await asyncio.gather(
+            *[fetch_to_file(url, transport, settings) for url in urls]
+        )
+    finally:
+        await transport.close()
+
+
+def fetch_source_records(
+    records: Iterable[SourceRecord],
+    transport: Optional[Transport] = None,
+    settings: Optional[FetchSettings] = None,
+) -> None:
+    """
+    Download the documents of source records that don't have a file yet, and save them to the records.
+
+    Records whose document can't be fetched get the fetch status FETCH_FAILED.
+    """
+    # the same record may be in the list more than once, but it only needs downloading once.
+    missing: Dict[str, SourceRecord] = dict()
+    for rec in records:
+        if rec.file._file is None and rec.pk not in missing:
+            missing[rec.pk] = rec
+    if len(missing) == 0:
+        return
+    transport = transport or AiohttpTransport()
+    settings = settings or FetchSettings.from_environment()
+    recs = list(missing.values())
+    # Records are saved after the event loop is done, so that the database is only used from this thread.
+    results = asyncio.run(fetch_all([rec.url for rec in recs], transport, settings))
+    for rec, (status, body) in zip(recs, results):
+        if body is not None:
+            with body:
+                rec.file.save(f"{rec.id}.pdf", File(body), save=False)
+            rec.fetch_status = SourceRecord.FetchStatuses.FETCHED
+        else:
+            logger.error("Could not fetch %s, last status %d", rec.url, status)
+            rec.fetch_status = SourceRecord.FetchStatuses.FETCH_FAILED
+        rec.save()
@@ -0,0 +1,216 @@
+"""
+Parse source records and integrate the information in them into a crecord.
+
+`integrate_sources` does the whole job at once, for the IntegrateCRecordWithSources view. `run_integration_job`
+does the same work for an IntegrationJob in a django-q worker, saving the partly built crecord after each source
+record so that the IntegrationJobView can report progress.
+"""
+from typing import Callable, Dict, List, Optional, Tuple
+import json
+import logging
+from RecordLib.crecord import CRecord
+from cleanslate.models import SourceRecord, IntegrationJob
+from cleanslate.serializers import CRecordSerializer
+from cleanslate.services import download as download_service
+
+logger = logging.getLogger(__name__)
+
+
+# Called after each source record is parsed, with the crecord so far, every source record so far,
+# and the errors so far.
+Progress = Callable[[CRecord, List[SourceRecord], List[str]], None]
+
+
+def integrate_dockets(
+    crecord: CRecord,
+    docket_source_records: List[SourceRecord],
+    nonfatal_errors: List[str],
+    progress: Optional[Callable[[CRecord, List[str]], None]] = None,
+) -> Tuple[CRecord, List[str]]:
+    """ Combine a set of source records representing 'dockets' with a criminal record"""
+    for docket_source_record in docket_source_records:
+        try:
+            # get a RecordLib SourceRecord from the webapp sourcerecord model. The RecordLib SourceRecord has the machinery for
+            # parsing the record to get a Person and Cases out of it. If the record was parsed before, the stored
+            # result is used instead.
+            rlsource = docket_source_record.parse()
+            # If we reach this line, the parse succeeded.
+            docket_source_record.parse_status = SourceRecord.ParseStatuses.SUCCESS
+            # Integrate this docket with the full crecord.
+            crecord.add_sourcerecord(
+                rlsource,
+                case_merge_strategy="overwrite_old",
+                override_person=True,
+                docket_number=docket_source_record.docket_num,
+            )
+        except Exception:
+            docket_source_record.parse_status = SourceRecord.ParseStatuses.FAILURE
+            nonfatal_errors.append(
+                f"Could not parse {docket_source_record.docket_num} ({docket_source_record.record_type})"
+            )
+        finally:
+            docket_source_record.save()
+        if progress is not None:
+            progress(crecord, nonfatal_errors)
+    return crecord, nonfatal_errors
+
+
+def integrate_summaries(
+    crecord: CRecord,
+    summary_source_records: List[SourceRecord],
+    docket_source_records: List[SourceRecord],
+    nonfatal_errors: List[str],
+    owner,
+    progress: Optional[Callable[[CRecord, List[SourceRecord], List[str]], None]] = None,
+) -> Tuple[CRecord, List[SourceRecord], List[str]]:
+    """
+    Combine a set of source records representing summary sheets with a criminal record. In addition,
+    find any cases that the summary sheets mention which are not already in the criminal record.
+
+    For these extra cases, find a docket sheet for this case, and add it as a source record and integrate its information
+    into the criminal record.
+    """
+    dockets_in_summaries = []
+    for summary_source_record in summary_source_records:
+        try:
+            rlsource = summary_source_record.parse()
+            summary_source_record.parse_status = SourceRecord.ParseStatuses.SUCCESS
+            dockets_in_summaries.extend([c.docket_number for c in rlsource.cases])
+        except Exception:
+            summary_source_record.parse_status = SourceRecord.ParseStatuses.FAILURE
+        finally:
+            summary_source_record.save()
+
+    # compare the dockets_in_summaries to dockets already collected as source records
+    # to see what dockets are missing from the set of source records.
+    missing_dockets = [
+        dn for dn in dockets_in_summaries if dn not in docket_source_records
+    ]
+    new_source_dockets = download_service.dockets(missing_dockets, owner=owner)
+    logger.info("Downloaded %d", len(new_source_dockets))
+
+    # now parse and integrate these new source dockets into the crecord.
+    crecord, nonfatal_errors = integrate_dockets(
+        crecord,
+        new_source_dockets,
+        nonfatal_errors,
+        progress=None
+        if progress is None
+        else lambda crec, errs: progress(crec, new_source_dockets, errs),
+    )
+    return crecord, new_source_dockets, nonfatal_errors
+
+
+def collect_source_records(source_records_data: List[Dict], owner) -> List[SourceRecord]:
+    """
+    Find the SourceRecords in the database that have been sent in a request,
+    or if these are new source records, create them and download the files they point to.
+    """
+    # TODO this probably doesn't handle a request with a new SoureRecord missing a URL.
+    source_records = []
+    new_source_records = []
+    for source_record_data in source_records_data:
+        try:
+            source_records.append(SourceRecord.objects.get(id=source_record_data["id"]))
+        except Exception:
+            # create this source record in the database, if it is new.
+            source_rec = SourceRecord(**source_record_data, owner=owner)
+            source_rec.save()
+            source_records.append(source_rec)
+            new_source_records.append(source_rec)
+    # also download them to the server.
+    download_service.source_records(new_source_records)
+    return source_records
+
+
+def integrate_sources(
+    crecord: CRecord,
+    source_records: List[SourceRecord],
+    owner,
+    progress: Optional[Progress] = None,
+) -> Tuple[CRecord, List[SourceRecord], List[str]]:
+    """
+    Parse source records, and incorporate the information that they contain into a crecord.
+
+    For any source records that are summaries, find out if the summary describes cases that aren't also
+    docket source records. Search CPCMS for those, add the missing dockets to the list of source records.
+
+    Returns:
+        The crecord, the source records including any new ones, and a list of nonfatal errors.
+    """
+    nonfatal_errors = []
+    source_records = list(source_records)
+    # First, parse the dockets.
+    # Then we'll parse the summaries to find out if there are cases the summaries mention which the dockets do not.
+    docket_source_records = [
+        sr for sr in source_records if sr.record_type == SourceRecord.RecTypes.DOCKET_PDF
+    ]
+    crecord, nonfatal_errors = integrate_dockets(
+        crecord,
+        docket_source_records,
+        nonfatal_errors,
+        progress=None
+        if progress is None
+        else lambda crec, errs: progress(crec, source_records, errs),
+    )
+    # Now attempt to parse summary records. Check the cases in each summary record to see if we have a docket for this case yet.
+    # If we dont yet have a docket for this case, fetch it, parse it, integrate it into the CRecord.
+    summary_source_records = [
+        sr for sr in source_records if sr.record_type == SourceRecord.RecTypes.SUMMARY_PDF
+    ]
+    crecord, new_source_records, nonfatal_errors = integrate_summaries(
+        crecord,
+        summary_source_records,
+        docket_source_records,
+        nonfatal_errors,
+        owner=owner,
+        progress=None
+        if progress is None
+        else lambda crec, new_recs, errs: progress(crec, source_records + new_recs, errs),
+    )
+    source_records += new_source_records
+    return crecord, source_records, nonfatal_errors
+
+
+def save_job_progress(
+    job: IntegrationJob,
+    crecord: CRecord,
+    source_records: List[SourceRecord],
+    errors: List[str],
+) -> None:
+    """ Save the crecord and errors of a job so far, and the source records it has collected. """
+    job.crecord = json.dumps(CRecordSerializer(crecord).data)
+    job.errors = json.dumps(errors)
+    job.save()
+    job.source_records.add(*source_records)
+
+
+def run_integration_job(job_id) -> None:
+    """
+    Download and parse the source records of an IntegrationJob and integrate them into its crecord.
+
+    Meant to run as a django-q task. Failures are recorded on the job, rather than raised.
+    """
+    job = IntegrationJob.objects.get(id=job_id)
+    job.status = IntegrationJob.Statuses.RUNNING
+    job.save()
+    try:
+        crecord_data = CRecordSerializer(data=json.loads(job.crecord))
+        crecord_data.is_valid(raise_exception=True)
+        crecord = CRecord.from_dict(crecord_data.validated_data)
+        source_records = list(job.source_records.all())
+        # the records the job was created with might not be downloaded yet.
+        download_service.source_records(source_records)
+        crecord, source_records, errors = integrate_sources(
+            crecord,
+            source_records,
+            owner=job.owner,
+            progress=lambda crec, recs, errs: save_job_progress(job, crec, recs, errs),
+        )
+        save_job_progress(job, crecord, source_records, errors)
+        job.status = IntegrationJob.Statuses.FINISHED
+    except Exception as err:
+        logger.error("Integration job %s failed: %s", job_id, str(err))
+        job.errors = json.dumps(json.loads(job.errors) + [str(err)])
+        job.status = IntegrationJob.Statuses.FAILED
+    job.save()
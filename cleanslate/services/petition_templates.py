@@ -0,0 +1,73 @@
+"""
+A per-process cache of parsed petition templates.
+
+Parsing a .docx template is most of the cost of rendering a petition from it. `petition_templates` parses
+each ExpungementPetitionTemplate or SealingPetitionTemplate once, and hands out a copy of the parsed
+template for each petition, since rendering changes the template it renders. Saving or deleting a
+template invalidates it (see cleanslate.apps).
+"""
+from typing import Dict, Tuple, Union
+import copy
+import io
+import logging
+import threading
+from docxtpl import DocxTemplate
+from cleanslate.models import ExpungementPetitionTemplate, SealingPetitionTemplate
+
+logger = logging.getLogger(__name__)
+
+
+PetitionTemplate = Union[ExpungementPetitionTemplate, SealingPetitionTemplate]
+
+# (model, primary key, file name)
+Key = Tuple[str, int, str]
+
+
+def copy_docx_template(template: DocxTemplate) -> DocxTemplate:
+    """ Copy a parsed template, so the copy can be rendered without changing the original. """
+    copied = DocxTemplate.__new__(DocxTemplate)
+    copied.__dict__.update(copy.deepcopy(template.__dict__))
+    return copied
+
+
+class PetitionTemplateCache:
+    """
+    Parsed petition templates, keyed by the model and id of the template and the name of its file.
+
+    A new file for a template has a new name, so it gets parsed again even if the cache
+    wasn't invalidated.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._templates: Dict[Key, DocxTemplate] = dict()
+
+    @staticmethod
+    def key(template: PetitionTemplate) -> Key:
+        return (template._meta.label, template.pk, template.file.name)
+
+    def get(self, template: PetitionTemplate) -> DocxTemplate:
+        """ A copy of the parsed docx of `template`, to render a petition with. """
+        key = self.key(template)
+        parsed = self._templates.get(key)
+        if parsed is None:
+            logger.info("Parsing petition template %s", template.file.name)
+            with template.file.open("rb") as f:
+                parsed = DocxTemplate(io.BytesIO(f.read()))
+            with self._lock:
+                self._templates[key] = parsed
+        return copy_docx_template(parsed)
+
+    def invalidate(self, template: PetitionTemplate) -> None:
+        """ Forget every parsed version of `template`. """
+        with self._lock:
+            for key in list(self._templates.keys()):
+                if key[:2] == (template._meta.label, template.pk):
+                    del self._templates[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._templates = dict()
+
+
+petition_templates = PetitionTemplateCache()
@@ -7,6 +7,8 @@ from .views import (
     FileUploadView,
     SourceRecordsFetchView,
     IntegrateCRecordWithSources,
+    IntegrationJobsView,
+    IntegrationJobView,
     AnalysisView,
     PetitionsView,
     UserProfileView,
@@ -17,6 +19,8 @@ urlpatterns = [
     path("sourcerecords/upload/", FileUploadView.as_view()),
     path("sourcerecords/fetch/", SourceRecordsFetchView.as_view()),
     path("cases/", IntegrateCRecordWithSources.as_view()),
+    path("cases/jobs/", IntegrationJobsView.as_view()),
+    path("cases/jobs/<uuid:job_id>/", IntegrationJobView.as_view()),
     path("analysis/", AnalysisView.as_view()),
     path("petitions/", PetitionsView.as_view()),
     path("profile/", UserProfileView.as_view()),
@@ -2,18 +2,17 @@
 Views for the Recordlib webapp.
 
 """
-from typing import Tuple, List
+import json
 import logging
-from django.http import HttpResponse
+from django.http import FileResponse, HttpResponse
 from rest_framework.response import Response
 from rest_framework.parsers import MultiPartParser, FormParser
 from rest_framework.views import APIView
 from rest_framework import permissions, status
 from django_q.tasks import async_task
 from RecordLib.crecord import CRecord
-from RecordLib.sourcerecords import SourceRecord as RLSourceRecord
 from RecordLib.analysis import Analysis
-from RecordLib.utilities.serializers import to_serializable
+from RecordLib.utilities.serializers import dump_json
 from RecordLib.utilities import cleanslate_screen
 from RecordLib.analysis.ruledefs import (
     expunge_summary_convictions,
@@ -23,6 +22,7 @@ from RecordLib.analysis.ruledefs import (
     seal_convictions,
 )
 from RecordLib.petitions import Expungement, Sealing
+from RecordLib.petitions.compressor import spooled_archive
 from cleanslate.models import User, UserProfile
 from cleanslate.serializers import (
     CRecordSerializer,
@@ -34,10 +34,16 @@ from cleanslate.serializers import (
     SourceRecordSerializer,
     DownloadDocsSerializer,
     AutoScreeningSerializer,
+    IntegrationJobSerializer,
 )
-from cleanslate.compressor import Compressor
 from cleanslate.services import download as download_service
-from cleanslate.models import SourceRecord
+from cleanslate.services.petition_templates import petition_templates
+from cleanslate.services.integrate import (
+    collect_source_records,
+    integrate_sources,
+    run_integration_job,
+)
+from cleanslate.models import SourceRecord, IntegrationJob
 
 logger = logging.getLogger(__name__)
 
@@ -116,82 +122,6 @@ class SourceRecordsFetchView(APIView):
             return Response({"errors": [str(err)]})
 
 
-def integrate_dockets(
-    crecord: CRecord,
-    docket_source_records: List[SourceRecord],
-    nonfatal_errors: List[str],
-) -> Tuple[CRecord, List[str]]:
-    """ Combine a set of source records representing 'dockets' with a criminal record"""
-    for docket_source_record in docket_source_records:
-        try:
-            # get a RecordLib SourceRecord from the webapp sourcerecord model. The RecordLib SourceRecord has the machinery for
-            # parsing the record to get a Person and Cases out of it.
-            rlsource = RLSourceRecord(
-                docket_source_record.raw_text or docket_source_record.file.path,
-                parser=docket_source_record.get_parser(),
-            )
-            # If we reach this line, the parse succeeded.
-            docket_source_record.parse_status = SourceRecord.ParseStatuses.SUCCESS
-            # Integrate this docket with the full crecord.
-            crecord.add_sourcerecord(
-                rlsource,
-                case_merge_strategy="overwrite_old",
-                override_person=True,
-                docket_number=docket_source_record.docket_num,
-            )
-        except Exception:
-            docket_source_record.parse_status = SourceRecord.ParseStatuses.FAILURE
-            nonfatal_errors.append(
-                f"Could not parse {docket_source_record.docket_num} ({docket_source_record.record_type})"
-            )
-        finally:
-            docket_source_record.save()
-    return crecord, nonfatal_errors
-
-
-def integrate_summaries(
-    crecord: CRecord,
-    summary_source_records: List[SourceRecord],
-    docket_source_records: List[SourceRecord],
-    nonfatal_errors: List[str],
-    owner,
-) -> Tuple[CRecord, List[SourceRecord], List[str]]:
-    """
-    Combine a set of source records representing summary sheets with a criminal record. In addition, 
-    find any cases that the summary sheets mention which are not already in the criminal record. 
-    
-    For these extra cases, find a docket sheet for this case, and add it as a source record and integrate its information
-    into the criminal record.
-    """
-    dockets_in_summaries = []
-    for summary_source_record in summary_source_records:
-        try:
-            rlsource = RLSourceRecord(
-                summary_source_record.raw_text or summary_source_record.file.path,
-                parser=summary_source_record.get_parser(),
-            )
-            summary_source_record.parse_status = SourceRecord.ParseStatuses.SUCCESS
-            dockets_in_summaries.extend([c.docket_number for c in rlsource.cases])
-        except Exception:
-            summary_source_record.parse_status = SourceRecord.ParseStatuses.FAILURE
-        finally:
-            summary_source_record.save()
-
-    # compare the dockets_in_summaries to dockets already collected as source records
-    # to see what dockets are missing from the set of source records.
-    missing_dockets = [
-        dn for dn in dockets_in_summaries if dn not in docket_source_records
-    ]
-    new_source_dockets = download_service.dockets(missing_dockets, owner=owner)
-    logger.info("Downloaded %d", len(new_source_dockets))
-
-    # now parse and integrate these new source dockets into the crecord.
-    crecord, nonfatal_errors = integrate_dockets(
-        crecord, new_source_dockets, nonfatal_errors
-    )
-    return crecord, new_source_dockets, nonfatal_errors
-
-
 class IntegrateCRecordWithSources(APIView):
     """
     View to handle combining the information about a case or cases from source records with a crecord. 
@@ -216,56 +146,13 @@ class IntegrateCRecordWithSources(APIView):
         try:
             serializer = IntegrateSourcesSerializer(data=request.data)
             if serializer.is_valid():
-                nonfatal_errors = []
                 crecord = CRecord.from_dict(serializer.validated_data["crecord"])
-                source_records = []
-                # Find the SourceRecords in the database that have been sent in this request,
-                # or if these are new source records, download the files they point to.
-                # TODO this probably doesn't handle a request with a new SoureRecord missing a URL.
-                for source_record_data in serializer.validated_data["source_records"]:
-                    try:
-                        source_records.append(
-                            SourceRecord.objects.get(id=source_record_data["id"])
-                        )
-                    except Exception:
-                        # create this source record in the database, if it is new.
-                        source_rec = SourceRecord(
-                            **source_record_data, owner=request.user
-                        )
-                        source_rec.save()
-                        # also download it to the server.
-                        download_service.source_records([source_rec])
-                        source_records.append(source_rec)
-                # Parse the uploaded source records, collecting RecordLib.SourceRecord objects.
-                # These objects are parsing the records and figuring out case information in the SourceRecords.
-                # For any source records that are summaries, find out if the summary describes cases that aren't also
-                # docket source records. Search CPCMS for those, add the missing dockets to the list of source records.
-
-                # First, parse the dockets.
-                # Then we'll parse the summaries to find out if there are cases the summaries mention which the dockets do not.
-                docket_source_records = [
-                    sr
-                    for sr in source_records
-                    if sr.record_type == SourceRecord.RecTypes.DOCKET_PDF
-                ]
-                crecord, nonfatal_errors = integrate_dockets(
-                    crecord, docket_source_records, nonfatal_errors
+                source_records = collect_source_records(
+                    serializer.validated_data["source_records"], owner=request.user
                 )
-                # Now attempt to parse summary records. Check the cases in each summary record to see if we have a docket for this case yet.
-                # If we dont yet have a docket for this case, fetch it, parse it, integrate it into the CRecord.
-                summary_source_records = [
-                    sr
-                    for sr in source_records
-                    if sr.record_type == SourceRecord.RecTypes.SUMMARY_PDF
-                ]
-                crecord, new_source_records, nonfatal_errors = integrate_summaries(
-                    crecord,
-                    summary_source_records,
-                    docket_source_records,
-                    nonfatal_errors,
-                    owner=request.user,
+                crecord, source_records, nonfatal_errors = integrate_sources(
+                    crecord, source_records, owner=request.user
                 )
-                source_records += new_source_records
                 return Response(
                     {
                         "crecord": CRecordSerializer(crecord).data,
@@ -285,6 +172,90 @@ class IntegrateCRecordWithSources(APIView):
             )
 
 
+class IntegrationJobsView(APIView):
+    """
+    Start integrating source records with a crecord in the background.
+
+    This does the same work as IntegrateCRecordWithSources, but in a django-q task, so that
+    big records don't keep the request open while every document is downloaded and parsed.
+    """
+
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request):
+        """
+        Accept a CRecord and a set of SourceRecords, like IntegrateCRecordWithSources, and queue a job
+        to integrate them.
+
+        Returns the job's id and status. GET the job at `cases/jobs/<id>/` to follow its progress.
+
+        Source records with an id must already belong to the user, or the response is a 404. Source records
+        without one are created, and the job downloads their files.
+        """
+        serializer = IntegrateSourcesSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(
+                {"errors": serializer.errors}, status=status.HTTP_400_BAD_REQUEST
+            )
+        source_records_data = serializer.validated_data["source_records"]
+        ids = {data["id"] for data in source_records_data if data.get("id") is not None}
+        owned = SourceRecord.objects.filter(id__in=ids, owner=request.user).in_bulk()
+        if len(owned) < len(ids):
+            return Response(
+                {"errors": ["No such source record."]}, status=status.HTTP_404_NOT_FOUND
+            )
+        job = IntegrationJob.objects.create(
+            owner=request.user,
+            crecord=json.dumps(
+                CRecordSerializer(serializer.validated_data["crecord"]).data
+            ),
+        )
+        source_records = [
+            owned[data["id"]]
+            if data.get("id") is not None
+            else SourceRecord.objects.create(**data, owner=request.user)
+            for data in source_records_data
+        ]
+        job.source_records.add(*source_records)
+        async_task(run_integration_job, job.id)
+        return Response(
+            IntegrationJobSerializer(job).data, status=status.HTTP_202_ACCEPTED
+        )
+
+
+class IntegrationJobView(APIView):
+    """
+    Report on the progress of an integration job.
+    """
+
+    permission_classes = [permissions.IsAuthenticated]
+
+    # How long clients should wait before asking about an unfinished job again.
+    POLL_INTERVAL_SECONDS = 2
+
+    def get(self, request, job_id):
+        """
+        Return the job's status, the crecord as built so far, its source records with their fetch and
+        parse statuses, and any errors.
+
+        The response returns right away. While the job is unfinished, `poll_after_seconds` (and the
+        Retry-After header) say how long to wait before asking again. When it's done, `poll_after_seconds`
+        is null.
+        """
+        try:
+            job = IntegrationJob.objects.get(id=job_id, owner=request.user)
+        except IntegrationJob.DoesNotExist:
+            return Response(
+                {"errors": ["No such job."]}, status=status.HTTP_404_NOT_FOUND
+            )
+        data = IntegrationJobSerializer(job).data
+        if job.done:
+            data["poll_after_seconds"] = None
+            return Response(data)
+        data["poll_after_seconds"] = self.POLL_INTERVAL_SECONDS
+        return Response(data, headers={"Retry-After": str(self.POLL_INTERVAL_SECONDS)})
+
+
 class AnalysisView(APIView):
     """
     Views related to an analysis of a CRecord.
@@ -300,6 +271,8 @@ class AnalysisView(APIView):
         Return, if not an error, will be a json-encoded Decision that explains the expungements
         and sealings that can be generated for this record.
 
+        With `?refs=true`, each Case and Charge is written out in full once, with an "$id", and after
+        that as {"$ref": id}. This makes the response much smaller.
         """
         try:
             serializer = CRecordSerializer(data=request.data)
@@ -313,7 +286,10 @@ class AnalysisView(APIView):
                     .rule(expunge_summary_convictions)
                     .rule(seal_convictions)
                 )
-                return Response(to_serializable(analysis))
+                refs = request.query_params.get("refs", "").lower() == "true"
+                return HttpResponse(
+                    dump_json(analysis, refs=refs), content_type="application/json"
+                )
             return Response(
                 {"validation_errors": serializer.errors},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -340,14 +316,14 @@ class PetitionsView(APIView):
             if serializer.is_valid():
                 errors = []
                 petitions = []
+                profile = request.user.userprofile
                 for petition_data in serializer.validated_data["petitions"]:
                     if petition_data["petition_type"] == "Sealing":
                         new_petition = Sealing.from_dict(petition_data)
-                        # this could be done earlier, if needed, to avoid querying db over and over.
-                        # but we'd need to test what types of templates are actually needed.
+                        # Each template is only parsed once. Every petition gets its own copy.
                         try:
                             new_petition.set_template(
-                                request.user.userprofile.sealing_petition_template.file
+                                petition_templates.get(profile.sealing_petition_template)
                             )
                             petitions.append(new_petition)
 
@@ -364,7 +340,7 @@ class PetitionsView(APIView):
                         new_petition = Expungement.from_dict(petition_data)
                         try:
                             new_petition.set_template(
-                                request.user.userprofile.expungement_petition_template.file
+                                petition_templates.get(profile.expungement_petition_template)
                             )
                             petitions.append(new_petition)
                         except Exception as err:
@@ -377,16 +353,17 @@ class PetitionsView(APIView):
                             logger.error(str(err))
                             continue
                 client_last = petitions[0].client.last_name
-                petitions = [(p.file_name(), p.render()) for p in petitions]
-                package = Compressor(f"PetitionsFor{client_last}.zip", petitions)
-
-                logger.info("Returning x-accel-redirect to zip file.")
-
-                resp = HttpResponse()
-                resp["Content-Type"] = "application/zip"
-                resp["Content-Disposition"] = f"attachment; filename={package.name}"
-                resp["X-Accel-Redirect"] = f"/protected/{package.name}"
-                return resp
+                # Each petition is rendered just before it is added to the archive. The archive stays in memory
+                # unless it gets large, and is streamed back from there.
+                package = spooled_archive((p.file_name(), p.render()) for p in petitions)
+
+                logger.info("Returning zip file of petitions.")
+                return FileResponse(
+                    package,
+                    as_attachment=True,
+                    filename=f"PetitionsFor{client_last}.zip",
+                    content_type="application/zip",
+                )
             else:
                 return Response(
                     {"validation_errors": serializer.errors},
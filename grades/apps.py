@@ -1,5 +1,23 @@
 from django.apps import AppConfig
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+
+
+def invalidate_grade_table(sender, **kwargs):
+    from grades.services import grade_table
+
+    grade_table.invalidate()
+    # Other processes can only read the change once it's committed, so tell them again then.
+    transaction.on_commit(grade_table.invalidate)
 
 
 class GradesConfig(AppConfig):
     name = 'grades'
+
+    def ready(self):
+        # The table of grade probabilities is built from every ChargeRecord, so any new or
+        # deleted record means it has to be rebuilt.
+        from grades.models import ChargeRecord
+
+        post_save.connect(invalidate_grade_table, sender=ChargeRecord)
+        post_delete.connect(invalidate_grade_table, sender=ChargeRecord)
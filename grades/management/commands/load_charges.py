@@ -1,6 +1,5 @@
 from django.core.management.base import BaseCommand, CommandError
-from grades.models import ChargeRecord
-import csv
+from grades.services.load_charges import read_charge_rows, load_charge_records
 import os
 import logging
 
@@ -10,20 +9,29 @@ logger = logging.getLogger(__name__)
 class Command(BaseCommand):
     """
     Load a file of charges into the database of a locally running grades app.
+
+    Rows with the same title, section, subsection, and grade are merged into one record, with their
+    weights added together. With --upsert, duplicates of a record that were already in the database are deleted.
     """
     help = "Load charge records into the database of a local grades app from a csv file"
 
     def add_arguments(self, parser):
         parser.add_argument('filepath')
+        parser.add_argument(
+            '--batch-size', type=int, default=1000,
+            help="Number of records to write in each query.")
+        parser.add_argument(
+            '--upsert', action='store_true',
+            help="Replace the weights of records that are already in the database, instead of adding duplicates.")
 
     def handle(self, *args, **options):
         filepath = options['filepath']
         assert os.path.exists(filepath), f"File {filepath} does not exist!"
 
         with open(filepath, 'r') as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                ChargeRecord(**row).save()
-                logger.info(f"Added {row}")
-        
-        logger.info("Finished adding charge records.")
+            result = load_charge_records(
+                read_charge_rows(f), batch_size=options['batch_size'], upsert=options['upsert'])
+
+        logger.info(
+            f"Finished adding charge records. Read {result.rows} rows, "
+            f"created {result.created} records, updated {result.updated}, and deleted {result.deleted} duplicates.")
@@ -1,7 +1,6 @@
 from django.core.management.base import BaseCommand, CommandError
-from grades.models import ChargeRecord
+from grades.services.load_charges import read_charge_rows, merge_rows, batches
 from grades.serializers import ChargeRecordSerializer
-import csv
 import os
 import logging
 import requests
@@ -14,10 +13,12 @@ class Command(BaseCommand):
     """
     Upload charges to a remote charges app from a csv table.
 
+    Rows with the same title, section, subsection, and grade are merged before uploading, and records are
+    sent to the charges api in batches, which the remote app loads in bulk.
 
-    This command is probably only to be used once when setting up a database. It will insert all the rows
-    of the provided csv file, and won't consider whether rows are already present. So using it multiple times
-    with the same csv file and the same database will lead to duplicates.    
+    Without --upsert, this command will insert all the rows of the provided csv file, and won't consider
+    whether rows are already present. So using it multiple times with the same csv file and the same
+    database will lead to duplicates. With --upsert, records that are already present get their weights replaced.
     """
     help = "Upload charges to a remote charges app from a csv table."
 
@@ -25,6 +26,11 @@ class Command(BaseCommand):
         parser.add_argument("loginurl", help="URL of the login url for the app you're adding charges to")
         parser.add_argument("url", help="The url of the charges api create endpoint.")
         parser.add_argument("filepath", help="Path to csv file with charges to add")
+        parser.add_argument(
+            "--batch-size", type=int, default=1000, help="Number of records to send in each request.")
+        parser.add_argument(
+            "--upsert", action="store_true",
+            help="Replace the weights of records that are already in the remote database, instead of adding duplicates.")
 
     def handle(self, *args, **options):
         filepath = options['filepath']
@@ -34,9 +40,10 @@ class Command(BaseCommand):
 
 
         with open(filepath, 'r') as f:
-            reader = csv.DictReader(f)
-            new_charges = [ChargeRecord(**row) for row in reader]
-        
+            merged, count = merge_rows(read_charge_rows(f))
+        new_charges = list(merged.values())
+        logger.info(f"Read {count} rows, merged into {len(new_charges)} charge records.")
+
         username = getpass(f"Username for {loginurl}?")
         pwd = getpass(f"Password: ")
 
@@ -51,14 +58,21 @@ class Command(BaseCommand):
 
             resp = sess.get(url)
             csrf = sess.cookies['csrftoken']
-            for ch in new_charges:
-                dt = ChargeRecordSerializer(ch).data
-                dt.pop('id')
-                dt['csrfmiddlewaretoken'] = csrf
+            params = {"upsert": "true"} if options['upsert'] else {}
+            uploaded = 0
+            for batch in batches(new_charges, options['batch_size']):
+                dt = ChargeRecordSerializer(batch, many=True).data
+                for ch in dt:
+                    ch.pop('id')
                 resp = sess.post(
                     url,
-                    data = dt
+                    params = params,
+                    json = dt,
+                    headers = {"X-CSRFToken": csrf, "Referer": url},
                 )
-                logger.info(f"Uploaded charge {ch}")
+                if resp.status_code != 201:
+                    raise CommandError(f"Upload failed with status {resp.status_code}: {resp.text}")
+                uploaded += len(batch)
+                logger.info(f"Uploaded {uploaded} of {len(new_charges)} charge records.")
 
-        logger.info("Finished adding charge records.")
\ No newline at end of file
+        logger.info("Finished adding charge records.")
@@ -0,0 +1,17 @@
+# Generated by Django 2.2.13 on 2026-10-17 05:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('grades', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='chargerecord',
+            index=models.Index(fields=['title', 'section', 'subsection'], name='chargerecord_statute_idx'),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 2.2.13 on 2026-10-17 06:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('grades', '0002_chargerecord_statute_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GradeTableVersion',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('version', models.IntegerField(default=0)),
+            ],
+        ),
+    ]
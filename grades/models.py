@@ -33,3 +33,20 @@ class ChargeRecord(models.Model):
     # Integer identifying how heavily the grade in this ChargeRecord should weigh,
     # when attempting to guess the grade of an ungraded charge. 
     weight = models.IntegerField(default=1)
+
+    class Meta:
+        # Grades are guessed by looking up every record of a statute.
+        indexes = [
+            models.Index(fields=["title", "section", "subsection"], name="chargerecord_statute_idx"),
+        ]
+
+
+class GradeTableVersion(models.Model):
+    """
+    A single row that counts changes to the ChargeRecord table.
+
+    Each process keeps its own table of grade probabilities (see grades.services.guess_grade), and checks this
+    row to tell whether another process has changed the ChargeRecords since the table was built.
+    """
+
+    version = models.IntegerField(default=0)
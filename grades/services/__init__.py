@@ -1,2 +1,3 @@
 from .guess_grade import guess_grade
-from .guess_grade import grade_probability
\ No newline at end of file
+from .guess_grade import grade_probability
+from .guess_grade import grade_table
@@ -1,6 +1,8 @@
 import logging
-from grades.models import ChargeRecord
-from typing import Dict, List, Tuple
+import threading
+from grades.models import ChargeRecord, GradeTableVersion
+from django.db.models import F, Sum
+from typing import Dict, List, Optional, Tuple
 from collections import defaultdict
 
 logger = logging.getLogger(__name__)
@@ -11,23 +13,125 @@ def match(a: ChargeRecord, b: ChargeRecord) -> bool:
         return True
     return False
 
-def guess_grade(target: ChargeRecord, records: List[ChargeRecord]) -> Tuple[str,float]:
+
+def probabilities(weights: Dict[str, int]) -> List[Tuple[str, float]]:
+    """
+    Turn the total weight of each grade into a list of (grade, probability) pairs, from least
+    to most likely.
+    """
+    total_weight = sum([w for g,w in weights.items()])
+    probabilities = sorted([
+        (g, round(w / total_weight, 2))
+        for g,w in weights.items()
+    ], key=lambda i: i[1], reverse=True)
+    return sorted(probabilities, key=lambda g: g[1])
+
+
+# The one row of GradeTableVersion.
+VERSION_ROW = 1
+
+Version = int
+
+
+def bump_version() -> None:
+    """ Tell every process that the ChargeRecord table changed. """
+    updated = GradeTableVersion.objects.filter(pk=VERSION_ROW).update(version=F("version") + 1)
+    if updated == 0:
+        GradeTableVersion.objects.get_or_create(pk=VERSION_ROW, defaults={"version": 1})
+
+
+def current_version() -> Version:
+    """ The number of times the ChargeRecord table has changed, read from a single row shared by every process. """
+    return (
+        GradeTableVersion.objects.filter(pk=VERSION_ROW)
+        .values_list("version", flat=True)
+        .first()
+        or 0
+    )
+
+
+class GradeTable:
+    """
+    The probability of each grade for every (title, section, subsection) in the ChargeRecord table.
+
+    The table is built from a single query that sums the weights of ChargeRecords grouped by statute and grade,
+    the first time a grade is looked up. After that, a lookup is a dictionary access plus a read of the one row
+    of GradeTableVersion, no matter how many ChargeRecords there are. If the version changed since the table was
+    built, by a write in this process or any other, the table is built again.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # (version, table), replaced as a whole so lookups never see a table with another table's version.
+        self._loaded: Optional[Tuple[Version, Dict]] = None
+        # Counts calls to invalidate(), so a load that started before one doesn't install an out of date table.
+        self._generation = 0
+
+    def load(self, version: Optional[Version] = None) -> Dict[Tuple[str, str, str], List[Tuple[str, float]]]:
+        """
+        Build the table from the database, and use it unless the table was invalidated while it was being built.
+
+        `version` must be read before the table is, so a change in between makes the table look out of date
+        rather than up to date.
+        """
+        with self._lock:
+            generation = self._generation
+        if version is None:
+            version = current_version()
+        weights = defaultdict(dict)
+        rows = (ChargeRecord.objects
+            .values("title", "section", "subsection", "grade")
+            .annotate(total_weight=Sum("weight"))
+            .order_by("title", "section", "subsection", "grade"))
+        for row in rows:
+            statute = (row["title"], row["section"], row["subsection"])
+            weights[statute][row["grade"]] = row["total_weight"]
+        table = {statute: probabilities(grades) for statute, grades in weights.items()}
+        with self._lock:
+            if self._generation == generation:
+                self._loaded = (version, table)
+        return table
+
+    def invalidate(self) -> None:
+        """ Forget the table, in this process and (through the shared version) every other. """
+        with self._lock:
+            self._generation += 1
+            self._loaded = None
+        bump_version()
+
+    def lookup(self, title: str, section: str, subsection: str = "") -> List[Tuple[str, float]]:
+        """ The list of (grade, probability) pairs for a statute, or an empty list if there are no records of it. """
+        version = current_version()
+        loaded = self._loaded
+        if loaded is not None and loaded[0] == version:
+            table = loaded[1]
+        else:
+            table = self.load(version)
+        return table.get((title, section, subsection), [])
+
+
+grade_table = GradeTable()
+
+
+def guess_grade(target: ChargeRecord, records: Optional[List[ChargeRecord]] = None) -> List[Tuple[str,float]]:
     """
     Guess the grade of an offense.
 
+    Args:
+        target: The charge to guess a grade for. Its title, section, and subsection are used.
+        records: ChargeRecords to guess from. If None, use the precomputed table of all the
+            ChargeRecords in the database.
+
     Returns:
-        A dictionary with each possible grade, and the probability that the `target` charge has that grade.
+        A list of each possible grade, and the probability that the `target` charge has that grade.
     """
+    if records is None:
+        return grade_table.lookup(target.title, target.section, target.subsection)
     weights = defaultdict(lambda: 0)
     for rec in records:
         if match(target, rec):
             weights[rec.grade] += rec.weight
-    total_weight = sum([w for g,w in weights.items()])
-    probabilities = sorted([
-        (g, round(w / total_weight, 2))
-        for g,w in weights.items()
-    ], key=lambda i: i[1], reverse=True)
-    return sorted(probabilities, key=lambda g: g[1])
+    return probabilities(weights)
 
 
 def grade_probability(grade: str, gradelist: Tuple[str, float]) -> float:
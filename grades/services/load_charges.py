@@ -0,0 +1,185 @@
+"""
+Load large tables of charges and their grades into the ChargeRecord table.
+
+Rows are read from a csv one at a time and handled in batches, so a load only holds one batch of rows at once.
+Rows for the same (title, section, subsection, grade) are merged into one record, adding up their weights. If a
+later batch has more rows for a record this load already wrote, their weights are added to that record.
+
+With `upsert=True`, a record that is already in the database has its weight replaced by the loaded
+weight, instead of getting a duplicate. This makes it safe to load the same table again after
+it changes. If the database already has duplicate records for a charge, from loads without `upsert`, the
+oldest one is kept and updated, and the others are deleted.
+
+The whole load is one transaction, so a load that fails partway through writes nothing, and can just be run again.
+"""
+import csv
+import logging
+from dataclasses import dataclass
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Tuple
+from django.db import transaction
+from django.db.models import Max
+from grades.models import ChargeRecord
+from .guess_grade import grade_table
+
+logger = logging.getLogger(__name__)
+
+
+Key = Tuple[str, str, str, str]
+
+
+@dataclass
+class LoadResult:
+    """ Counts of what a load did. """
+
+    rows: int = 0
+    created: int = 0
+    updated: int = 0
+    deleted: int = 0
+
+
+def record_key(row: Dict) -> Key:
+    return (row["title"], row["section"], row.get("subsection") or "", row.get("grade") or "")
+
+
+def read_charge_rows(f) -> Iterator[Dict]:
+    """ Read the rows of a csv of charges with the columns of ChargeRecord, one at a time. """
+    return csv.DictReader(f)
+
+
+def merge_rows(rows: Iterable[Dict]) -> Tuple[Dict[Key, ChargeRecord], int]:
+    """
+    Merge rows with the same title, section, subsection, and grade into one ChargeRecord whose weight is the sum
+    of their weights. The offense description of the first such row is kept.
+
+    Every merged record is kept in memory until the rows run out. `merged_batches` merges a few rows at a time.
+
+    Returns:
+        The merged ChargeRecords, keyed by (title, section, subsection, grade), and the number of rows read.
+    """
+    merged = dict()
+    count = 0
+    for row in rows:
+        count += 1
+        key = record_key(row)
+        weight = int(row.get("weight") or 1)
+        if key in merged:
+            merged[key].weight += weight
+        else:
+            title, section, subsection, grade = key
+            merged[key] = ChargeRecord(
+                offense=row.get("offense", ""),
+                title=title,
+                section=section,
+                subsection=subsection,
+                grade=grade,
+                weight=weight,
+            )
+    return merged, count
+
+
+def merged_batches(rows: Iterable[Dict], batch_size: int) -> Iterator[Tuple[Dict[Key, ChargeRecord], int]]:
+    """ Merge `batch_size` rows at a time with `merge_rows`, yielding the merged records and row count of each batch. """
+    rows = iter(rows)
+    while True:
+        merged, count = merge_rows(islice(rows, batch_size))
+        if count == 0:
+            return
+        yield merged, count
+
+
+def batches(items: List, batch_size: int) -> Iterator[List]:
+    for start in range(0, len(items), batch_size):
+        yield items[start : start + batch_size]
+
+
+def with_keys(keys: Iterable[Key]):
+    """ A queryset of the ChargeRecords that might have one of `keys`. Check their keys to be sure. """
+    keys = list(keys)
+    return ChargeRecord.objects.filter(
+        title__in={key[0] for key in keys}, section__in={key[1] for key in keys}
+    )
+
+
+def write_batch(
+    merged: Dict[Key, ChargeRecord], written: Dict[Key, Tuple[int, int]], upsert: bool, result: LoadResult
+) -> None:
+    """
+    Write one batch of merged records.
+
+    Args:
+        merged: The merged records of the batch.
+        written: The id and weight of each record this load has written so far, by key. Updated with this batch.
+        upsert: Replace the weights of records that were in the database before the load.
+        result: Counts of what the load has done so far. Updated with this batch.
+    """
+    existing: Dict[Key, List[int]] = dict()
+    if upsert:
+        keys = [key for key in merged if key not in written]
+        rows = with_keys(keys).order_by("id").values_list("id", "title", "section", "subsection", "grade")
+        for pk, *key in rows.iterator():
+            existing.setdefault(tuple(key), []).append(pk)
+    to_create, to_update, to_delete = [], [], []
+    for key, record in merged.items():
+        if key in written:
+            record.pk, weight = written[key]
+            record.weight += weight
+            to_update.append(record)
+        elif key in existing:
+            record.pk, *duplicates = existing[key]
+            to_update.append(record)
+            to_delete.extend(duplicates)
+            result.updated += 1
+        else:
+            to_create.append(record)
+    ChargeRecord.objects.bulk_create(to_create)
+    ChargeRecord.objects.bulk_update(to_update, ["weight"])
+    result.deleted += ChargeRecord.objects.filter(id__in=to_delete).delete()[0]
+    result.created += len(to_create)
+    if any(record.pk is None for record in to_create):
+        # Some databases don't return the ids of records made with bulk_create. The newest record with
+        # each key is the one just created.
+        newest = (
+            with_keys(merged)
+            .order_by()
+            .values_list("title", "section", "subsection", "grade")
+            .annotate(Max("id"))
+        )
+        for *key, pk in newest:
+            record = merged.get(tuple(key))
+            if record is not None and record.pk is None:
+                record.pk = pk
+    for key, record in merged.items():
+        written[key] = (record.pk, record.weight)
+
+
+def load_charge_records(
+    rows: Iterable[Dict], batch_size: int = 1000, upsert: bool = False
+) -> LoadResult:
+    """
+    Write rows of charges to the ChargeRecord table.
+
+    Args:
+        rows: dicts with the fields of a ChargeRecord. `subsection` and `weight` are optional.
+        batch_size: How many rows to merge and write at a time.
+        upsert: If True, replace the weights of records that are already in the database, instead
+            of creating new ones, and delete any duplicates of them.
+
+    Returns:
+        A LoadResult with the number of rows read and records created, updated, and deleted.
+    """
+    result = LoadResult()
+    # The id and weight of every record this load has written, so rows in later batches can be added to them.
+    written: Dict[Key, Tuple[int, int]] = dict()
+    with transaction.atomic():
+        for merged, count in merged_batches(rows, batch_size):
+            result.rows += count
+            write_batch(merged, written, upsert, result)
+            logger.info(
+                f"Read {result.rows} rows. Created {result.created} charge records, updated {result.updated}, "
+                f"and deleted {result.deleted} duplicates."
+            )
+    # bulk_create and bulk_update don't send the signals that usually invalidate the grade table. This also bumps
+    # the version every process checks, so running web workers see the new records too.
+    grade_table.invalidate()
+    return result
@@ -1,4 +1,5 @@
 import logging
+from dataclasses import asdict
 from django.shortcuts import render
 from rest_framework import generics, status
 from rest_framework.response import Response
@@ -7,6 +8,7 @@ from rest_framework.permissions import IsAdminUser
 from .models import ChargeRecord
 from .serializers import ChargeRecordSerializer
 from .services import guess_grade
+from .services.load_charges import load_charge_records
 
 logger = logging.getLogger(__name__)
 
@@ -17,6 +19,22 @@ class ChargeRecordList(generics.ListCreateAPIView):
     serializer_class = ChargeRecordSerializer
     permission_classes = [IsAdminUser]
 
+    def create(self, request, *args, **kwargs):
+        """
+        Create one ChargeRecord, or load a list of them in bulk.
+
+        A list is loaded with `load_charge_records`, so records for the same statute and grade are merged. With
+        the query param `upsert=true`, records already in the database have their weights replaced.
+        """
+        if not isinstance(request.data, list):
+            return super().create(request, *args, **kwargs)
+        crSerializer = self.get_serializer(data = request.data, many=True)
+        if not crSerializer.is_valid():
+            return Response({"errors": crSerializer.errors}, status=status.HTTP_400_BAD_REQUEST)
+        result = load_charge_records(
+            crSerializer.validated_data, upsert=request.query_params.get("upsert") == "true")
+        return Response(asdict(result), status=status.HTTP_201_CREATED)
+
 
 class GuessChargeGrade(generics.RetrieveAPIView):
     queryset = ChargeRecord.objects.all()
@@ -32,7 +50,7 @@ class GuessChargeGrade(generics.RetrieveAPIView):
         crSerializer = ChargeRecordSerializer(data = request.query_params)
         if crSerializer.is_valid():
             cr = ChargeRecord(**crSerializer.validated_data)
-            return Response(guess_grade(cr, self.queryset.all()), status=status.HTTP_200_OK)
+            return Response(guess_grade(cr), status=status.HTTP_200_OK)
         else:
             return Response({"errors": crSerializer.errors}, status=status.HTTP_400_BAD_REQUEST)
         
@@ -2,8 +2,8 @@ import click
 import logging
 from RecordLib.utilities.serializers import to_serializable
 from RecordLib.crecord import CRecord
-from RecordLib.sourcerecords.summary import Summary
-from RecordLib.sourcerecords.docket import Docket
+from RecordLib.sourcerecords import SourceRecord
+from RecordLib.sourcerecords.batch import parse_directory
 from RecordLib.analysis import Analysis
 from RecordLib.utilities.redis_helper import RedisHelper
 from RecordLib.analysis.ruledefs import (
@@ -13,15 +13,9 @@ from RecordLib.analysis.ruledefs import (
     expunge_over_70,
     seal_convictions,
 )
-from RecordLib.analysis.ruledefs.sealing_rules import (
-    no_f1_convictions,
-    any_felony_convictions_n_years,
-    more_than_x_convictions_y_grade_z_years,
-)
-from RecordLib.sourcerecords.summary.pdf import parse_pdf as parse_pdf_summary
-import pytest
+from RecordLib.analysis.bulk_screening import ScreeningTable
+from RecordLib.sourcerecords.summary.parse_pdf import parse_pdf as parse_pdf_summary
 import json
-import glob
 import os
 import csv
 
@@ -32,9 +26,9 @@ def cli():
 
 @cli.command()
 @click.option("--directory", "-d", type=click.Path(), required=True)
-@click.option("--tempdir", "-td", type=click.Path(), default="tests/data/tmp")
 @click.option("--output", "-o", type=click.Path(), required=True)
-def triage(directory, tempdir, output):
+@click.option("--workers", "-w", type=int, default=None, help="Number of processes for parsing pdfs. Defaults to the number of cpus.")
+def triage(directory, output, workers):
     """
     Read through a set of directories each containing records for a single person. Screen each person for obviously disqualifying elements in their record.
     """
@@ -42,45 +36,28 @@ def triage(directory, tempdir, output):
     if not os.path.exists(directory):
         logging.info(f"{directory} does not exist.")
         return
-    subdirs = os.listdir(directory)
     recs = []
-    logging.info(f"Constructing {len(subdirs)} records.")
-    for sd in subdirs:
-        rec = CRecord()
-        pdfs = glob.glob(os.path.join(directory, sd, "*_Summary.pdf"))
-        try:
-            for pdf in pdfs: 
-                try:
-                    rec.add_summary(parse_pdf_summary(pdf, tempdir=tempdir))
-                except:
-                    try:
-                        d, _ = Docket.from_pdf(pdf, tempdir=tempdir)
-                        rec.add_docket(d)
-                    except Exception as e:
-                        raise e
-            logging.info(f"Constructed a record for {rec.person.full_name()}, with {len(rec.cases)} cases.")
-            recs.append((sd, rec))
-        except Exception as e:
-            logging.error(f"Error for {sd}: {str(e)}")
+    logging.info("Constructing records.")
+    for person_record in parse_directory(directory, pattern="*_Summary.pdf", workers=workers):
+        sd, rec = person_record.name, person_record.crecord
+        for failure in person_record.failures:
+            logging.error(f"Error for {sd}: {failure.path}: {failure.errors}")
+        if rec.person is None:
+            continue
+        logging.info(f"Constructed a record for {rec.person.full_name()}, with {len(rec.cases)} cases.")
+        recs.append((sd, rec))
     logging.info(f"Now analyzing {len(recs)} records.")
+    # Screen all the records together. The answers are the same as from the Decision-based rules
+    # any_felony_convictions_n_years, more_than_x_convictions_y_grade_z_years, and no_f1_convictions.
+    screens = ScreeningTable.from_records(rec for _, rec in recs).triage()
     results = []
-    for sd, rec in recs:
-        
+    for (sd, rec), screen in zip(recs, screens):
         res = {
                 "dir": sd,
                 "name": rec.person.full_name(),
                 "cases": len(rec.cases),
-                "felony_5_yrs": bool(any_felony_convictions_n_years(rec, 5)),
-                "2plus_m1s_15yrs": bool(more_than_x_convictions_y_grade_z_years(rec, 2, "M1", 15)),
-                "4plus_m2s_20yrs": bool(more_than_x_convictions_y_grade_z_years(rec, 4, "M2", 20)),
-                "any_f1_convictions": not no_f1_convictions(rec),
         }
-        res["any_disqualifiers"] = any([
-            res["felony_5_yrs"],
-            res["2plus_m1s_15yrs"],
-            res["4plus_m2s_20yrs"],
-            res["any_f1_convictions"],
-        ])
+        res.update(screen)
         results.append(res)
     with open(output, 'w') as f:
         writer = csv.DictWriter(f, fieldnames=[
@@ -103,7 +80,7 @@ def summary(pdf_summary: str, tempdir: str, redis_collect: str) -> None:
 
     rec = CRecord()
     if pdf_summary is not None:
-        rec.add_summary(parse_pdf_summary(pdf_summary, tempdir = tempdir))
+        rec.add_sourcerecord(SourceRecord(pdf_summary, parser=parse_pdf_summary))
 
     if redis_collect is not None:
         try:
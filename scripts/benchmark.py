@@ -0,0 +1,63 @@
+import click
+import json
+import logging
+import sys
+from RecordLib.utilities.benchmark import STAGES, run_benchmarks, compare_results
+
+
+@click.group()
+def cli():
+    return
+
+
+def report_regressions(results: dict, baseline_path: str, tolerance: float) -> None:
+    with open(baseline_path, "r") as f:
+        baseline = json.load(f)
+    regressions = compare_results(results, baseline, tolerance)
+    if len(regressions) > 0:
+        click.echo("Regressions:")
+        for regression in regressions:
+            click.echo(f"  {regression}")
+        sys.exit(1)
+    click.echo("No regressions.")
+
+
+@cli.command()
+@click.option("--scale", "-s", type=int, default=50, help="Number of charges per docket, or cases per summary and record.")
+@click.option("--repeat", "-r", type=int, default=5, help="Times to run each stage. The best time is reported.")
+@click.option("--stage", "stages", multiple=True, type=click.Choice(list(STAGES.keys())), help="Stage to run. Repeat to run several. Defaults to all.")
+@click.option("--output", "-o", type=click.Path(), default=None, help="Write the results to this json file.")
+@click.option("--baseline", "-b", type=click.Path(exists=True), default=None, help="Compare the results to this earlier json file.")
+@click.option("--tolerance", "-t", type=float, default=0.1, help="Fraction by which a measurement may worsen before it is a regression.")
+def run(scale, repeat, stages, output, baseline, tolerance):
+    """
+    Time each stage of parsing, analysis and rendering petitions on synthetic documents.
+    """
+    logging.basicConfig(level=logging.INFO)
+    results = run_benchmarks(scale=scale, repeat=repeat, stages=list(stages) or None)
+    for name, result in results["stages"].items():
+        if result["skipped"]:
+            click.echo(f"{name:<20} skipped: {result['skipped']}")
+        else:
+            click.echo(
+                f"{name:<20} {result['best_seconds']:.4f}s  {result['items_per_second']:.1f} items/s  "
+                + f"peak {result['peak_memory_bytes'] / 1024:.0f} KiB"
+            )
+    if output is not None:
+        with open(output, "w") as f:
+            json.dump(results, f, indent=2)
+    if baseline is not None:
+        report_regressions(results, baseline, tolerance)
+
+
+@cli.command()
+@click.argument("results", type=click.Path(exists=True))
+@click.argument("baseline", type=click.Path(exists=True))
+@click.option("--tolerance", "-t", type=float, default=0.1, help="Fraction by which a measurement may worsen before it is a regression.")
+def compare(results, baseline, tolerance):
+    """
+    Compare saved benchmark RESULTS to a BASELINE, and exit with an error if anything regressed.
+    """
+    with open(results, "r") as f:
+        results = json.load(f)
+    report_regressions(results, baseline, tolerance)
@@ -19,5 +19,6 @@ setup(
         parse=scripts.parse:parse
         expunge=scripts.expunge:cli
         csscreen=scripts.csscreen:cli
+        benchmark=scripts.benchmark:cli
     ''',
 )
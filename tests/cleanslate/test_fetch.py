@@ -0,0 +1,124 @@
+"""
+Tests for fetching the documents of SourceRecords, against a local stub of the UJS portal.
+"""
+import asyncio
+import threading
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime
+from http.server import HTTPServer, BaseHTTPRequestHandler
+from socketserver import ThreadingMixIn
+import aiohttp
+import pytest
+from cleanslate.models import SourceRecord
+from cleanslate.services import fetch
+from cleanslate.services.fetch import fetch_source_records, AiohttpTransport, FetchSettings, Transport
+
+
+class StubPortal(BaseHTTPRequestHandler):
+    """ Serves fake pdfs. /slow takes half a second, /flaky fails once, and anything else is missing. """
+
+    protocol_version = "HTTP/1.1"
+    flaky_requests = 0
+
+    def do_GET(self):
+        if self.path.startswith("/slow"):
+            time.sleep(0.5)
+            self.respond(200, b"%PDF-1.4 slow pdf")
+        elif self.path.startswith("/flaky"):
+            StubPortal.flaky_requests += 1
+            if StubPortal.flaky_requests == 1:
+                self.respond(503, b"")
+            else:
+                self.respond(200, b"%PDF-1.4 flaky pdf")
+        else:
+            self.respond(404, b"")
+
+    def respond(self, status, body):
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class ThreadingServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+@pytest.fixture
+def stub_portal():
+    server = ThreadingServer(("127.0.0.1", 0), StubPortal)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def make_record(owner, path):
+    return SourceRecord.objects.create(
+        caption="Test v Test",
+        docket_num="CP-1234",
+        court=SourceRecord.Courts.CP,
+        url=f"https://ujsportal.pacourts.us{path}",
+        record_type=SourceRecord.RecTypes.DOCKET_PDF,
+        owner=owner,
+    )
+
+
+@pytest.mark.django_db
+def test_fetch_source_records(admin_user, stub_portal):
+    slow = [make_record(admin_user, f"/slow?docketNumber={i}") for i in range(4)]
+    flaky = make_record(admin_user, "/flaky")
+    missing = make_record(admin_user, "/missing")
+    before = datetime.now()
+    fetch_source_records(
+        slow + [slow[0], flaky, missing],
+        transport=AiohttpTransport(base_url=stub_portal),
+        settings=FetchSettings(connections_per_host=4, retries=2, backoff=0.01),
+    )
+    # the slow documents were fetched at the same time, not one after another.
+    assert (datetime.now() - before).total_seconds() < 1.5
+    for rec in slow + [flaky]:
+        rec.refresh_from_db()
+        assert rec.fetch_status == SourceRecord.FetchStatuses.FETCHED
+        assert rec.file.read().startswith(b"%PDF")
+    missing.refresh_from_db()
+    assert missing.fetch_status == SourceRecord.FetchStatuses.FETCH_FAILED
+
+
+class BrokenStreamTransport(Transport):
+    """ Answers 200, but the connection drops after the first chunk of every response. """
+
+    @asynccontextmanager
+    async def get(self, url):
+        async def chunks():
+            yield b"%PDF-1.4 partial"
+            raise aiohttp.ClientPayloadError("connection dropped")
+
+        yield 200, chunks()
+
+
+def test_failed_downloads_close_their_files(monkeypatch):
+    opened = []
+
+    class RecordingFile(fetch.SpooledTemporaryFile):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            opened.append(self)
+
+    monkeypatch.setattr(fetch, "SpooledTemporaryFile", RecordingFile)
+    status, body = asyncio.run(
+        fetch.fetch_to_file(
+            "https://ujsportal.pacourts.us/broken",
+            BrokenStreamTransport(),
+            FetchSettings(retries=2, backoff=0.01),
+        )
+    )
+    assert body is None
+    # one file per attempt, and each was closed when its download failed.
+    assert len(opened) == 3
+    assert all(f.closed for f in opened)
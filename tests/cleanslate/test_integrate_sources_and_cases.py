@@ -6,7 +6,8 @@ the crecord
 import os
 import pytest
 from django.core.files import File
-from cleanslate.models import SourceRecord
+from django_q.conf import Conf
+from cleanslate.models import SourceRecord, IntegrationJob
 from cleanslate.serializers import SourceRecordSerializer, CRecordSerializer
 from RecordLib.crecord import CRecord
 from RecordLib.petitions import Expungement
@@ -69,3 +70,79 @@ def test_integrate_sources_with_crecord(dclient, admin_user, example_crecord):
     except Exception as err:
         pytest.fail(err)
 
+
+
+@pytest.mark.django_db
+def test_integrate_sources_in_background(dclient, admin_user, example_crecord, monkeypatch):
+    """
+    User can post source records and a crecord to start a background job, and then poll the job
+    for the crecord with the cases from the source records incorporated.
+    """
+    # run django-q tasks right away, instead of in a cluster.
+    monkeypatch.setattr(Conf, "SYNC", True)
+    dclient.force_authenticate(user=admin_user)
+    docket = os.listdir("tests/data/dockets/")[0]
+    with open(f"tests/data/dockets/{docket}", "rb") as d:
+        doc_1 = SourceRecord.objects.create(
+            caption="Hello v. World",
+            docket_num="MC-1234",
+            court=SourceRecord.Courts.CP,
+            url="https://abc.def",
+            record_type=SourceRecord.RecTypes.DOCKET_PDF,
+            file=File(d),
+            owner=admin_user,
+        )
+    data = {
+        "crecord": CRecordSerializer(example_crecord).data,
+        "source_records": [SourceRecordSerializer(doc_1).data],
+    }
+
+    resp = dclient.post("/api/record/cases/jobs/", data=data)
+    assert resp.status_code == 202
+    job_id = resp.data["id"]
+
+    resp = dclient.get(f"/api/record/cases/jobs/{job_id}/")
+    assert resp.status_code == 200
+    assert resp.data["status"] == IntegrationJob.Statuses.FINISHED
+    assert resp.data["poll_after_seconds"] is None
+    assert len(resp.data["source_records"]) >= 1
+    assert (
+        resp.data["source_records"][0]["parse_status"]
+        == SourceRecord.ParseStatuses.SUCCESS
+    )
+    try:
+        CRecord.from_dict(resp.data["crecord"])
+    except Exception as err:
+        pytest.fail(err)
+
+
+@pytest.mark.django_db
+def test_unfinished_job_says_when_to_poll_again(dclient, admin_user):
+    dclient.force_authenticate(user=admin_user)
+    job = IntegrationJob.objects.create(owner=admin_user, crecord="{}")
+    resp = dclient.get(f"/api/record/cases/jobs/{job.id}/")
+    assert resp.status_code == 200
+    assert resp.data["status"] == IntegrationJob.Statuses.QUEUED
+    assert resp.data["poll_after_seconds"] > 0
+    assert resp["Retry-After"] == str(resp.data["poll_after_seconds"])
+
+
+@pytest.mark.django_db
+def test_job_with_someone_elses_source_record(dclient, admin_user, django_user_model, example_crecord):
+    other_user = django_user_model.objects.create_user(username="other", password="pass")
+    theirs = SourceRecord.objects.create(
+        caption="Hello v. World",
+        docket_num="MC-1234",
+        court=SourceRecord.Courts.CP,
+        url="https://abc.def",
+        record_type=SourceRecord.RecTypes.DOCKET_PDF,
+        owner=other_user,
+    )
+    dclient.force_authenticate(user=admin_user)
+    data = {
+        "crecord": CRecordSerializer(example_crecord).data,
+        "source_records": [SourceRecordSerializer(theirs).data],
+    }
+    resp = dclient.post("/api/record/cases/jobs/", data=data)
+    assert resp.status_code == 404
+    assert IntegrationJob.objects.count() == 0
@@ -2,8 +2,11 @@ from django.test import TestCase
 from django.core.files import File
 from cleanslate.models import ExpungementPetitionTemplate, SealingPetitionTemplate, SourceRecord
 from RecordLib.petitions import Expungement
+from RecordLib.utilities import synthetic_documents
+from RecordLib.utilities.serializers import to_serializable
 import pytest
 import io
+import json
 from django.db import IntegrityError
 from django.contrib.auth.models import User
 
@@ -77,4 +80,39 @@ def test_create_source_record(admin_user):
     saved_model = SourceRecord.objects.get(id=new_id)
     assert saved_model.caption == "Comm. v. Smith"
     assert saved_model.fetch_status == SourceRecord.FetchStatuses.NOT_FETCHED
-    assert saved_model.parse_status == SourceRecord.ParseStatuses.UNKNOWN
\ No newline at end of file
+    assert saved_model.parse_status == SourceRecord.ParseStatuses.UNKNOWN
+
+@pytest.mark.django_db
+def test_source_record_stores_parse(admin_user):
+    rec_model = SourceRecord.objects.create(
+        caption="Comm. v. Doe",
+        docket_num="CP-1234",
+        court=SourceRecord.Courts.CP,
+        record_type=SourceRecord.RecTypes.DOCKET_PDF,
+        raw_text=synthetic_documents.cp_docket_text(3),
+        owner=admin_user,
+    )
+    parsed = rec_model.parse()
+    rec_model.save()
+    assert len(parsed.cases) == 1
+
+    saved_model = SourceRecord.objects.get(id=rec_model.id)
+    stored_parse = saved_model.parsed
+    stored = saved_model.parse()
+    assert to_serializable(stored.cases) == to_serializable(parsed.cases)
+    assert to_serializable(stored.person) == to_serializable(parsed.person)
+
+    # if the stored result is used, the text isn't parsed again.
+    saved_model.parsed = json.dumps({**json.loads(stored_parse), "errors": ["stored"]})
+    assert saved_model.parse().errors == ["stored"]
+
+    # a new parser version means parsing again.
+    saved_model.parser_version = "an older parser"
+    assert saved_model.parse().errors != ["stored"]
+
+    # so does a change to the text that was parsed.
+    saved_model.parsed = stored_parse
+    saved_model.raw_text = synthetic_documents.cp_docket_text(1)
+    reparsed = saved_model.parse()
+    assert len(reparsed.cases[0].charges) < len(parsed.cases[0].charges)
+    assert saved_model.parser_version != rec_model.parser_version
@@ -0,0 +1,46 @@
+import io
+import pytest
+from django.core.files import File
+from docx import Document
+from cleanslate.models import ExpungementPetitionTemplate
+from cleanslate.services.petition_templates import petition_templates
+from RecordLib.petitions.compressor import docx_bytes
+from RecordLib.utilities.synthetic_documents import petition_template
+
+
+def rendered_text(petition) -> str:
+    return Document(io.BytesIO(docx_bytes(petition.render()))).paragraphs[0].text
+
+
+@pytest.mark.django_db
+def test_petition_templates_are_parsed_once(example_expungement):
+    petition_templates.clear()
+    template = ExpungementPetitionTemplate.objects.create(
+        name="Expungement Petition Template", file=File(petition_template(), name="t.docx")
+    )
+    first = petition_templates.get(template)
+    second = petition_templates.get(template)
+    assert first is not second
+    assert len(petition_templates._templates) == 1
+
+    # rendering one copy doesn't change the cached template.
+    example_expungement.set_template(first)
+    assert "{{" not in rendered_text(example_expungement)
+    example_expungement.set_template(second)
+    assert example_expungement.client.last_name in rendered_text(example_expungement)
+
+
+@pytest.mark.django_db
+def test_saving_template_invalidates_it():
+    petition_templates.clear()
+    template = ExpungementPetitionTemplate.objects.create(
+        name="Expungement Petition Template", file=File(petition_template(), name="t.docx")
+    )
+    petition_templates.get(template)
+    assert len(petition_templates._templates) == 1
+    template.name = "Renamed"
+    template.save()
+    assert len(petition_templates._templates) == 0
+    petition_templates.get(template)
+    template.delete()
+    assert len(petition_templates._templates) == 0
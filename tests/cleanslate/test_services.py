@@ -1,26 +1,32 @@
 from cleanslate.models import SourceRecord
 from cleanslate.services import download
-import requests
+from cleanslate.services.fetch import Transport
+from contextlib import asynccontextmanager
 from datetime import datetime
-import time
+import asyncio
 import logging
 
 logger = logging.getLogger(__name__)
 
-class FakeResponse:
+class SlowTransport(Transport):
 
-    def __init__(self):
-        self.content = b'some bytes content'
-        self.status_code = 200
+    async def open(self, settings):
+        pass
 
+    async def close(self):
+        pass
 
-def test_download_source_records(admin_user, monkeypatch):
+    @asynccontextmanager
+    async def get(self, url):
+        await asyncio.sleep(3)
 
-    def slow_get(*args, **kwargs):
-        time.sleep(3)
-        return FakeResponse()
+        async def chunks():
+            yield b'some bytes content'
 
-    monkeypatch.setattr(requests, 'get', slow_get)
+        yield 200, chunks()
+
+
+def test_download_source_records(admin_user):
 
     rec = SourceRecord.objects.create(
         caption="Test v Test",
@@ -36,7 +42,7 @@ def test_download_source_records(admin_user, monkeypatch):
     recs = [
         rec, rec, rec
     ]
-    download.source_records(recs)
+    download.source_records(recs, transport=SlowTransport())
     after = datetime.now()
     time_spent = after - before
     assert rec.file.name is not None
@@ -1,7 +1,7 @@
 import pytest
 import copy
 from grades.models import ChargeRecord
-from grades.services import grade_probability
+from grades.services import grade_probability, grade_table
 
 @pytest.mark.django_db
 def test_create_chargerecords(admin_client):
@@ -65,3 +65,74 @@ def test_guess_grade_no_subsection(admin_client, example_charge_record):
     assert grade_probability('M1', predictions) == 1
     assert grade_probability('F2', predictions) == 0
 
+
+
+@pytest.mark.django_db
+def test_guess_grade_after_new_records(admin_client, example_charge_record):
+    cr1 = copy.copy(example_charge_record)
+    cr1.save()
+    query = {
+        "offense": example_charge_record.offense,
+        "title": example_charge_record.title,
+        "section": example_charge_record.section,
+        "subsection": example_charge_record.subsection,
+    }
+    resp = admin_client.get(f"/api/grades/guess/", data = query)
+    assert resp.data == [('M1', 1)]
+
+    # Creating a record has to invalidate the table the first guess was looked up in.
+    resp = admin_client.post("/api/grades/", {**query, "grade": "F3", "weight": 3})
+    assert resp.status_code == 201
+    resp = admin_client.get(f"/api/grades/guess/", data = query)
+    assert resp.data == [('M1', 0.25), ('F3', 0.75)]
+    assert grade_table.lookup("no", "such", "statute") == []
+
+
+@pytest.mark.django_db
+def test_grade_table_sees_changes_from_other_processes(example_charge_record):
+    from grades.services.guess_grade import GradeTable, bump_version
+
+    example_charge_record.save()
+    table = GradeTable()
+    assert table.lookup("18", "1234", "b4") == [("M1", 1)]
+    # Another process writes records, and bumps the shared version, without this table's invalidate() being called.
+    ChargeRecord.objects.bulk_create([ChargeRecord(
+        offense="Wearing too many socks", title="18", section="1234", subsection="b4", grade="F3", weight=3)])
+    bump_version()
+    assert table.lookup("18", "1234", "b4") == [("M1", 0.25), ("F3", 0.75)]
+
+
+@pytest.mark.django_db
+def test_warm_grade_table_lookup_doesnt_query_charge_records(example_charge_record):
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+    from grades.services.guess_grade import GradeTable
+
+    example_charge_record.save()
+    table = GradeTable()
+    table.lookup("18", "1234", "b4")
+    with CaptureQueriesContext(connection) as queries:
+        assert table.lookup("18", "1234", "b4") == [("M1", 1)]
+    assert len(queries) == 1
+    assert ChargeRecord._meta.db_table not in queries[0]["sql"]
+
+
+@pytest.mark.django_db
+def test_grade_table_load_racing_invalidate(example_charge_record, monkeypatch):
+    import importlib
+
+    module = importlib.import_module("grades.services.guess_grade")
+
+    example_charge_record.save()
+    table = module.GradeTable()
+    current_version = module.current_version
+
+    def invalidated_while_loading():
+        version = current_version()
+        table.invalidate()
+        return version
+
+    monkeypatch.setattr(module, "current_version", invalidated_while_loading)
+    assert table.load() == {("18", "1234", "b4"): [("M1", 1)]}
+    # The table built during the invalidation isn't kept.
+    assert table._loaded is None
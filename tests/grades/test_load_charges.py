@@ -0,0 +1,83 @@
+import pytest
+import io
+from grades.models import ChargeRecord
+from grades.services import guess_grade
+from grades.services.load_charges import load_charge_records, read_charge_rows
+
+
+CHARGES_CSV = """offense,title,section,subsection,grade,weight
+Wearing too many socks,18,1234,b4,M1,1
+Wearing too many socks,18,1234,b4,M1,2
+Wearing too many socks,18,1234,b4,M2,1
+Eating loudly in library,18,99,,S,
+"""
+
+
+@pytest.mark.django_db
+def test_load_charge_records():
+    result = load_charge_records(read_charge_rows(io.StringIO(CHARGES_CSV)), batch_size=2)
+    assert (result.rows, result.created, result.updated) == (4, 3, 0)
+    assert ChargeRecord.objects.get(section="1234", grade="M1").weight == 3
+    assert ChargeRecord.objects.get(section="99").weight == 1
+    assert guess_grade(ChargeRecord(title="18", section="1234", subsection="b4")) == [("M2", 0.25), ("M1", 0.75)]
+
+    result = load_charge_records(read_charge_rows(io.StringIO(CHARGES_CSV)), upsert=True)
+    assert (result.rows, result.created, result.updated) == (4, 0, 3)
+    assert ChargeRecord.objects.count() == 3
+    assert ChargeRecord.objects.get(section="1234", grade="M1").weight == 3
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("upsert", [False, True])
+def test_rows_for_one_record_in_different_batches(upsert):
+    # the M1 rows are split between the first and second batches, and the second M2 row is in the third.
+    rows = CHARGES_CSV + "Wearing too many socks,18,1234,b4,M2,4\n"
+    result = load_charge_records(read_charge_rows(io.StringIO(rows)), batch_size=1, upsert=upsert)
+    assert (result.rows, result.created, result.updated) == (5, 3, 0)
+    assert ChargeRecord.objects.get(section="1234", grade="M1").weight == 3
+    assert ChargeRecord.objects.get(section="1234", grade="M2").weight == 5
+
+
+@pytest.mark.django_db
+def test_upsert_removes_duplicates():
+    load_charge_records(read_charge_rows(io.StringIO(CHARGES_CSV)))
+    load_charge_records(read_charge_rows(io.StringIO(CHARGES_CSV)))
+    assert ChargeRecord.objects.filter(section="1234", grade="M1").count() == 2
+    oldest = ChargeRecord.objects.filter(section="1234", grade="M1").order_by("id").first()
+
+    result = load_charge_records(read_charge_rows(io.StringIO(CHARGES_CSV)), batch_size=2, upsert=True)
+    assert (result.rows, result.created, result.updated, result.deleted) == (4, 0, 3, 3)
+    assert ChargeRecord.objects.count() == 3
+    assert ChargeRecord.objects.get(section="1234", grade="M1").id == oldest.id
+    assert ChargeRecord.objects.get(section="1234", grade="M1").weight == 3
+
+
+@pytest.mark.django_db
+def test_bulk_create_chargerecords(admin_client):
+    records = [
+        {"offense": "Ice skating without proper snacks", "title": "15", "section": "iii", "grade": "M1"},
+        {"offense": "Ice skating without proper snacks", "title": "15", "section": "iii", "grade": "M1"},
+    ]
+    resp = admin_client.post("/api/grades/", records, content_type="application/json")
+    assert resp.status_code == 201
+    assert resp.data == {"rows": 2, "created": 1, "updated": 0, "deleted": 0}
+    resp = admin_client.post("/api/grades/?upsert=true", records, content_type="application/json")
+    assert resp.data == {"rows": 2, "created": 0, "updated": 1, "deleted": 0}
+    assert ChargeRecord.objects.get(section="iii").weight == 2
+
+
+@pytest.mark.django_db
+def test_failed_load_writes_nothing(monkeypatch):
+    create = ChargeRecord.objects.bulk_create
+    calls = []
+
+    def fail_on_second_batch(batch, *args, **kwargs):
+        calls.append(batch)
+        if len(calls) == 2:
+            raise RuntimeError("database went away")
+        return create(batch, *args, **kwargs)
+
+    monkeypatch.setattr(ChargeRecord.objects, "bulk_create", fail_on_second_batch)
+    with pytest.raises(RuntimeError):
+        load_charge_records(read_charge_rows(io.StringIO(CHARGES_CSV)), batch_size=2)
+    assert ChargeRecord.objects.count() == 0
@@ -1,6 +1,6 @@
 from RecordLib.analysis import Analysis
 from RecordLib.analysis.ruledefs import (
-    expunge_over_70, expunge_summary_convictions
+    expunge_over_70, expunge_summary_convictions, expunge_nonconvictions, seal_convictions
 )
 import pytest
 
@@ -29,3 +29,21 @@ def test_rule_chaining(example_crecord):
         )
     except:
         pytest.fail("Could not chain analysis rule operations.")
+
+
+def test_analysis_shares_cases(example_crecord):
+    ans = Analysis(example_crecord)
+    assert ans.remaining_record is not example_crecord
+    assert ans.remaining_record.cases is not example_crecord.cases
+    assert all(a is b for a, b in zip(ans.remaining_record.cases, example_crecord.cases))
+
+
+def test_rules_leave_record_unchanged(example_crecord):
+    charges_before = [list(case.charges) for case in example_crecord.cases]
+    (Analysis(example_crecord)
+     .rule(expunge_over_70)
+     .rule(expunge_nonconvictions)
+     .rule(expunge_summary_convictions)
+     .rule(seal_convictions)
+    )
+    assert [list(case.charges) for case in example_crecord.cases] == charges_before
@@ -0,0 +1,61 @@
+import os
+from RecordLib.crecord import Person, Case
+from RecordLib.sourcerecords.batch import ParsedFile, parse_batch, parse_directory
+
+
+def fake_parse_file(path):
+    """ Parse a 'pdf' that just holds a docket number. """
+    if path.endswith("broken.pdf"):
+        raise ValueError("Not a pdf")
+    with open(path) as f:
+        docket_number = f.read()
+    return ParsedFile(
+        path,
+        record_type="DOCKET",
+        person=Person(
+            first_name=os.path.basename(os.path.dirname(path)),
+            last_name="Smith",
+            date_of_birth=None,
+        ),
+        cases=[
+            Case(
+                docket_number=docket_number,
+                status="Closed",
+                county="Philadelphia",
+                otn="",
+                dc="",
+                charges=[],
+            )
+        ],
+    )
+
+
+def test_parse_directory(tmp_path):
+    for person, dockets in [("Ann", ["CP-1", "CP-2"]), ("Bob", ["MJ-1"])]:
+        (tmp_path / person).mkdir()
+        for dn in dockets:
+            (tmp_path / person / f"{dn}.pdf").write_text(dn)
+    (tmp_path / "Bob" / "broken.pdf").write_text("")
+    (tmp_path / "Cat").mkdir()
+
+    results = {
+        r.name: r
+        for r in parse_directory(
+            str(tmp_path), workers=2, max_in_flight=1, parse_file=fake_parse_file
+        )
+    }
+    assert set(results.keys()) == {"Ann", "Bob", "Cat"}
+    assert results["Ann"].crecord.person.first_name == "Ann"
+    assert sorted(c.docket_number for c in results["Ann"].crecord.cases) == [
+        "CP-1",
+        "CP-2",
+    ]
+    # One broken file doesn't stop the rest of the batch.
+    assert [c.docket_number for c in results["Bob"].crecord.cases] == ["MJ-1"]
+    assert len(results["Bob"].failures) == 1
+    assert "Not a pdf" in results["Bob"].failures[0].errors[0]
+    assert len(results["Cat"].crecord.cases) == 0
+
+
+def test_parse_batch_empty():
+    assert list(parse_batch(iter([]), workers=1)) == []
@@ -0,0 +1,30 @@
+import copy
+from RecordLib.utilities.benchmark import run_benchmarks, compare_results
+
+
+def test_run_benchmarks():
+    results = run_benchmarks(scale=2, repeat=1, stages=["parse_cp_docket", "analyze"])
+    assert set(results["stages"].keys()) == {"parse_cp_docket", "analyze"}
+    parse_result = results["stages"]["parse_cp_docket"]
+    assert parse_result["items"] == 2
+    assert parse_result["best_seconds"] > 0
+    assert parse_result["bytes_per_second"] > 0
+    assert parse_result["peak_memory_bytes"] > 0
+    assert results["stages"]["analyze"]["bytes_per_second"] is None
+
+
+def test_compare_results():
+    results = run_benchmarks(scale=2, repeat=1, stages=["parse_mdj_docket"])
+    assert compare_results(results, results) == []
+
+    slower = copy.deepcopy(results)
+    slower["stages"]["parse_mdj_docket"]["items_per_second"] /= 2
+    slower["stages"]["parse_mdj_docket"]["peak_memory_bytes"] *= 2
+    regressions = compare_results(slower, results)
+    assert len(regressions) == 2
+    assert all(r.startswith("parse_mdj_docket") for r in regressions)
+
+    # a small change is within the tolerance
+    slightly_slower = copy.deepcopy(results)
+    slightly_slower["stages"]["parse_mdj_docket"]["items_per_second"] *= 0.95
+    assert compare_results(slightly_slower, results, tolerance=0.1) == []
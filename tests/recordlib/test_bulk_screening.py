@@ -0,0 +1,58 @@
+from datetime import date
+import random
+from RecordLib.analysis.bulk_screening import ScreeningTable
+from RecordLib.analysis.ruledefs.simple_sealing_rules import (
+    any_felony_convictions_n_years,
+    more_than_x_convictions_y_grade_z_years,
+    no_f1_convictions,
+)
+from RecordLib.utilities.synthetic_documents import crecord
+
+
+def records():
+    random.seed(0)
+    recs = [crecord(n_cases=n, charges_per_case=3) for n in range(6)]
+    recs[1].cases[0].charges[0].grade = "F1"
+    recs[1].cases[0].charges[0].disposition = "Guilty Plea"
+    recs[2].cases[0].charges[0].offense = "Murder of the third degree"
+    recs[2].cases[0].charges[0].disposition = "Guilty"
+    recs[3].cases[0].disposition_date = date(2019, 1, 1)
+    recs[4].cases[1].charges[1].grade = ""
+    for case in recs[5].cases:
+        case.disposition_date = date(1990, 1, 1)
+        for charge in case.charges:
+            charge.grade = "F2"
+            charge.disposition = "Guilty"
+    return recs
+
+
+def test_screening_table_matches_rules():
+    recs = records()
+    table = ScreeningTable.from_records(recs)
+    assert table.n_records == len(recs)
+    assert table.any_felony_convictions_n_years(5) == [
+        bool(any_felony_convictions_n_years(rec, 5)) for rec in recs
+    ]
+    for offense_limit, grade_limit, years in [(2, "M1", 15), (4, "M2", 20), (1, "M", 1)]:
+        assert table.more_than_x_convictions_y_grade_z_years(
+            offense_limit, grade_limit, years
+        ) == [
+            bool(more_than_x_convictions_y_grade_z_years(rec, offense_limit, grade_limit, years))
+            for rec in recs
+        ]
+    assert table.no_f1_convictions() == [bool(no_f1_convictions(rec)) for rec in recs]
+
+
+def test_screening_table_triage():
+    recs = records()
+    results = ScreeningTable.from_records(recs).triage()
+    assert len(results) == len(recs)
+    assert results[0] == {
+        "felony_5_yrs": True,
+        "2plus_m1s_15yrs": False,
+        "4plus_m2s_20yrs": False,
+        "any_f1_convictions": False,
+        "any_disqualifiers": True,
+    }
+    assert results[1]["any_f1_convictions"] is True
+    assert results[2]["any_f1_convictions"] is True
@@ -91,6 +91,15 @@ def test_partialcopy(example_case):
     assert len(new_case.charges) == 0
 
 
+def test_with_charges(example_case):
+    assert example_case.with_charges(list(example_case.charges)) is example_case
+    new_case = example_case.with_charges([])
+    assert new_case is not example_case
+    assert new_case.docket_number == example_case.docket_number
+    assert len(new_case.charges) == 0
+    assert len(example_case.charges) > 0
+
+
 def test_years_passed_disposition(example_case):
     example_case.disposition_date = date(2000, 1, 1)
     assert example_case.years_passed_disposition() > 18
@@ -113,3 +122,18 @@ def test_case_completenes(example_case):
     assert no_judge_completeness > 1
     example_case.judge_address = "1234 Market St."
     assert original_completeness > no_judge_completeness
+
+
+def test_case_is_slotted(example_case):
+    import copy
+    import pickle
+
+    assert not hasattr(example_case, "__dict__")
+    assert not hasattr(example_case.charges[0], "__dict__")
+    assert not hasattr(example_case.charges[0].sentences[0], "__dict__")
+    for copied in [copy.deepcopy(example_case), pickle.loads(pickle.dumps(example_case))]:
+        assert to_serializable(copied) == to_serializable(example_case)
+        assert copied.charges == example_case.charges
+        assert copied.completeness() == example_case.completeness()
+    round_tripped = Case.from_dict(to_serializable(example_case))
+    assert to_serializable(round_tripped) == to_serializable(example_case)
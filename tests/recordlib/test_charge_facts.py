@@ -0,0 +1,39 @@
+from RecordLib.analysis import Analysis
+from RecordLib.analysis.charge_facts import ChargeFacts, FactCache, facts
+from RecordLib.analysis.ruledefs import seal_convictions
+
+
+def test_charge_facts(example_charge):
+    example_charge.statute = "18 § 3126(a)(1)"
+    charge_facts = ChargeFacts.of(example_charge)
+    assert charge_facts.chapter == 18
+    assert charge_facts.section == 3126
+    assert charge_facts.subsections == ""
+    assert charge_facts.offense_code == "3126a1"
+    assert charge_facts.grade == "M2"
+    assert charge_facts.is_conviction is True
+    assert charge_facts.disposition_year == 2010
+    assert charge_facts.grade_GTE("M3")
+    assert not charge_facts.grade_GTE("M1")
+
+
+def test_charge_facts_without_statute(example_charge):
+    example_charge.statute = None
+    charge_facts = ChargeFacts.of(example_charge)
+    assert charge_facts.chapter is None
+    assert charge_facts.offense_code is None
+
+
+def test_facts_are_remembered_while_cache_is_active(example_charge):
+    assert facts(example_charge) is not facts(example_charge)
+    cache = FactCache()
+    with cache.active():
+        assert facts(example_charge) is facts(example_charge)
+    assert cache.get(example_charge) is cache.get(example_charge)
+
+
+def test_analysis_remembers_facts(example_crecord):
+    analysis = Analysis(example_crecord).rule(seal_convictions)
+    charge = example_crecord.cases[0].charges[0]
+    assert analysis.facts.get(charge) == ChargeFacts.of(charge)
+    assert id(charge) in analysis.facts._facts
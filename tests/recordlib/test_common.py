@@ -81,6 +81,35 @@ def test_charge_merge_reduce():
     assert len(reduced_charges) == 2
 
 
+def test_reduce_merge_keeps_last_final_disposition():
+    def event(sequence, disposition, year):
+        return Charge(
+            sequence=sequence,
+            offense="Theft",
+            grade="M1",
+            statute="18 § 3921",
+            disposition=disposition,
+            disposition_date=date(year, 1, 1),
+            sentences=[],
+        )
+
+    charges = [
+        event(1, "Proceed to Court", 2010),
+        event(2, "Held for Court", 2010),
+        event(1, "Guilty Plea", 2011),
+        event(None, "Withdrawn", 2011),
+        event(1, "Continued", 2012),
+        event(2, "Nolle Prossed", 2012),
+        event(1, None, 2013),
+    ]
+    reduced = Charge.reduce_merge(charges)
+    assert [c.sequence for c in reduced] == [1, 2, None]
+    assert reduced[0].disposition == "Guilty Plea"
+    assert reduced[0].disposition_date == date(2011, 1, 1)
+    assert reduced[1].disposition == "Nolle Prossed"
+    assert reduced[2].disposition == "Withdrawn"
+
+
 @pytest.mark.parametrize(
     "disposition, is_a_conviction",
     (
@@ -113,6 +142,13 @@ def test_charge_get_statute_subsections(example_charge):
     assert example_charge.get_statute_subsections() == "A1*"
 
 
+def test_charge_get_offense_code(example_charge):
+    example_charge.statute = "18 § 3126(a)(1)"
+    assert example_charge.get_offense_code() == "3126a1"
+    example_charge.statute = "14 section 23"
+    assert example_charge.get_offense_code() is None
+
+
 def test_charge_gte(example_charge):
     example_charge.grade = "M1"
     assert Charge.grade_GTE(example_charge.grade, "M3") == True
@@ -0,0 +1,61 @@
+import io
+import os
+import zipfile
+from docx import Document
+from RecordLib.petitions.compressor import (
+    Compressor,
+    spooled_archive,
+    stream_archive,
+    write_archive,
+)
+from RecordLib.utilities.synthetic_documents import petition_template
+
+
+def petitions(example_expungement, n=3):
+    rendered = []
+    for number in range(n):
+        example_expungement.set_template(petition_template())
+        rendered.append((f"{number}_{example_expungement.file_name()}", example_expungement.render()))
+    return rendered
+
+
+def check_archive(archive, names):
+    with zipfile.ZipFile(archive) as zipf:
+        assert zipf.namelist() == names
+        for name in names:
+            doc = Document(io.BytesIO(zipf.read(name)))
+            assert "petition for" in doc.paragraphs[0].text
+
+
+def test_write_archive(example_expungement):
+    files = petitions(example_expungement)
+    archive = io.BytesIO()
+    write_archive(archive, files)
+    check_archive(archive, [name for name, _ in files])
+
+
+def test_spooled_archive(example_expungement):
+    files = petitions(example_expungement)
+    with spooled_archive(files) as archive:
+        assert archive._rolled is False
+        check_archive(io.BytesIO(archive.read()), [name for name, _ in files])
+    with spooled_archive(files, max_size=1) as archive:
+        assert archive._rolled is True
+        check_archive(io.BytesIO(archive.read()), [name for name, _ in files])
+
+
+def test_stream_archive(example_expungement):
+    files = petitions(example_expungement)
+    chunks = list(stream_archive(files))
+    # One chunk for each document, and one for the end of the archive.
+    assert len(chunks) == len(files) + 1
+    check_archive(io.BytesIO(b"".join(chunks)), [name for name, _ in files])
+
+
+def test_compressor(example_expungement, tmp_path):
+    files = petitions(example_expungement)
+    package = Compressor("petitions.zip", files, tempdir=str(tmp_path))
+    path = package.save()
+    check_archive(path, [name for name, _ in files])
+    package.delete_dir()
+    assert not os.path.exists(path)
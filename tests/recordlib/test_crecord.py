@@ -118,4 +118,88 @@ def test_invalid_schema():
 def test_from_dict(example_crecord):
     serialized = to_serializable(example_crecord)
     crec2 = CRecord.from_dict(serialized)
-    assert example_crecord.person.last_name == crec2.person.last_name
\ No newline at end of file
+    assert example_crecord.person.last_name == crec2.person.last_name
+
+def test_overwrite_old_replaces_the_matching_case(example_case):
+    other = copy.deepcopy(example_case)
+    other.docket_number = "CP-51-CR-0000001-2019"
+    rec = CRecord(Person("dummy", "name", None), cases=[other, example_case])
+    replacement = copy.deepcopy(example_case)
+    replacement.otn = "a_different_otn"
+    sr = SourceRecord("anysource", parser=None)
+    sr.cases = [replacement]
+    rec.add_sourcerecord(sr, case_merge_strategy="overwrite_old")
+    assert rec.cases[0] is other
+    assert rec.cases[1] is replacement
+
+
+def test_merge_case_strategies(example_case):
+    sparse = copy.deepcopy(example_case)
+    sparse.judge = None
+    sparse.affiant = None
+    sparse.otn = "sparse_otn"
+
+    rec = CRecord(cases=[sparse])
+    rec.merge_case(example_case, case_merge_strategy="most_complete")
+    assert rec.cases == [example_case]
+
+    rec = CRecord(cases=[example_case])
+    rec.merge_case(sparse, case_merge_strategy="most_complete")
+    assert rec.cases == [example_case]
+
+    rec = CRecord(cases=[sparse])
+    rec.merge_case(example_case, case_merge_strategy="fill_blanks")
+    assert len(rec.cases) == 1
+    assert rec.cases[0].judge == example_case.judge
+    assert rec.cases[0].otn == example_case.otn
+    assert sparse.judge is None
+
+
+def test_case_index_follows_changes_to_cases(example_case):
+    rec = CRecord(cases=[])
+    for n in range(50):
+        case = copy.copy(example_case)
+        case.docket_number = f"MC-51-CR-{n:07}-2019"
+        rec.merge_case(case)
+    assert len(rec.cases) == 50
+    assert rec.case_index().find(rec.cases[10]) == 10
+    # The index notices cases that were added, replaced, or changed without it.
+    rec.cases.insert(0, example_case)
+    assert rec.case_index().find(rec.cases[10]) == 10
+    rec.cases[20] = copy.copy(example_case)
+    rec.cases[20].docket_number = "CP-51-CR-0000001-2019"
+    replacement = copy.copy(rec.cases[20])
+    rec.merge_case(replacement, case_merge_strategy="overwrite_old")
+    assert len(rec.cases) == 51
+    assert rec.cases[20] is replacement
+    rec.cases[30].docket_number = "CP-51-CR-0000002-2019"
+    replacement = copy.copy(rec.cases[30])
+    rec.merge_case(replacement, case_merge_strategy="overwrite_old")
+    assert len(rec.cases) == 51
+    assert rec.cases[30] is replacement
+
+
+def test_merging_a_case_with_a_new_otn(example_case):
+    rec = CRecord(cases=[example_case])
+    replacement = copy.copy(example_case)
+    replacement.otn = "a_different_otn"
+    rec.merge_case(replacement, case_merge_strategy="overwrite_old")
+    assert rec.cases == [replacement]
+    no_docket = copy.copy(example_case)
+    no_docket.docket_number = None
+    rec.merge_case(no_docket)
+    assert len(rec.cases) == 2
+    no_docket_again = copy.copy(no_docket)
+    rec.merge_case(no_docket_again, case_merge_strategy="overwrite_old")
+    assert rec.cases[1] is no_docket_again
+
+
+def test_cases_without_docket_number_or_otn_are_always_added(example_case):
+    unnumbered = copy.copy(example_case)
+    unnumbered.docket_number = None
+    unnumbered.otn = None
+    rec = CRecord(cases=[unnumbered])
+    for strategy in ["ignore_new", "overwrite_old", "most_complete", "fill_blanks"]:
+        rec.merge_case(copy.copy(unnumbered), case_merge_strategy=strategy)
+    assert len(rec.cases) == 5
+    assert rec.cases[0] is unnumbered
@@ -0,0 +1,97 @@
+import pytest
+from lxml import etree
+from parsimonious import Grammar
+from RecordLib.sourcerecords.customnodevisitorfactory import CustomVisitorFactory
+from RecordLib.sourcerecords.summary.utilities import (
+    visit_sentence_length,
+    visit_sentence_length_element,
+)
+
+
+grammar = Grammar(
+    r"""
+    pair = first second
+    first = word ws
+    second = word "!"
+    word = ~r"[a-z]+"
+    ws = " "
+    """
+)
+
+
+def test_visitor_output():
+    visitor = CustomVisitorFactory(
+        ["word", "ws"], ["pair", "first", "second"], dict()
+    ).create_instance()
+    assert (
+        visitor.visit(grammar.parse("hello world!"))
+        == "<pair> <first> hello  </first><second> world </second> </pair>"
+    )
+
+
+def test_subclasses_are_memoized():
+    factory = CustomVisitorFactory(["word", "ws"], ["pair", "first", "second"], dict())
+    same = CustomVisitorFactory(["word", "ws"], ["pair", "first", "second"], dict())
+    different = CustomVisitorFactory(
+        ["word", "ws"],
+        ["pair", "first", "second"],
+        [("word", lambda self, node, vc: node.text.upper())],
+    )
+    assert factory.create_subclass() is same.create_subclass()
+    assert factory.create_subclass() is not different.create_subclass()
+    assert "WORLD" in different.create_instance().visit(grammar.parse("hello world!"))
+
+
+sentence_grammar = Grammar(
+    r"""
+    sentence = sentence_type sentence_length
+    sentence_type = word " "
+    word = ~r"[A-Za-z&<]+"
+    sentence_length = ~r".+"
+    """
+)
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "hello world!",
+        "Probation Min: 1 Year(s) Max: 2 Year(s)",
+        "Confinement max of 6 Months",
+        "Probation      12 Months",
+        "Probation Other",
+    ],
+)
+def test_element_output_matches_xml_string_output(text):
+    if text == "hello world!":
+        terminals, nonterminals, parsed = (
+            ["word", "ws"],
+            ["pair", "first", "second"],
+            grammar.parse(text),
+        )
+    else:
+        terminals, nonterminals, parsed = (
+            ["word"],
+            ["sentence", "sentence_type"],
+            sentence_grammar.parse(text),
+        )
+    string_visitor = CustomVisitorFactory(
+        terminals, nonterminals, [("sentence_length", visit_sentence_length)]
+    ).create_instance()
+    element_visitor = CustomVisitorFactory(
+        terminals,
+        nonterminals,
+        [("sentence_length", visit_sentence_length_element)],
+        output="element",
+    ).create_instance()
+    from_string = etree.fromstring(string_visitor.visit(parsed))
+    built = element_visitor.visit(parsed)
+    assert etree.tostring(built) == etree.tostring(from_string)
+
+
+def test_element_output_keeps_special_characters():
+    element_visitor = CustomVisitorFactory(
+        ["word"], ["sentence", "sentence_type"], dict(), output="element"
+    ).create_instance()
+    built = element_visitor.visit(sentence_grammar.parse("Fines&<Costs 1 Year"))
+    assert built.find("sentence_type").text.strip() == "Fines&<Costs"
@@ -4,9 +4,13 @@ import pytest
 from RecordLib.sourcerecords import Docket, SourceRecord
 from RecordLib.crecord import Person
 from RecordLib.crecord import Case
-from RecordLib.sourcerecords.docket.re_parse_mdj_pdf import parse_mdj_pdf
+from RecordLib.sourcerecords.docket.re_parse_mdj_pdf import (
+    parse_mdj_pdf,
+    parse_mdj_pdf_text,
+)
 from RecordLib.sourcerecords.docket.re_parse_cp_pdf import (
     parse_cp_pdf as re_parse_cp_pdf,
+    parse_cp_pdf_text as re_parse_cp_pdf_text,
 )
 
 
@@ -125,3 +129,109 @@ def test_regex_cp_parser(caplog):
         logging.error(f"Only {successes}/{total_dockets} parsed.")
         pytest.fail(f"Only {successes}/{total_dockets} parsed.")
 
+
+SAMPLE_CP_DOCKET_TEXT = """
+                             COURT OF COMMON PLEAS OF PHILADELPHIA COUNTY
+                                                                                          Docket Number: CP-51-CR-0001234-2010
+                                    DOCKET                                                        CRIMINAL DOCKET
+                                                                                             Court Case
+                                                      Commonwealth of Pennsylvania
+                                                                     v.                                Page 1 of 1
+                                                                John Doe
+                                                      CASE INFORMATION
+Judge Assigned: Smith, Jane                                      Date Filed: 01/02/2010            Initiation Date: 01/01/2010
+OTN: N 123456-1           LOTN:                     Originating Docket No: MC-51-CR-0001234-2010
+Initial Issuing Authority: Bob Jones                                Final Issuing Authority: Jane Smith
+Arresting Agency: Philadelphia Pd                              Arresting Officer: Officer, Joe
+Complaint/Citation No.:                                    Incident Number: 123456
+County: Philadelphia                                       Township: Philadelphia
+Case Local Number Type(s)                                  Case Local Number(s)
+District Control Number                                    201012345
+                                                      STATUS INFORMATION
+Case Status:       Closed        Status Date   Processing Status                 Arrest Date:     01/01/2010
+                                 05/05/2011    Completed
+Complaint Date:  01/01/2010
+                                                     DEFENDANT INFORMATION
+Date Of Birth:            01/01/1980             City/State/Zip: Philadelphia, PA 19100
+Alias Name
+Doe, John
+Doe, Johnny
+                                                      CASE PARTICIPANTS
+Participant Type                                      Name
+Defendant                                             Doe, John
+                                                      CHARGES
+Seq.    Orig Seq.   Grade    Statute                    Statute Description                          Offense Dt.      OTN
+1       1           M1       18 § 2701 §§ A1            Simple Assault Number 1                     01/01/2010       N 123456-1
+2       2           M1       18 § 2701 §§ A1            Simple Assault Number 2                     01/01/2010       N 123456-1
+                                          DISPOSITION SENTENCING/PENALTIES
+Disposition
+  Case Event                                            Disposition Date                    Final Disposition
+    Sequence/Description                                                        Offense Disposition                                     Grade    Section
+         Sentencing Judge                                                       Sentence Date                                           Credit For Time Served
+Trial                                                   05/05/2011                           Final Disposition
+   1 / Simple Assault Number 1                                   Guilty                                    M1       18 § 2701 §§ A1
+         Smith, Jane                                                        05/05/2011
+   2 / Simple Assault Number 2                                   Guilty                                    M1       18 § 2701 §§ A1
+         Smith, Jane                                                        05/05/2011
+                                                 CASE FINANCIAL INFORMATION
+                                   Assessment              Payments          Adjustments          Non Monetary          Total
+                     Totals:          $1,234.50              -$234.50              $0.00              $0.00              $1,000.00
+
+CPCMS 9082                                                                                                          Printed: 01/01/2020
+"""
+
+
+def test_cp_parser_fields_by_section():
+    """
+    The cp parser finds each field in the section of the docket where it belongs.
+    """
+    person, cases, _ = re_parse_cp_pdf_text(SAMPLE_CP_DOCKET_TEXT)
+    assert person.first_name == "John"
+    assert person.last_name == "Doe"
+    assert person.date_of_birth.isoformat() == "1980-01-01"
+    case = cases[0]
+    assert case.docket_number == "CP-51-CR-0001234-2010"
+    assert case.otn == "N 123456-1"
+    assert case.county == "PHILADELPHIA"
+    assert case.judge == "Jane Smith"
+    assert case.dc == "201012345"
+    assert case.arrest_date.isoformat() == "2010-01-01"
+    assert case.disposition_date.isoformat() == "2011-05-05"
+    assert [c.offense for c in case.charges if c.disposition == "Guilty"] == [
+        "Simple Assault Number 1",
+        "Simple Assault Number 2",
+    ]
+
+
+def test_cp_charges_sections_found_line_by_line():
+    """
+    The Charges section runs from the line after its header to the last line of capital letters
+    in the block of lines that follows, so each charge in it is read, and nothing after it is.
+    """
+    _, cases, _ = re_parse_cp_pdf_text(SAMPLE_CP_DOCKET_TEXT)
+    charges = {c.sequence: c for c in cases[0].charges if isinstance(c.sequence, int)}
+    assert sorted(charges.keys()) == [1, 2]
+    assert [(charges[s].offense, charges[s].grade, charges[s].statute) for s in [1, 2]] == [
+        ("Simple Assault Number 1", "M1", "18 § 2701 §§ A1"),
+        ("Simple Assault Number 2", "M1", "18 § 2701 §§ A1"),
+    ]
+
+
+def test_mdj_aliases_across_page_break():
+    """
+    A page footer in the middle of the list of aliases is skipped over.
+    """
+    txt = "\n".join(
+        [
+            "Docket Number: MJ-05201-CR-0000123-2015",
+            "Alias Name",
+            "Doe, Johnny",
+            "AOPC 1200 Printed: 01/01/2020",
+            "Doe, J.",
+            "CASE PARTICIPANTS",
+            "Defendant           Doe, John",
+        ]
+    )
+    person, cases, _ = parse_mdj_pdf_text(txt)
+    assert person.aliases == ["Doe, Johnny", "Doe, J.", "Doe, John"]
+    assert cases[0].docket_number == "MJ-05201-CR-0000123-2015"
@@ -0,0 +1,56 @@
+import re
+from RecordLib.sourcerecords.documentindex import DocumentIndex
+
+
+header = re.compile(r"^\s*(CHARGES|ENTRIES)\s*$")
+
+text = "\n".join(
+    [
+        "Docket Number: CP-51-CR-0001234-2010",
+        "    CHARGES",
+        "1   Simple Assault",
+        "\fPage 2",
+        "2   Theft",
+        "  ENTRIES  ",
+        "Filed",
+        "   CHARGES",
+        "3   Loitering",
+    ]
+)
+
+
+def test_lines():
+    index = DocumentIndex(text, section_header=header)
+    assert index.lines[2] == "1   Simple Assault"
+    assert index.lines[3] == "\fPage 2"
+    assert len(index.lines) == 9
+
+
+def test_sections():
+    index = DocumentIndex(text, section_header=header)
+    assert [(s.name, s.start, s.end) for s in index.sections] == [
+        ("PREAMBLE", 0, 1),
+        ("CHARGES", 1, 5),
+        ("ENTRIES", 5, 7),
+        ("CHARGES", 7, 9),
+    ]
+    assert index.section_lines("CHARGES") == [
+        "    CHARGES",
+        "1   Simple Assault",
+        "\fPage 2",
+        "2   Theft",
+        "   CHARGES",
+        "3   Loitering",
+    ]
+    assert index.section_text("MISSING") == ""
+
+    search, errs = index.find("filed", re.compile("Filed"), ["CHARGES"])
+    assert search is not None and errs == []
+    search, errs = index.find("nothing", re.compile("Nothing"), ["CHARGES"])
+    assert search is None and errs == ["Could not find nothing"]
+
+
+def test_no_section_header():
+    index = DocumentIndex("one\ntwo")
+    assert [(s.name, s.start, s.end) for s in index.sections] == [("PREAMBLE", 0, 2)]
+    assert index.folded_lines == ["one", "two"]
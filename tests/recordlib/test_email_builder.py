@@ -7,4 +7,40 @@ def test_unsealable_until_date(example_crecord):
     example_crecord.cases[0].disposition_date = date(2020, 1,1)
     analysis = Analysis(example_crecord).rule(seal_convictions)
     eb = EmailBuilder([], analysis)
-    assert eb.get_unsealable_until_date(example_crecord.cases[0]) is not None
\ No newline at end of file
+    assert eb.get_unsealable_until_date(example_crecord.cases[0]) is not None
+
+def test_email_builder_shares_an_evaluation(example_crecord):
+    from RecordLib.utilities.email_builder import SealingEvaluation
+    from RecordLib.analysis.ruledefs import simple_sealing_rules as ssr
+
+    example_crecord.cases[0].disposition_date = date(2020, 1, 1)
+    analysis = Analysis(example_crecord).rule(seal_convictions)
+    evaluation = SealingEvaluation(analysis)
+    eb = EmailBuilder([], analysis, evaluation)
+    case = example_crecord.cases[0]
+    until = eb.get_unsealable_until_date(case)
+    assert until is not None
+    assert eb.get_unsealable_until_date(case) is until
+    assert evaluation.full_record_requirements() is evaluation.full_record_requirements()
+    assert bool(evaluation.full_record_requirements()) == bool(
+        ssr.full_record_requirements_for_petition_sealing(example_crecord)
+    )
+    assert evaluation.case_sealability(case) is evaluation.case_sealability(case)
+
+
+def test_case_exist_and_petition_details(example_crecord):
+    analysis = Analysis(example_crecord).rule(seal_convictions)
+    eb = EmailBuilder([], analysis)
+    case = example_crecord.cases[0]
+    assert eb.caseExist(case, example_crecord.cases)
+    assert not eb.caseExist(case, [])
+    assert eb.petionDetails(case, []) == ""
+    petitions_for_case = [
+        decision.name
+        for decision in analysis.decisions
+        for petition in decision.value
+        if petition.cases[0].docket_number == case.docket_number
+    ]
+    assert eb.petionDetails(case, analysis.decisions) == (
+        petitions_for_case[0] if petitions_for_case else ""
+    )
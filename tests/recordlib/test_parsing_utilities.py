@@ -1,9 +1,12 @@
+import io
 import logging
 from RecordLib.sourcerecords.parsingutilities import (
     word_starting_near,
     map_line,
     find_index_for_pattern,
+    get_text_from_pdf,
 )
+from RecordLib.sourcerecords.pdfextractors import PDFTextExtractor, ExtractionError
 
 logger = logging.getLogger(__name__)
 
@@ -31,3 +34,47 @@ def test_find_index_for_pattern():
     assert find_index_for_pattern("Seq.", text) == 0
     assert find_index_for_pattern("Statute Description", text) == 25
     assert find_index_for_pattern("Something else", text) is None
+
+
+class EchoExtractor(PDFTextExtractor):
+    """ Stands in for a real engine, and just decodes the bytes it is handed. """
+
+    name = "echo"
+
+    def extract(self, data):
+        if data == b"broken":
+            raise ExtractionError("Not a pdf")
+        return bytes(data).decode("utf8")
+
+
+def test_get_text_from_pdf_sources(tmp_path):
+    extractor = EchoExtractor()
+    assert get_text_from_pdf(b"from bytes", extractor=extractor) == "from bytes"
+    assert (
+        get_text_from_pdf(memoryview(b"from a view"), extractor=extractor)
+        == "from a view"
+    )
+    assert (
+        get_text_from_pdf(io.BytesIO(b"from a file"), extractor=extractor)
+        == "from a file"
+    )
+    path = tmp_path / "doc.pdf"
+    path.write_bytes(b"from a path")
+    assert get_text_from_pdf(str(path), extractor=extractor) == "from a path"
+
+
+def test_get_text_from_pdf_failure():
+    assert get_text_from_pdf(b"broken", extractor=EchoExtractor()) == ""
+
+
+def test_requested_extractor_that_isnt_available(monkeypatch):
+    import pytest
+    from RecordLib.sourcerecords import pdfextractors
+
+    monkeypatch.setenv("PDF_TEXT_EXTRACTOR", "poppler")
+    monkeypatch.setattr(pdfextractors, "pdftotext", None)
+    assert isinstance(pdfextractors.default_extractor(), pdfextractors.SubprocessExtractor)
+    monkeypatch.setenv("PDF_TEXT_EXTRACTOR", "subprocess")
+    assert isinstance(pdfextractors.default_extractor(), pdfextractors.SubprocessExtractor)
+    with pytest.raises(TypeError):
+        PDFTextExtractor()
@@ -3,6 +3,7 @@ redis_sadd is for saving different bits of info to redis sets, so we develop a c
 
 """
 import pytest
+from RecordLib.sourcerecords.textcache import RedisTextCache
 
 
 def test_redis_sadd(redis_helper):
@@ -24,3 +25,12 @@ def test_sadd_crecord(redis_helper, example_crecord):
     assert redis_helper.r.smembers("test:charge:grade") == {charge.grade  for case in example_crecord.cases for charge in case.charges}
 
     assert redis_helper.r.smembers("test:charge:statute") == {charge.statute  for case in example_crecord.cases for charge in case.charges}
+
+
+def test_redis_text_cache(redis_helper):
+    cache = RedisTextCache(redis_helper)
+    assert cache.get("abc") is None
+    cache.put("abc", "the text")
+    assert redis_helper.r.get("test:pdftext:abc") == "the text"
+    assert cache.get("abc") == "the text"
+    assert cache.stats() == {"hits": 1, "misses": 1}
@@ -0,0 +1,82 @@
+import threading
+import time
+from RecordLib.utilities.screening_pipeline import ScreeningPipeline
+from RecordLib.utilities import synthetic_documents
+
+
+class FakeResponse:
+    def __init__(self, content, status_code=200):
+        self.content = content
+        self.status_code = status_code
+
+
+class SlowPortal:
+    """
+    Serves documents from a dict of url -> text, each after a moment, and counts the most requests
+    it was serving at once.
+    """
+
+    def __init__(self, documents):
+        self.documents = documents
+        self.requested = []
+        self.active = 0
+        self.most_active = 0
+        self._lock = threading.Lock()
+
+    def get(self, url, headers=None):
+        with self._lock:
+            self.requested.append(url)
+            self.active += 1
+            self.most_active = max(self.most_active, self.active)
+        try:
+            time.sleep(0.2)
+            if url in self.documents:
+                return FakeResponse(self.documents[url].encode("utf8"))
+            return FakeResponse(b"", status_code=404)
+        finally:
+            with self._lock:
+                self.active -= 1
+
+
+def read_text(path):
+    with open(path) as f:
+        return f.read()
+
+
+def test_screening_pipeline(tmp_path):
+    docket_nums = ["CP-51-CR-0000001-2010", "CP-51-CR-0000002-2011", "CP-51-CR-0000003-2012"]
+    documents = {
+        f"https://portal/{dn}/docket": synthetic_documents.cp_docket_text(2)
+        for dn in docket_nums
+    }
+    # the first case's summary mentions the third case, which the name search didn't find.
+    documents[f"https://portal/{docket_nums[0]}/summary"] = f"Court Summary\n{docket_nums[2]}\n{docket_nums[1]}"
+    search_results = [
+        {
+            "docket_number": dn,
+            "docket_sheet_url": f"https://portal/{dn}/docket",
+            "summary_url": f"https://portal/{dn}/summary",
+        }
+        for dn in docket_nums[:2]
+    ]
+    lookups = []
+
+    def search_by_docket(dn):
+        lookups.append(dn)
+        return [{"docket_number": dn, "docket_sheet_url": f"https://portal/{dn}/docket"}]
+
+    portal = SlowPortal(documents)
+    pipeline = ScreeningPipeline(
+        str(tmp_path), search_by_docket=search_by_docket, session=portal, extract_text=read_text
+    )
+    pipeline.run(search_results)
+    # The first round of downloads happen together, and the third docket is fetched
+    # once the summary that mentions it is read.
+    assert portal.most_active >= 2
+    assert len(portal.requested) == 5
+    assert f"https://portal/{docket_nums[2]}/docket" in portal.requested
+    assert lookups == [docket_nums[2]]
+    assert [case["docket_number"] for case in pipeline.cases] == docket_nums
+    assert set(pipeline.sourcerecords.keys()) == set(docket_nums)
+    assert pipeline.cases[1]["summary_text"] == ""
+    assert all(len(sr.cases) == 1 for sr in pipeline.sourcerecords.values())
@@ -26,3 +26,32 @@ def test_serialize_docket(example_docket):
 def test_serialize_summary(example_summary):
     ser = to_serializable(example_summary)
     assert "_cases" in ser.keys()
+
+
+def test_serialize_matches_to_serializable(example_crecord):
+    from RecordLib.analysis import Analysis
+    from RecordLib.analysis.ruledefs import expunge_nonconvictions, seal_convictions
+    from RecordLib.utilities.serializers import serialize
+
+    analysis = Analysis(example_crecord).rule(expunge_nonconvictions).rule(seal_convictions)
+    assert serialize(analysis) == to_serializable(analysis)
+    assert serialize(example_crecord) == to_serializable(example_crecord)
+    assert serialize(None) == ""
+    assert serialize(3) == "3"
+
+
+def test_serialize_with_refs(example_case):
+    import json
+    from RecordLib.utilities.serializers import dump_json, serialize, stream_json
+
+    ser = serialize([example_case, example_case.charges[0], example_case], refs=True)
+    assert ser[0]["$id"] == 1
+    assert ser[0]["charges"][0]["$id"] == 2
+    assert ser[1] == {"$ref": 2}
+    assert ser[2] == {"$ref": 1}
+    assert json.loads(dump_json([example_case, example_case], refs=True)) == serialize(
+        [example_case, example_case], refs=True
+    )
+    assert b"".join(stream_json([example_case] * 50, chunk_size=100)) == dump_json(
+        [example_case] * 50
+    )
@@ -3,6 +3,11 @@ import pytest
 import os
 from RecordLib.utilities.serializers import to_serializable
 from RecordLib.sourcerecords.summary.parse_pdf import parse_pdf
+from RecordLib.sourcerecords.summary.parse_pdf import parse_text as parse_summary_text
+from RecordLib.sourcerecords.docket.re_parse_cp_pdf import parse_cp_pdf_text
+from RecordLib.sourcerecords.docket.re_parse_mdj_pdf import parse_mdj_pdf_text
+from RecordLib.utilities import synthetic_documents
+import random
 
 
 def test_create_from_parser():
@@ -52,3 +57,17 @@ def test_null_parser():
     assert src.cases == []
     assert len(src.errors) == 1
 
+
+
+def test_parse_synthetic_documents():
+    """ The synthetic documents used for benchmarks can be parsed. """
+    random.seed(0)
+    person, cases, errs = parse_cp_pdf_text(synthetic_documents.cp_docket_text(4))
+    assert person.last_name == "Doe"
+    assert len([c for c in cases[0].charges if c.statute]) == 4
+    person, cases, _ = parse_mdj_pdf_text(synthetic_documents.mdj_docket_text(4))
+    assert len(cases[0].charges) == 4
+    person, cases, errs = parse_summary_text(synthetic_documents.cp_summary_text(3, 2))
+    assert errs == []
+    assert len(cases) == 3
+    assert all(len(c.charges) == 2 for c in cases)
@@ -0,0 +1,54 @@
+from RecordLib.analysis.statutes import (
+    OffenseCategories,
+    SectionRanges,
+    StatuteIndex,
+    statute_index,
+)
+
+
+def test_statute_index_categories():
+    assert statute_index.categories(18, 3127, "3127") == frozenset(
+        {OffenseCategories.DANGER_TO_PERSON, OffenseCategories.INDECENT_EXPOSURE}
+    )
+    assert statute_index.categories(18, 3126, "3126a1") == frozenset(
+        {OffenseCategories.DANGER_TO_PERSON, OffenseCategories.TIERED_SEX_OFFENSE}
+    )
+    assert OffenseCategories.CORRUPTION_OF_MINORS in statute_index.categories(
+        18, 6301, "6301a1"
+    )
+    assert statute_index.categories(18, 6105, None) == frozenset({OffenseCategories.FIREARMS})
+    assert statute_index.categories(18, 4915.2, None) == frozenset(
+        {OffenseCategories.FAILURE_TO_REGISTER}
+    )
+    # Ranges don't include their bounds.
+    assert statute_index.categories(18, 2300, None) == frozenset()
+    assert statute_index.categories(18, 2300.5, None) == frozenset(
+        {OffenseCategories.DANGER_TO_PERSON}
+    )
+    # Only title 18 is indexed.
+    assert statute_index.categories(75, 3127, "3127") == frozenset()
+    assert statute_index.categories(None, None, None) == frozenset()
+
+
+def test_section_ranges_overlap():
+    ranges = SectionRanges()
+    ranges.add(10, 20, "a")
+    ranges.add(15, 30, "b")
+    assert ranges.categories(5) == frozenset()
+    assert ranges.categories(10) == frozenset()
+    assert ranges.categories(12) == frozenset({"a"})
+    assert ranges.categories(15) == frozenset({"a"})
+    assert ranges.categories(17) == frozenset({"a", "b"})
+    assert ranges.categories(20) == frozenset({"b"})
+    assert ranges.categories(30) == frozenset()
+    assert ranges.categories(31) == frozenset()
+    ranges.add(0, 100, "c")
+    assert ranges.categories(31) == frozenset({"c"})
+
+
+def test_statute_index_add():
+    index = StatuteIndex()
+    index.add_section(75, 3802, "dui")
+    index.add_offense_code(75, "3802a1", "first offense")
+    assert index.categories(75, 3802, "3802a1") == frozenset({"dui", "first offense"})
+    assert index.categories(75, 3803, None) == frozenset()
@@ -0,0 +1,77 @@
+from RecordLib.sourcerecords.parsingutilities import get_text_from_pdf
+from RecordLib.sourcerecords.pdfextractors import PDFTextExtractor
+from RecordLib.sourcerecords.textcache import DiskTextCache, TextCache
+
+
+class CountingExtractor(PDFTextExtractor):
+    """ Decodes the bytes it is handed, and counts how often it is asked to. """
+
+    name = "counting"
+
+    def __init__(self):
+        self.calls = 0
+
+    def extract(self, data):
+        self.calls += 1
+        return bytes(data).decode("utf8")
+
+
+class UnreachableCache(TextCache):
+    """ A cache whose server is down. """
+
+    def _get(self, key):
+        raise ConnectionError("Connection refused")
+
+    def _put(self, key, text):
+        raise ConnectionError("Connection refused")
+
+
+class WriteOnlyFailingCache(UnreachableCache):
+    def _get(self, key):
+        return None
+
+
+def test_unreachable_cache_falls_back_to_extraction():
+    for cache in [UnreachableCache(), WriteOnlyFailingCache()]:
+        extractor = CountingExtractor()
+        assert get_text_from_pdf(b"some docket", extractor=extractor, cache=cache) == "some docket"
+        assert extractor.calls == 1
+
+
+def test_disk_cache_skips_extraction(tmp_path):
+    cache = DiskTextCache(str(tmp_path))
+    extractor = CountingExtractor()
+    for _ in range(3):
+        assert (
+            get_text_from_pdf(b"some docket", extractor=extractor, cache=cache)
+            == "some docket"
+        )
+    assert extractor.calls == 1
+    assert cache.stats() == {"hits": 2, "misses": 1}
+
+    # a new cache over the same directory picks up what's already there.
+    cache = DiskTextCache(str(tmp_path))
+    get_text_from_pdf(b"some docket", extractor=extractor, cache=cache)
+    assert extractor.calls == 1
+    assert cache.hits == 1
+
+
+def test_disk_cache_key_includes_extractor_version(tmp_path):
+    cache = DiskTextCache(str(tmp_path))
+    extractor = CountingExtractor()
+    get_text_from_pdf(b"some docket", extractor=extractor, cache=cache)
+    extractor.version = "2"
+    get_text_from_pdf(b"some docket", extractor=extractor, cache=cache)
+    assert extractor.calls == 2
+
+
+def test_disk_cache_evicts_least_recently_used(tmp_path):
+    cache = DiskTextCache(str(tmp_path), max_bytes=25)
+    cache.put("a", "a" * 10)
+    cache.put("b", "b" * 10)
+    assert cache.get("a") == "a" * 10
+    cache.put("c", "c" * 10)
+    assert cache.get("b") is None
+    assert cache.get("a") == "a" * 10
+    assert cache.get("c") == "c" * 10
+    assert cache.size <= 25